@@ -1,2 +1,3 @@
 from .cgroup import Cgroup
 from .exceptions import CgroupsException
+from .pool import CgroupPool
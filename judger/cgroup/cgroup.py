@@ -1,3 +1,4 @@
+import functools
 import os
 from contextlib import AbstractContextManager, suppress
 from types import TracebackType
@@ -12,38 +13,104 @@ class Cgroup(AbstractContextManager):
         self.path = path
         self.name = name
 
+        self._max_memory_usage: int | None = None
+        self._max_cpu_usage: int | None = None
+        self._cpu_time_offset = 0
+        self._cpu_times_offset = (0, 0)
+        self._io_bytes_offset = (0, 0)
+        self._oom_kill_offset = 0
+        # Control files are kept open, they are read and written for every run.
+        self._fds: dict[tuple[str, int], int] = {}
+
         self._check_mount()
         self._create_group_directory()
 
     def get_cpu_time(self) -> int:
-        for line in self._read("cpu.stat"):
-            key, value = line.split(" ")
-
-            if key == "usage_usec":
-                return int(value)
-        return -1
+        cpu_time = self._get_stat("cpu.stat", "usage_usec")
+        return cpu_time - self._cpu_time_offset if cpu_time != -1 else -1
+
+    def get_cpu_times(self) -> tuple[int, int]:
+        # User and system parts of the cpu time.
+        user_time, system_time = self._get_cpu_times()
+        return (
+            user_time - self._cpu_times_offset[0],
+            system_time - self._cpu_times_offset[1],
+        )
+
+    def get_io_bytes(self) -> tuple[int, int]:
+        read_bytes, write_bytes = self._get_io_bytes()
+        return (
+            read_bytes - self._io_bytes_offset[0],
+            write_bytes - self._io_bytes_offset[1],
+        )
 
     def get_max_memory_usage(self) -> int:
-        return int(self._read("memory.peak")[0])
+        # Read through the descriptor it was reset with, resets are per file.
+        # Kernels that can't reset memory.peak don't allow opening it writable.
+        flags = os.O_RDWR if ("memory.peak", os.O_RDWR) in self._fds else os.O_RDONLY
+        return int(self._read("memory.peak", flags)[0])
 
     def get_oom_kill(self) -> int:
-        for line in self._read("memory.events"):
-            key, value = line.split(" ")
-
-            if key == "oom_kill":
-                return int(value)
-        return -1
+        oom_kill = self._get_stat("memory.events", "oom_kill")
+        return oom_kill - self._oom_kill_offset if oom_kill != -1 else -1
 
     def set_max_memory_usage(self, max_usage: int):
+        if self._max_memory_usage == max_usage:
+            return
+        self._max_memory_usage = max_usage
+
         self._write("memory.high", str(max_usage * 2))
         self._write("memory.max", str(max_usage))
 
         self._write("memory.swap.high", "0")
         self._write("memory.swap.max", "0")
 
+    def set_max_cpu_usage(self, cpus: int, period: int = 100000):
+        if self._max_cpu_usage == cpus:
+            return
+        self._max_cpu_usage = cpus
+
+        self._write("cpu.max", f"{cpus * period} {period}")
+
     def set_pid(self, pid: int):
         self._write("cgroup.procs", str(pid))
 
+    def get_directory(self) -> int:
+        try:
+            return self._open("", os.O_RDONLY | os.O_DIRECTORY)
+        except Exception as e:
+            raise CgroupsException("Failed to open group directory.") from e
+
+    def kill(self):
+        self._write("cgroup.kill", "1")
+
+    def reset(self):
+        # cpu.stat and memory.events only grow, so remember where this run
+        # starts. memory.peak can be reset through an open file descriptor
+        # since Linux 6.12, otherwise start over with a new directory.
+        if self._reset_memory_peak():
+            self._cpu_time_offset = self._get_stat("cpu.stat", "usage_usec")
+            self._cpu_times_offset = self._get_cpu_times()
+            self._io_bytes_offset = self._get_io_bytes()
+            self._oom_kill_offset = self._get_stat("memory.events", "oom_kill")
+            return
+
+        self._remove_group_directory()
+        self._create_group_directory()
+
+        self._cpu_time_offset = 0
+        self._cpu_times_offset = (0, 0)
+        self._io_bytes_offset = (0, 0)
+        self._oom_kill_offset = 0
+
+        max_memory_usage, self._max_memory_usage = self._max_memory_usage, None
+        max_cpu_usage, self._max_cpu_usage = self._max_cpu_usage, None
+
+        if max_memory_usage is not None:
+            self.set_max_memory_usage(max_memory_usage)
+        if max_cpu_usage is not None:
+            self.set_max_cpu_usage(max_cpu_usage)
+
     def __enter__(self):
         return self
 
@@ -55,7 +122,7 @@ class Cgroup(AbstractContextManager):
     ) -> bool | None:
         try:
             cleanup_target_directory = os.path.join(self.path, self.name)
-            os.rmdir(cleanup_target_directory)
+            self._remove_group_directory()
             _log.info(f"Cleanup directory success. {cleanup_target_directory}")
         except Exception as e:
             _log.warn("Failed to remove directory.", exc_info=e)
@@ -63,7 +130,7 @@ class Cgroup(AbstractContextManager):
         return False
 
     def _check_mount(self):
-        if (mount_type := get_mount_type(self.path)) != "cgroup2":
+        if (mount_type := _get_mount_type(self.path)) != "cgroup2":
             raise CgroupsException(
                 "Expected mount type is cgroup "
                 f"but current mount type is {mount_type}."
@@ -77,18 +144,81 @@ class Cgroup(AbstractContextManager):
         except Exception as e:
             raise CgroupsException("Failed to create group directory.") from e
 
-    def _read(self, filename: str) -> list[str]:
-        file = os.path.join(self.path, self.name, filename)
+    def _remove_group_directory(self):
+        self._close_files()
+
+        os.rmdir(os.path.join(self.path, self.name))
+
+    def _reset_memory_peak(self) -> bool:
+        try:
+            self._write("memory.peak", "reset", os.O_RDWR)
+        except CgroupsException:
+            if (fd := self._fds.pop(("memory.peak", os.O_RDWR), None)) is not None:
+                os.close(fd)
+            return False
+
+        return True
+
+    def _get_stat(self, filename: str, stat_key: str) -> int:
+        for line in self._read(filename):
+            key, value = line.split(" ")
+
+            if key == stat_key:
+                return int(value)
+        return -1
+
+    def _get_cpu_times(self) -> tuple[int, int]:
+        stats = dict(line.split(" ") for line in self._read("cpu.stat"))
+        return int(stats.get("user_usec", 0)), int(stats.get("system_usec", 0))
+
+    def _get_io_bytes(self) -> tuple[int, int]:
+        # io.stat only exists when the io controller is enabled.
         try:
-            with open(file) as f:
-                return f.readlines()
+            lines = self._read("io.stat")
+        except CgroupsException:
+            return 0, 0
+
+        read_bytes, write_bytes = 0, 0
+
+        # Lines look like "8:0 rbytes=1 wbytes=2 rios=1 wios=1 ...".
+        for line in lines:
+            for field in line.split(" ")[1:]:
+                key, _, value = field.partition("=")
+
+                if key == "rbytes":
+                    read_bytes += int(value)
+                elif key == "wbytes":
+                    write_bytes += int(value)
+
+        return read_bytes, write_bytes
+
+    def _open(self, filename: str, flags: int) -> int:
+        if (fd := self._fds.get((filename, flags))) is None:
+            fd = os.open(os.path.join(self.path, self.name, filename), flags)
+            self._fds[(filename, flags)] = fd
+        return fd
+
+    def _close_files(self):
+        for fd in self._fds.values():
+            with suppress(OSError):
+                os.close(fd)
+        self._fds.clear()
+
+    def _read(self, filename: str, flags: int = os.O_RDONLY) -> list[str]:
+        try:
+            return os.pread(self._open(filename, flags), 4096, 0).decode().splitlines()
         except Exception as e:
             raise CgroupsException(f"Failed to read from {filename}.") from e
 
-    def _write(self, filename: str, content: str) -> None:
-        file = os.path.join(self.path, self.name, filename)
+    def _write(self, filename: str, content: str, flags: int = os.O_WRONLY) -> None:
         try:
-            with open(file, "w") as f:
-                f.write(content)
+            os.write(self._open(filename, flags), content.encode())
         except Exception as e:
+            file = os.path.join(self.path, self.name, filename)
             raise CgroupsException(f"Failed to write into {file}.") from e
+
+
+@functools.cache
+def _get_mount_type(path: str) -> str | None:
+    # Mounts don't change while judging, so /etc/mtab is parsed once per path.
+    return get_mount_type(path)
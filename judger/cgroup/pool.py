@@ -0,0 +1,51 @@
+from contextlib import AbstractContextManager
+from types import TracebackType
+
+from judger.cgroup.cgroup import Cgroup
+from judger.logger import _log
+
+
+class CgroupPool(AbstractContextManager):
+    # Keeps sandbox cgroups alive between runs instead of creating and
+    # removing a directory for each of them.
+    def __init__(self, path: str, prefix: str, size: int) -> None:
+        self.path = path
+        self.prefix = prefix
+
+        self._created = 0
+        self._idle: list[Cgroup] = []
+
+        for _ in range(size):
+            self._idle.append(self._create())
+
+    def acquire(self) -> Cgroup:
+        cgroup = self._idle.pop() if self._idle else self._create()
+        cgroup.reset()
+
+        return cgroup
+
+    def release(self, cgroup: Cgroup):
+        self._idle.append(cgroup)
+
+    def _create(self) -> Cgroup:
+        cgroup = Cgroup(self.path, f"{self.prefix}-{self._created}")
+        self._created += 1
+
+        return cgroup
+
+    def __enter__(self):
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> bool | None:
+        for cgroup in self._idle:
+            cgroup.__exit__(__exc_type, __exc_value, __traceback)
+        self._idle.clear()
+
+        _log.info(f"Cgroup pool {self.prefix} closed.")
+
+        return False
@@ -0,0 +1,4 @@
+from .check import check
+from .file import open_answer, open_mapped
+from .mode import CheckMode
+from .stream import StreamChecker
@@ -0,0 +1,326 @@
+import math
+import mmap
+import warnings
+from functools import partial
+from itertools import chain
+from typing import BinaryIO, Callable, Iterable, Iterator, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from judger.check.file import (
+    WHITESPACES,
+    iterate_chunks,
+    open_answer,
+    open_mapped,
+    read_chunks,
+    slice_chunks,
+)
+from judger.check.mode import CheckMode
+from judger.execute.result import ExecuteResult
+from judger.logger import _log
+
+Buffer = mmap.mmap | bytes
+Items = Sequence[bytes] | npt.NDArray[np.float64]
+
+# Marks bytes which can't be a part of a number NumPy parses, besides inf and
+# nan, for bytes.translate.
+NON_NUMERIC = bytes(byte not in WHITESPACES + b"0123456789.eE+-" for byte in range(256))
+# Numbers between text are parsed by NumPy from this size.
+MIN_PARSED_SIZE = 4 * 1024
+
+
+def check(
+    output_filename: str,
+    answer_filename: str,
+    mode: CheckMode,
+    absolute_tolerance: float = 1e-6,
+    relative_tolerance: float = 1e-6,
+) -> ExecuteResult:
+    with open_mapped(output_filename) as output:
+        # Splitting costs far more than comparing bytes, and most outputs are
+        # identical to the answer. Answer is read again to be split.
+        with open_answer(answer_filename) as answer:
+            identical = _is_identical(output, answer)
+
+        if identical:
+            mismatch = None
+        else:
+            with open_answer(answer_filename) as answer:
+                mismatch = _find_mismatch(
+                    output,
+                    read_chunks(answer),
+                    mode,
+                    absolute_tolerance,
+                    relative_tolerance,
+                )
+
+    if mismatch is None:
+        _log.info(f"Check finished with accepted. mode={mode.value}")
+        return ExecuteResult.ACCEPTED
+
+    # Index of the first mismatching byte, line or token depending on the mode.
+    _log.info(f"Check finished with wrong answer at {mismatch}. mode={mode.value}")
+    return ExecuteResult.WRONG_ANSWER
+
+
+def _find_mismatch(
+    output: Buffer,
+    answer: Iterable[bytes],
+    mode: CheckMode,
+    absolute_tolerance: float,
+    relative_tolerance: float,
+) -> int | None:
+    if mode == CheckMode.EXACT:
+        return _find_byte_mismatch(output, answer)
+
+    if mode == CheckMode.WHITESPACE:
+        return _compare(
+            _iterate_lines(slice_chunks(output)),
+            _iterate_lines(answer),
+            _find_item_mismatch,
+        )
+
+    if mode == CheckMode.TOKEN:
+        return _compare(
+            _iterate_tokens(slice_chunks(output)),
+            _iterate_tokens(answer),
+            _find_item_mismatch,
+        )
+
+    if mode == CheckMode.FLOAT:
+        return _compare(
+            _iterate_floats(slice_chunks(output)),
+            _iterate_floats(answer),
+            partial(
+                _find_float_mismatch,
+                absolute_tolerance=absolute_tolerance,
+                relative_tolerance=relative_tolerance,
+            ),
+        )
+
+    raise ValueError(f"Unsupported check mode {mode.value}.")
+
+
+def _is_identical(output: Buffer, answer: BinaryIO) -> bool:
+    offset = 0
+
+    for chunk in read_chunks(answer):
+        end = offset + len(chunk)
+        if output[offset:end] != chunk:
+            return False
+        offset = end
+
+    return offset == len(output)
+
+
+def _find_byte_mismatch(output: Buffer, answer: Iterable[bytes]) -> int:
+    offset = 0
+
+    for chunk in answer:
+        mismatch = _find_item_mismatch(output[offset : offset + len(chunk)], chunk)
+        if mismatch is not None:
+            return offset + mismatch
+        offset += len(chunk)
+
+    # Output is longer than the answer.
+    return offset
+
+
+def _iterate_lines(chunks: Iterable[bytes]) -> Iterator[list[bytes]]:
+    return map(_split_lines, iterate_chunks(chunks, b"\n"))
+
+
+def _iterate_tokens(chunks: Iterable[bytes]) -> Iterator[list[bytes]]:
+    return map(bytes.split, iterate_chunks(chunks, WHITESPACES))
+
+
+def _iterate_floats(chunks: Iterable[bytes]) -> Iterator[Items]:
+    return chain.from_iterable(map(_parse_floats, iterate_chunks(chunks, WHITESPACES)))
+
+
+def _split_lines(chunk: bytes) -> list[bytes]:
+    return list(filter(None, map(bytes.strip, chunk.split(b"\n"))))
+
+
+def _parse_floats(chunk: bytes) -> list[Items]:
+    # Numbers are parsed by NumPy without creating Python objects. Chunks with
+    # other tokens are split around lines with text, only those lines are
+    # compared token by token.
+    numbers = _parse_numbers(chunk)
+    if numbers is not None:
+        return [numbers]
+
+    marks = np.flatnonzero(np.frombuffer(chunk.translate(NON_NUMERIC), np.bool_))
+    if len(marks) == 0:
+        return [chunk.split()]
+
+    # Text is split together with short runs of numbers between, calls to
+    # NumPy cost more than they save on those.
+    breaks = np.flatnonzero(np.diff(marks) >= MIN_PARSED_SIZE) + 1
+    firsts = marks[np.insert(breaks, 0, 0)]
+    lasts = marks[np.append(breaks - 1, len(marks) - 1)]
+
+    items: list[Items] = []
+    offset = 0
+
+    for first, last in zip(firsts.tolist(), lasts.tolist()):
+        start = max(chunk.rfind(b"\n", offset, first) + 1, offset)
+        end = chunk.find(b"\n", last) + 1 or len(chunk)
+
+        if start > offset:
+            items.append(_parse_numbers_or_tokens(chunk[offset:start]))
+        items.append(chunk[start:end].split())
+        offset = end
+
+    if offset < len(chunk):
+        items.append(_parse_numbers_or_tokens(chunk[offset:]))
+
+    return items
+
+
+def _parse_numbers(data: bytes) -> npt.NDArray[np.float64] | None:
+    # Whitespace only string is parsed as [-1.0].
+    if not data or data.isspace():
+        return np.empty(0)
+
+    with warnings.catch_warnings():
+        # Older NumPy warns instead of raising on unparsable data.
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            return np.fromstring(data, sep=" ")
+        except (ValueError, DeprecationWarning):
+            return None
+
+
+def _parse_numbers_or_tokens(data: bytes) -> Items:
+    numbers = _parse_numbers(data)
+    return data.split() if numbers is None else numbers
+
+
+def _compare(
+    output: Iterator[Items],
+    answer: Iterator[Items],
+    find_mismatch: Callable[[Items, Items], int | None],
+) -> int | None:
+    comparer = ItemComparer(answer, find_mismatch)
+
+    for items in output:
+        mismatch = comparer.feed(items)
+        if mismatch is not None:
+            return mismatch
+
+    return comparer.finish()
+
+
+class ItemComparer:
+    # Chunks of output and answer hold different number of items, so only the
+    # overlapping part is compared at once.
+    def __init__(
+        self,
+        answer: Iterator[Items],
+        find_mismatch: Callable[[Items, Items], int | None],
+    ) -> None:
+        self.answer = (items for items in answer if len(items) > 0)
+        self.find_mismatch = find_mismatch
+
+        self.answer_items: Items = []
+        self.answer_index = 0
+        # Number of items compared so far.
+        self.index = 0
+
+    def feed(self, output_items: Items) -> int | None:
+        output_index = 0
+
+        while output_index < len(output_items):
+            if self.answer_index == len(self.answer_items):
+                self.answer_items, self.answer_index = next(self.answer, []), 0
+
+                # Output is longer than the answer.
+                if len(self.answer_items) == 0:
+                    return self.index
+
+            count = min(
+                len(output_items) - output_index,
+                len(self.answer_items) - self.answer_index,
+            )
+
+            mismatch = self.find_mismatch(
+                output_items[output_index : output_index + count],
+                self.answer_items[self.answer_index : self.answer_index + count],
+            )
+            if mismatch is not None:
+                return self.index + mismatch
+
+            output_index += count
+            self.answer_index += count
+            self.index += count
+
+        return None
+
+    def finish(self) -> int | None:
+        if self.answer_index == len(self.answer_items):
+            self.answer_items, self.answer_index = next(self.answer, []), 0
+
+        # Output is shorter than the answer.
+        return None if len(self.answer_items) == 0 else self.index
+
+
+def _find_item_mismatch(output: Sequence, answer: Sequence) -> int | None:
+    if output == answer:
+        return None
+
+    return next(
+        (
+            index
+            for index, (output_item, answer_item) in enumerate(zip(output, answer))
+            if output_item != answer_item
+        ),
+        min(len(output), len(answer)),
+    )
+
+
+def _find_float_mismatch(
+    output: Items,
+    answer: Items,
+    absolute_tolerance: float,
+    relative_tolerance: float,
+) -> int | None:
+    if isinstance(output, np.ndarray) and isinstance(answer, np.ndarray):
+        close = np.isclose(
+            output,
+            answer,
+            rtol=relative_tolerance,
+            atol=absolute_tolerance,
+            equal_nan=True,
+        )
+        return None if close.all() else int(close.argmin())
+
+    for index, (output_item, answer_item) in enumerate(zip(output, answer)):
+        if not _is_close(
+            output_item, answer_item, absolute_tolerance, relative_tolerance
+        ):
+            return index
+
+    return None
+
+
+def _is_close(
+    output: bytes | float,
+    answer: bytes | float,
+    absolute_tolerance: float,
+    relative_tolerance: float,
+) -> bool:
+    try:
+        output_number, answer_number = float(output), float(answer)
+    except ValueError:
+        return output == answer
+
+    # Same as numpy.isclose, the answer is the reference. Output identical to
+    # the answer is accepted without comparing, so nan equals nan.
+    if math.isnan(output_number) and math.isnan(answer_number):
+        return True
+
+    return output_number == answer_number or abs(
+        output_number - answer_number
+    ) <= absolute_tolerance + relative_tolerance * abs(answer_number)
@@ -0,0 +1,92 @@
+import mmap
+from contextlib import contextmanager
+from typing import BinaryIO, Iterable, Iterator
+
+from judger.storage import open_stored
+
+# Outputs are compared in chunks of this size, memory usage doesn't grow with
+# output size.
+CHUNK_SIZE = 256 * 1024
+
+WHITESPACES = b" \t\n\r\x0b\x0c"
+
+
+@contextmanager
+def open_mapped(filename: str) -> Iterator[mmap.mmap | bytes]:
+    with open(filename, "rb") as f:
+        # Empty files can't be mapped.
+        if f.seek(0, 2) == 0:
+            yield b""
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+            yield mapped
+
+
+@contextmanager
+def open_answer(filename: str) -> Iterator[BinaryIO]:
+    # Stored answers could be compressed, they are decompressed while read.
+    # Outputs of programs are never read through this, a program could write
+    # a compressed answer.
+    with open_stored(filename) as f:
+        yield f
+
+
+def read_chunks(f: BinaryIO) -> Iterator[bytes]:
+    while chunk := f.read(CHUNK_SIZE):
+        yield chunk
+
+
+def read_exactly(f: BinaryIO, size: int) -> bytes:
+    # Decompressing readers could return less than asked before the end.
+    data = f.read(size)
+
+    while 0 < len(data) < size and (chunk := f.read(size - len(data))):
+        data += chunk
+
+    return data
+
+
+def slice_chunks(buffer: mmap.mmap | bytes) -> Iterator[bytes]:
+    for start in range(0, len(buffer), CHUNK_SIZE):
+        yield buffer[start : start + CHUNK_SIZE]
+
+
+def iterate_chunks(chunks: Iterable[bytes], separators: bytes) -> Iterator[bytes]:
+    joiner = ChunkJoiner(separators)
+
+    for data in chunks:
+        if chunk := joiner.feed(data):
+            yield chunk
+
+    if carry := joiner.finish():
+        yield carry
+
+
+class ChunkJoiner:
+    # Joins data into chunks ending right after a separator, so no token is
+    # split between chunks. Data of a token longer than a chunk is joined once,
+    # not copied again for every data it spans.
+    def __init__(self, separators: bytes) -> None:
+        self.separators = separators
+        self.parts: list[bytes] = []
+
+    def feed(self, data: bytes) -> bytes | None:
+        end = max(data.rfind(separator) for separator in self.separators) + 1
+
+        if end == 0:
+            self.parts.append(data)
+            return None
+
+        self.parts.append(data[:end])
+        chunk = b"".join(self.parts)
+        self.parts = [data[end:]]
+
+        return chunk
+
+    def finish(self) -> bytes:
+        carry = b"".join(self.parts)
+        self.parts = []
+
+        return carry
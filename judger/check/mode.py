@@ -0,0 +1,16 @@
+import enum
+
+
+class CheckMode(enum.Enum):
+    # Byte by byte
+    EXACT = "exact"
+    # Line by line, ignoring leading/trailing whitespaces and empty lines
+    WHITESPACE = "whitespace"
+    # Whitespace separated tokens
+    TOKEN = "token"
+    # Whitespace separated numbers within absolute/relative tolerance
+    FLOAT = "float"
+    # Problem supplied checker program, run by the caller
+    SPECIAL = "special"
+    # Problem supplied interactor talking with the program, run by the caller
+    INTERACTIVE = "interactive"
@@ -0,0 +1,120 @@
+from contextlib import AbstractContextManager, ExitStack
+from functools import partial
+from types import TracebackType
+from typing import Callable
+
+from judger.check.check import (
+    ItemComparer,
+    Items,
+    _find_float_mismatch,
+    _find_item_mismatch,
+    _iterate_floats,
+    _iterate_lines,
+    _iterate_tokens,
+    _parse_floats,
+    _split_lines,
+)
+from judger.check.file import (
+    WHITESPACES,
+    ChunkJoiner,
+    open_answer,
+    read_chunks,
+    read_exactly,
+)
+from judger.check.mode import CheckMode
+
+
+# Checks output while the program writes it, so a wrong answer is found
+# without waiting for the program to finish. Gives the same verdict as check.
+class StreamChecker(AbstractContextManager):
+    def __init__(
+        self,
+        answer_filename: str,
+        mode: CheckMode,
+        absolute_tolerance: float = 1e-6,
+        relative_tolerance: float = 1e-6,
+    ) -> None:
+        self.mode = mode
+        self.diverged = False
+
+        self._stack = ExitStack()
+        self._answer = self._stack.enter_context(open_answer(answer_filename))
+
+        # Exact mode compares bytes as they are read from the answer, others
+        # compare items split from complete chunks.
+        if mode == CheckMode.EXACT:
+            return
+
+        if mode == CheckMode.WHITESPACE:
+            self._separators = b"\n"
+            self._split: Callable[[bytes], list[Items]] = lambda chunk: [
+                _split_lines(chunk)
+            ]
+            self._comparer = ItemComparer(
+                _iterate_lines(read_chunks(self._answer)), _find_item_mismatch
+            )
+        elif mode == CheckMode.TOKEN:
+            self._separators = WHITESPACES
+            self._split = lambda chunk: [chunk.split()]
+            self._comparer = ItemComparer(
+                _iterate_tokens(read_chunks(self._answer)), _find_item_mismatch
+            )
+        elif mode == CheckMode.FLOAT:
+            self._separators = WHITESPACES
+            self._split = _parse_floats
+            self._comparer = ItemComparer(
+                _iterate_floats(read_chunks(self._answer)),
+                partial(
+                    _find_float_mismatch,
+                    absolute_tolerance=absolute_tolerance,
+                    relative_tolerance=relative_tolerance,
+                ),
+            )
+        else:
+            self._stack.close()
+            raise ValueError(f"Unsupported check mode {mode.value}.")
+
+        self._joiner = ChunkJoiner(self._separators)
+
+    def feed(self, data: bytes) -> bool:
+        if self.diverged:
+            return False
+
+        if self.mode == CheckMode.EXACT:
+            self.diverged = read_exactly(self._answer, len(data)) != data
+            return not self.diverged
+
+        # Last item could continue in the next data.
+        chunk = self._joiner.feed(data)
+
+        if chunk is not None:
+            self.diverged = not self._feed_items(chunk)
+
+        return not self.diverged
+
+    def finish(self) -> bool:
+        if self.diverged:
+            return False
+
+        if self.mode == CheckMode.EXACT:
+            return self._answer.read(1) == b""
+
+        carry = self._joiner.finish()
+        if carry and not self._feed_items(carry):
+            return False
+
+        return self._comparer.finish() is None
+
+    def _feed_items(self, chunk: bytes) -> bool:
+        # Float chunks with text are split into several items.
+        return all(self._comparer.feed(items) is None for items in self._split(chunk))
+
+    def __exit__(
+        self,
+        __exc_type: type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> bool | None:
+        self._stack.close()
+
+        return False
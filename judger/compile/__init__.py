@@ -1,2 +1,3 @@
 from .compile import compile
+from .precompiled_header import build_precompiled_header
 from .result import CompileResult
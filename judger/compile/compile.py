@@ -13,6 +13,7 @@ def compile(
     timeout: int,
     stdout_filename: str,
     stderr_filename,
+    precompiled_header_directory: str | None = None,
 ) -> CompileResult:
     _log.info("Compile started.")
     try:
@@ -21,8 +22,14 @@ def compile(
         stdout = _open(stdout_filename)
         stderr = _open(stderr_filename)
 
+        args = shlex.split(compile_command)
+
+        # Unusable precompiled headers are ignored by the compiler.
+        if precompiled_header_directory is not None:
+            args.insert(1, f"-I{precompiled_header_directory}")
+
         with subprocess.Popen(
-            args=shlex.split(compile_command),
+            args=args,
             cwd=working_directory,
             stdout=stdout,
             stderr=stderr,
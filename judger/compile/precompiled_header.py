@@ -0,0 +1,111 @@
+import fcntl
+import hashlib
+import os
+import shlex
+import shutil
+import subprocess
+import tempfile
+
+from judger.logger import _log
+
+# Failed builds are not retried for every compile.
+_failed_directories: set[str] = set()
+
+
+def build_precompiled_header(
+    root: str,
+    header: str,
+    precompile_command: str,
+    timeout: int,
+) -> str | None:
+    # Precompiled headers only work with the compiler that built them,
+    # so the directory is keyed by the compiler binary as well.
+    try:
+        key = _get_key(header, precompile_command)
+    except Exception as e:
+        _log.warn(
+            f"Failed to find compiler of precompiled header {header}.", exc_info=e
+        )
+        return None
+
+    if key is None:
+        return None
+
+    directory = os.path.join(root, key)
+
+    if os.path.isdir(directory):
+        return directory
+
+    if directory in _failed_directories:
+        return None
+
+    try:
+        os.makedirs(root, exist_ok=True)
+
+        with open(f"{directory}.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+
+            if not os.path.isdir(directory):
+                _build(root, directory, header, precompile_command, timeout)
+    except Exception as e:
+        _log.warn(f"Failed to build precompiled header {header}.", exc_info=e)
+        _failed_directories.add(directory)
+        return None
+
+    return directory
+
+
+def _build(
+    root: str,
+    directory: str,
+    header: str,
+    precompile_command: str,
+    timeout: int,
+):
+    _log.info(f"Build precompiled header {header}.")
+
+    temporary = tempfile.mkdtemp(dir=root, prefix=".tmp-")
+
+    try:
+        # Compiler finds `<header>.gch` in an include directory before the header.
+        # The header itself isn't copied, it's included from the system path.
+        source = os.path.join(temporary, "source.h")
+        output = os.path.join(temporary, "headers", f"{header}.gch")
+        os.makedirs(os.path.dirname(output))
+
+        with open(source, "w") as f:
+            f.write(f"#include <{header}>\n")
+
+        subprocess.run(
+            shlex.split(precompile_command.format(source=source, output=output)),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=timeout,
+            check=True,
+        )
+
+        os.rename(os.path.join(temporary, "headers"), directory)
+    finally:
+        shutil.rmtree(temporary, ignore_errors=True)
+
+
+def _get_key(header: str, precompile_command: str) -> str | None:
+    # Compile without the precompiled header fails the same way if the compiler
+    # is not installed.
+    if (compiler_path := shutil.which(shlex.split(precompile_command)[0])) is None:
+        return None
+
+    compiler = os.stat(compiler_path)
+
+    digest = hashlib.sha256(
+        "\0".join(
+            (
+                header,
+                precompile_command,
+                str(compiler.st_size),
+                str(compiler.st_mtime_ns),
+            )
+        ).encode()
+    )
+
+    return digest.hexdigest()[:16]
@@ -1,3 +1,8 @@
 from .exceptions import ExecuteException
 from .execute import execute
+from .interactive import execute_interactive
+from .policy import SystemcallPolicy
 from .result import ExecuteResult
+from .sandbox import Sandbox, prepare_cgroup_pool, prepare_spawner
+from .supervisor import ExecuteRequest, execute_many
+from .telemetry import Telemetry
@@ -0,0 +1,42 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from judger.execute.result import ExecuteResult
+from judger.execute.sandbox import Sandbox
+
+RunResult = tuple[ExecuteResult | None, int, int, dict[int, int]]
+
+
+def execute_interactive(
+    solution: Sandbox,
+    interactor: Sandbox,
+    solution_stderr_filename: str,
+    interactor_stderr_filename: str,
+    interactor_arguments: list[str] | None = None,
+) -> tuple[RunResult, RunResult]:
+    # Programs are connected by pipes passed as their stdin and stdout, so
+    # bytes never go through the judger. Both run at the same time in their
+    # own cgroups, and each is traced by the thread that spawned it.
+    to_solution_read, to_solution_write = os.pipe()
+    to_interactor_read, to_interactor_write = os.pipe()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # Sandbox closes the pipes once spawned, also on failures.
+        interactor_future = executor.submit(
+            interactor.run,
+            os.devnull,
+            os.devnull,
+            interactor_stderr_filename,
+            interactor_arguments,
+            stdin=to_interactor_read,
+            stdout=to_solution_write,
+        )
+        solution_result = solution.run(
+            os.devnull,
+            os.devnull,
+            solution_stderr_filename,
+            stdin=to_solution_read,
+            stdout=to_interactor_write,
+        )
+
+        return solution_result, interactor_future.result()
@@ -0,0 +1,98 @@
+import fcntl
+import os
+import threading
+from contextlib import AbstractContextManager, suppress
+from types import TracebackType
+from typing import TYPE_CHECKING
+
+from judger.cgroup import Cgroup
+from judger.execute.result import ExecuteResult
+from judger.logger import _log
+
+if TYPE_CHECKING:
+    from judger.check import StreamChecker
+
+READ_SIZE = 64 * 1024
+PIPE_SIZE = 1024 * 1024
+
+
+def open_output_pipe() -> tuple[int, int]:
+    read, write = os.pipe()
+
+    # Larger pipe lets the program write without waiting for the monitor.
+    with suppress(OSError):
+        fcntl.fcntl(write, fcntl.F_SETPIPE_SZ, PIPE_SIZE)
+
+    return read, write
+
+
+class OutputMonitor(AbstractContextManager):
+    # Copies stdout of the program from a pipe into the file, and kills the
+    # cgroup as soon as the output is too long or diverges from the answer.
+    def __init__(
+        self,
+        read_fd: int,
+        stdout_filename: str,
+        output_limit: int,
+        cgroup: Cgroup,
+        checker: "StreamChecker | None" = None,
+    ) -> None:
+        self.output_limit = output_limit
+        self.cgroup = cgroup
+        self.checker = checker
+
+        self.result: ExecuteResult | None = None
+        self.size = 0
+
+        self._read_fd = read_fd
+        self._file_fd = os.open(
+            stdout_filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644
+        )
+        self._thread = threading.Thread(target=self._monitor, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> bool | None:
+        # Descendants left in the cgroup could keep the pipe open.
+        self._kill()
+        self._thread.join()
+
+        for fd in (self._read_fd, self._file_fd):
+            os.close(fd)
+
+        return False
+
+    def _monitor(self):
+        while data := os.read(self._read_fd, READ_SIZE):
+            # Rest of the output is drained, so the program never blocks on
+            # a full pipe before it is killed.
+            if self.result is not None:
+                continue
+
+            self.size += len(data)
+
+            if self.size > self.output_limit:
+                _log.info("Output limit exceeded. Kill process.")
+                self.result = ExecuteResult.OUTPUT_LIMIT_EXCEEDED
+                self._kill()
+                continue
+
+            os.write(self._file_fd, data)
+
+            if self.checker is not None and not self.checker.feed(data):
+                _log.info("Output diverged from the answer. Kill process.")
+                self.result = ExecuteResult.WRONG_ANSWER
+                self._kill()
+
+    def _kill(self):
+        try:
+            self.cgroup.kill()
+        except Exception as e:
+            _log.warn("Failed to kill cgroup.", exc_info=e)
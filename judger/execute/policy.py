@@ -0,0 +1,33 @@
+# Count limit of a system call that never runs out.
+UNLIMITED = -1
+
+
+class SystemcallPolicy:
+    # Count limits of system calls compiled into a list indexed by the system
+    # call number, so the tracer finds a limit with a single index. Negative
+    # counts are unlimited, zero is denied and numbers without a limit (None)
+    # are unknown system calls.
+    def __init__(self, systemcall_count_limits: dict[int, int]) -> None:
+        self.numbers = sorted(systemcall_count_limits)
+        self.limits: list[int | None] = [None] * (
+            self.numbers[-1] + 1 if self.numbers else 0
+        )
+
+        for number, count in systemcall_count_limits.items():
+            self.limits[number] = count
+
+    @classmethod
+    def of(
+        cls, systemcall_count_limits: "SystemcallPolicy | dict[int, int]"
+    ) -> "SystemcallPolicy":
+        if isinstance(systemcall_count_limits, SystemcallPolicy):
+            return systemcall_count_limits
+
+        return cls(systemcall_count_limits)
+
+    def get_unlimited_numbers(self) -> list[int]:
+        return [
+            number
+            for number in self.numbers
+            if (limit := self.limits[number]) is not None and limit < 0
+        ]
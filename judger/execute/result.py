@@ -3,6 +3,10 @@ import enum
 
 class ExecuteResult(enum.Enum):
     GOOD = "good"
+
+    # Output Check
+    ACCEPTED = "accepted"
+    WRONG_ANSWER = "wrong_answer"
     NON_ZERO_EXIT_CODE = "non_zero_exit_code"
     RUNTIME_ERROR = "runtime_error"
 
@@ -17,5 +21,8 @@ class ExecuteResult(enum.Enum):
     UNKNOWN_SYSCALL = "unknown_syscall"
     NOT_ALLOWED_SYSCALL = "not_allowed_syscall"
 
+    # Not executed since an earlier testcase failed
+    SKIPPED = "skipped"
+
     # Exception
     ERROR = "error"
@@ -0,0 +1,404 @@
+import atexit
+import ctypes
+import os
+import signal
+import sys
+import time
+from contextlib import AbstractContextManager
+from types import TracebackType
+from typing import TYPE_CHECKING, Iterable
+
+from judger.cgroup import Cgroup, CgroupPool
+from judger.execute.exceptions import ExecuteException
+from judger.execute.monitor import OutputMonitor, open_output_pipe
+from judger.execute.policy import SystemcallPolicy
+from judger.execute.result import ExecuteResult
+from judger.execute.telemetry import Telemetry, collect_telemetry
+from judger.execute.tracee import Tracee
+from judger.execute.watchdog import Watchdog, get_default_wall_time_limit
+from judger.execute.zygote import Zygote
+from judger.logger import _log
+from judger.ptrace import (
+    PtraceEvents,
+    PtraceOptions,
+    ptrace_cont,
+    ptrace_interrupt,
+    ptrace_seize,
+    ptrace_syscall,
+)
+from judger.seccomp import build_filter
+from judger.seccomp.types import SockFilter
+
+if TYPE_CHECKING:
+    from judger.check import StreamChecker
+
+SPAWNER = os.path.join(os.path.dirname(__file__), "spawner.py")
+
+_cgroup_pool: CgroupPool | None = None
+_spawner: Zygote | None = None
+_spawner_pid: int | None = None
+
+
+class Sandbox(AbstractContextManager):
+    def __init__(
+        self,
+        working_directory: str,
+        execute_command: str,
+        time_limit: int,
+        memory_limit: int,
+        output_limit: int,
+        systemcall_count_limits: SystemcallPolicy | dict[int, int],
+        seccomp: bool = False,
+        zygote_command: str | None = None,
+        wall_time_limit: int | None = None,
+    ) -> None:
+        self.working_directory = working_directory
+        self.execute_command = execute_command
+        self.time_limit = time_limit
+        self.wall_time_limit = (
+            wall_time_limit
+            if wall_time_limit is not None
+            else get_default_wall_time_limit(time_limit)
+        )
+        self.memory_limit = memory_limit
+        self.output_limit = output_limit
+        self.systemcall_policy = SystemcallPolicy.of(systemcall_count_limits)
+        self.seccomp = seccomp
+        self.zygote: Zygote | None = None
+        # Telemetry of the last run, None when it is not available.
+        self.telemetry: Telemetry | None = None
+
+        try:
+            self._seccomp_filter = (
+                _build_seccomp_filter(self.systemcall_policy) if seccomp else None
+            )
+            self.cgroup = _acquire_cgroup(memory_limit)
+
+            if zygote_command is not None:
+                self.zygote = Zygote(working_directory, zygote_command)
+        except Exception as e:
+            raise ExecuteException("Failed to prepare sandbox.") from e
+
+    def run(
+        self,
+        stdin_filename: str,
+        stdout_filename: str,
+        stderr_filename: str,
+        arguments: list[str] | None = None,
+        checker: "StreamChecker | None" = None,
+        stdin: int | None = None,
+        stdout: int | None = None,
+    ) -> tuple[ExecuteResult | None, int, int, dict[int, int]]:
+        pid, monitor = self._start(
+            stdin_filename,
+            stdout_filename,
+            stderr_filename,
+            arguments,
+            checker,
+            stdin,
+            stdout,
+        )
+
+        try:
+            result, self.telemetry = _execute_parent(
+                pid,
+                self.cgroup,
+                self.time_limit,
+                self.wall_time_limit,
+                self.systemcall_policy,
+                self.seccomp,
+                wait_for_exec=self.zygote is None,
+            )
+        finally:
+            # Monitor reads until the program closes the last write end.
+            if monitor is not None:
+                monitor.__exit__(None, None, None)
+
+        return self._finish(result, monitor, checker)
+
+    # Spawns the program without waiting for it, see also execute_many.
+    def _start(
+        self,
+        stdin_filename: str,
+        stdout_filename: str,
+        stderr_filename: str,
+        arguments: list[str] | None,
+        checker: "StreamChecker | None",
+        stdin: int | None,
+        stdout: int | None,
+    ) -> tuple[int, OutputMonitor | None]:
+        self.telemetry = None
+        monitor = None
+
+        # Given pipes are used instead of the files. They are closed once the
+        # program is spawned, so the other end sees EOF when it exits.
+        try:
+            if checker is not None and stdout is not None:
+                raise ValueError("Output of a piped program can't be checked.")
+
+            self.cgroup.reset()
+        except Exception as e:
+            _close_pipes(stdin, stdout)
+            raise ExecuteException() from e
+
+        # Output is checked while the program runs through a pipe, so a wrong
+        # answer is killed without spending the rest of the time limit.
+        if checker is not None:
+            read, stdout = open_output_pipe()
+
+            try:
+                monitor = OutputMonitor(
+                    read,
+                    os.path.join(self.working_directory, stdout_filename),
+                    self.output_limit,
+                    self.cgroup,
+                    checker,
+                )
+            except Exception as e:
+                _close_pipes(stdin, read, stdout)
+                raise ExecuteException("Failed to open stdout file.") from e
+
+            monitor.__enter__()
+
+        try:
+            pid = _spawn(
+                self.zygote if self.zygote is not None else prepare_spawner(),
+                self.cgroup,
+                self.working_directory,
+                # Zygotes run their own program, the spawner executes the command.
+                self.execute_command if self.zygote is None else None,
+                stdin_filename,
+                stdout_filename,
+                stderr_filename,
+                self.time_limit,
+                self.output_limit,
+                self._seccomp_filter,
+                self.seccomp,
+                arguments,
+                stdin,
+                stdout,
+            )
+        except BaseException as e:
+            if monitor is not None:
+                monitor.__exit__(None, None, None)
+            raise e
+        finally:
+            _close_pipes(stdin, stdout)
+
+        return pid, monitor
+
+    # Called once the monitor is closed, so its result is final.
+    def _finish(
+        self,
+        result: tuple[ExecuteResult | None, int, int, dict[int, int]],
+        monitor: OutputMonitor | None,
+        checker: "StreamChecker | None",
+    ) -> tuple[ExecuteResult | None, int, int, dict[int, int]]:
+        if monitor is None or checker is None:
+            return result
+
+        execute_result, time, memory, systemcall_counts = result
+
+        # Program killed by the monitor is signaled with SIGKILL, which is a
+        # runtime error to the tracee. Other results of the program are kept.
+        if monitor.result is not None and execute_result in (
+            ExecuteResult.GOOD,
+            ExecuteResult.RUNTIME_ERROR,
+        ):
+            execute_result = monitor.result
+        elif execute_result == ExecuteResult.GOOD:
+            execute_result = (
+                ExecuteResult.ACCEPTED
+                if checker.finish()
+                else ExecuteResult.WRONG_ANSWER
+            )
+
+        return execute_result, time, memory, systemcall_counts
+
+    def run_many(
+        self, files: Iterable[tuple[str, str, str]]
+    ) -> list[tuple[ExecuteResult | None, int, int, dict[int, int]]]:
+        return [
+            self.run(stdin_filename, stdout_filename, stderr_filename)
+            for stdin_filename, stdout_filename, stderr_filename in files
+        ]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> bool | None:
+        if self.zygote is not None:
+            self.zygote.__exit__(__exc_type, __exc_value, __traceback)
+
+        _release_cgroup(self.cgroup)
+
+        return False
+
+
+def _close_pipes(*fds: int | None):
+    for fd in fds:
+        if fd is not None:
+            os.close(fd)
+
+
+def _build_seccomp_filter(
+    systemcall_policy: SystemcallPolicy,
+) -> ctypes.Array[SockFilter]:
+    # Unlimited system calls don't need to be counted, so they never stop.
+    return build_filter(systemcall_policy.get_unlimited_numbers())
+
+
+def prepare_cgroup_pool(size: int | None = None) -> CgroupPool:
+    global _cgroup_pool
+
+    # Cgroups are named after the process, forked processes make their own pool.
+    prefix = f"sandbox-{os.getpid()}"
+
+    if _cgroup_pool is None or _cgroup_pool.prefix != prefix:
+        _cgroup_pool = CgroupPool(
+            "/sys/fs/cgroup",
+            prefix,
+            size if size is not None else len(os.sched_getaffinity(0)),
+        )
+        atexit.register(_cgroup_pool.__exit__, None, None, None)
+
+    return _cgroup_pool
+
+
+def _acquire_cgroup(memory_limit: int) -> Cgroup:
+    cgroup = prepare_cgroup_pool().acquire()
+
+    try:
+        cgroup.set_max_memory_usage(memory_limit)
+        cgroup.set_max_cpu_usage(1)
+    except Exception as e:
+        _release_cgroup(cgroup)
+        raise e
+
+    return cgroup
+
+
+def _release_cgroup(cgroup: Cgroup):
+    prepare_cgroup_pool().release(cgroup)
+
+
+def prepare_spawner() -> Zygote:
+    global _spawner, _spawner_pid
+
+    if _spawner is None or _spawner_pid != os.getpid():
+        _spawner = Zygote("/", f"{sys.executable} -I -S {SPAWNER}")
+        _spawner_pid = os.getpid()
+        atexit.register(_spawner.__exit__, None, None, None)
+
+    return _spawner
+
+
+def _spawn(
+    zygote: Zygote,
+    cgroup: Cgroup,
+    working_directory: str,
+    execute_command: str | None,
+    stdin_filename: str,
+    stdout_filename: str,
+    stderr_filename: str,
+    time_limit: int,
+    output_limit: int,
+    seccomp_filter: ctypes.Array[SockFilter] | None,
+    seccomp: bool,
+    arguments: list[str] | None = None,
+    stdin: int | None = None,
+    stdout: int | None = None,
+) -> int:
+    try:
+        pid, go = zygote.spawn(
+            os.path.join(working_directory, stdin_filename),
+            os.path.join(working_directory, stdout_filename),
+            os.path.join(working_directory, stderr_filename),
+            time_limit,
+            output_limit,
+            bytes(seccomp_filter) if seccomp_filter is not None else None,
+            cgroup,
+            working_directory,
+            execute_command,
+            arguments,
+            stdin,
+            stdout,
+        )
+    except ExecuteException as e:
+        raise e
+    except Exception as e:
+        raise ExecuteException() from e
+
+    try:
+        _handle_seize_under_ptrace(pid, seccomp)
+        os.write(go, b"\x01")
+    except Exception as e:
+        os.kill(pid, signal.SIGKILL)
+        raise ExecuteException("Failed to attach spawned child.") from e
+    finally:
+        os.close(go)
+
+    return pid
+
+
+def _execute_parent(
+    pid: int,
+    cgroup: Cgroup,
+    time_limit: int,
+    wall_time_limit: int,
+    systemcall_policy: SystemcallPolicy,
+    seccomp: bool,
+    wait_for_exec: bool,
+) -> tuple[tuple[ExecuteResult | None, int, int, dict[int, int]], Telemetry | None]:
+    tracee = Tracee(pid, cgroup, systemcall_policy, seccomp, wait_for_exec)
+    rusage = None
+
+    started_at = time.monotonic_ns()
+    supervisor_started_at = time.thread_time_ns()
+
+    with Watchdog(pid, cgroup, time_limit, wall_time_limit) as watchdog:
+        while not tracee.finished:
+            _, status, rusage = os.wait4(pid, 0)
+            tracee.handle(status, watchdog.expired)
+
+    telemetry = collect_telemetry(
+        cgroup,
+        rusage,
+        (time.monotonic_ns() - started_at) // 1000,
+        (time.thread_time_ns() - supervisor_started_at) // 1000,
+        tracee.stops,
+    )
+
+    return tracee.get_result(), telemetry
+
+
+def _handle_seize_under_ptrace(pid: int, seccomp: bool):
+    ptrace_option = (
+        PtraceOptions.PTRACE_O_TRACESYSGOOD
+        | PtraceOptions.PTRACE_O_EXITKILL
+        | PtraceOptions.PTRACE_O_TRACEEXIT
+        | PtraceOptions.PTRACE_O_TRACEEXEC
+    )
+
+    if seccomp:
+        ptrace_option |= PtraceOptions.PTRACE_O_TRACESECCOMP
+
+    ptrace_seize(pid, ptrace_option)
+    ptrace_interrupt(pid)
+
+    _, status = os.waitpid(pid, 0)
+
+    if os.WIFSTOPPED(status) and status >> 16 == PtraceEvents.PTRACE_EVENT_STOP:
+        _log.info("Handle seize under ptrace success.")
+
+        if seccomp:
+            ptrace_cont(pid)
+        else:
+            ptrace_syscall(pid)
+    else:
+        raise ExecuteException("Failed to handle seize under ptrace.")
@@ -0,0 +1,132 @@
+# Spawner for sandboxed programs.
+#
+# Started once per judger process with the control socket on fd 3:
+#
+#   python3 -I -S spawner.py
+#
+# Forking the judger copies its whole address space, so programs are forked
+# from this small process instead. A child is moved into the requested cgroup
+# before it's reported to the judger, then waits until the judger attached with
+# ptrace and executes the program.
+#
+# This file runs without the judger package on the path, so it must only
+# depend on the standard library.
+import ctypes
+import json
+import os
+import resource
+import shlex
+import signal
+import socket
+
+CONTROL_FILENO = 3
+
+PR_SET_SECCOMP = 22
+PR_SET_NO_NEW_PRIVS = 38
+SECCOMP_MODE_FILTER = 2
+
+
+class SockFprog(ctypes.Structure):
+    _fields_ = [("len", ctypes.c_ushort), ("filter", ctypes.c_void_p)]
+
+
+def main():
+    # Children are reaped by the kernel once the judger (tracer) waited them.
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+
+    control = socket.socket(fileno=CONTROL_FILENO)
+
+    while True:
+        try:
+            message, fds, _, _ = socket.recv_fds(control, 65536, 5)
+        except OSError:
+            break
+
+        if not message:
+            break
+
+        request = json.loads(message)
+
+        pid = os.fork()
+
+        if pid == 0:
+            control.close()
+            _run_child(request, fds)
+
+        response = {"pid": pid}
+
+        try:
+            _join_cgroup(pid, fds[4])
+        except OSError as e:
+            os.kill(pid, signal.SIGKILL)
+            response = {"error": f"Failed to join cgroup. {e}"}
+
+        for fd in fds:
+            os.close(fd)
+
+        control.send(json.dumps(response).encode())
+
+
+def _join_cgroup(pid: int, cgroup: int):
+    fd = os.open("cgroup.procs", os.O_WRONLY, dir_fd=cgroup)
+    try:
+        os.write(fd, str(pid).encode())
+    finally:
+        os.close(fd)
+
+
+def _run_child(request: dict, fds: list[int]):
+    try:
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        # Python ignores SIGPIPE, programs writing into a closed pipe expect
+        # to be killed.
+        signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+        stdin, stdout, stderr, go, cgroup = fds
+        os.close(cgroup)
+
+        for fd, target in ((stdin, 0), (stdout, 1), (stderr, 2)):
+            os.dup2(fd, target)
+            os.close(fd)
+
+        os.chdir(request["working_directory"])
+
+        resource.setrlimit(resource.RLIMIT_CPU, tuple(request["cpu_limit"]))
+        resource.setrlimit(resource.RLIMIT_FSIZE, tuple(request["output_limit"]))
+
+        # Judger writes a byte after attaching, EOF means it gave up.
+        if os.read(go, 1) != b"\x01":
+            os._exit(1)
+        os.close(go)
+
+        if request["seccomp_filter"] is not None:
+            _install_seccomp_filter(bytes.fromhex(request["seccomp_filter"]))
+
+        command = shlex.split(request["execute_command"]) + request["arguments"]
+        os.execve(command[0], command, {})
+    finally:
+        os._exit(1)
+
+
+def _install_seccomp_filter(instructions: bytes):
+    libc = ctypes.CDLL(None, use_errno=True)
+    libc.prctl.argtypes = [
+        ctypes.c_int,
+        ctypes.c_ulong,
+        ctypes.c_void_p,
+        ctypes.c_ulong,
+        ctypes.c_ulong,
+    ]
+
+    buffer = ctypes.create_string_buffer(instructions, len(instructions))
+    program = SockFprog(len(instructions) // 8, ctypes.addressof(buffer))
+
+    if libc.prctl(PR_SET_NO_NEW_PRIVS, 1, None, 0, 0) != 0:
+        os._exit(1)
+
+    if libc.prctl(PR_SET_SECCOMP, SECCOMP_MODE_FILTER, ctypes.byref(program), 0, 0):
+        os._exit(1)
+
+
+if __name__ == "__main__":
+    main()
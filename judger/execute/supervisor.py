@@ -0,0 +1,291 @@
+import math
+import os
+import select
+import signal
+import threading
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from judger.execute.exceptions import ExecuteException
+from judger.execute.result import ExecuteResult
+from judger.execute.sandbox import Sandbox
+from judger.execute.telemetry import collect_telemetry
+from judger.execute.tracee import Tracee
+from judger.execute.watchdog import get_time_left, kill_expired
+from judger.logger import _log
+from judger.utils.inotify import (
+    IN_MODIFY,
+    inotify_add_watch,
+    inotify_drain,
+    inotify_init,
+)
+
+if TYPE_CHECKING:
+    from judger.check import StreamChecker
+
+
+# Same arguments as Sandbox.run. A sandbox runs one request at a time, requests
+# of a busy sandbox wait for it.
+@dataclass(kw_only=True, frozen=True)
+class ExecuteRequest:
+    sandbox: Sandbox
+    stdin_filename: str
+    stdout_filename: str
+    stderr_filename: str
+    arguments: list[str] | None = None
+    checker: "StreamChecker | None" = None
+    stdin: int | None = None
+    stdout: int | None = None
+
+
+# Runs requests on their sandboxes from one thread, and yields results in the
+# order the runs finish. Sandbox.telemetry is of the last finished run.
+def execute_many(
+    requests: Iterable[ExecuteRequest], parallelism: int | None = None
+) -> Iterator[
+    tuple[ExecuteRequest, tuple[ExecuteResult | None, int, int, dict[int, int]]]
+]:
+    if parallelism is None:
+        parallelism = len(os.sched_getaffinity(0))
+
+    pending = iter(requests)
+    waiting: list[ExecuteRequest] = []
+    runs: dict[int, _Run] = {}
+
+    epoll = select.epoll()
+
+    try:
+        while True:
+            while len(runs) < parallelism:
+                request = _next_request(pending, waiting, runs)
+                if request is None:
+                    break
+
+                run = _Run(request)
+                runs[run.pid] = run
+                run.register(epoll)
+
+            if not runs:
+                break
+
+            timeout = min(run.check_deadline() for run in runs.values())
+
+            for fd, _ in epoll.poll(timeout / 1000 if timeout != math.inf else -1):
+                for run in runs.values():
+                    run.drain(fd)
+
+            for pid, run in list(runs.items()):
+                if run.reap():
+                    del runs[pid]
+                    run.close(epoll)
+                    yield run.request, run.finish()
+    finally:
+        for run in runs.values():
+            run.abort()
+            run.close(epoll)
+
+        epoll.close()
+
+
+def _next_request(
+    pending: Iterator[ExecuteRequest],
+    waiting: list[ExecuteRequest],
+    runs: dict[int, "_Run"],
+) -> ExecuteRequest | None:
+    busy = {id(run.request.sandbox) for run in runs.values()}
+
+    for index, request in enumerate(waiting):
+        if id(request.sandbox) not in busy:
+            return waiting.pop(index)
+
+    for request in pending:
+        if id(request.sandbox) not in busy:
+            return request
+
+        waiting.append(request)
+
+    return None
+
+
+class _Run:
+    def __init__(self, request: ExecuteRequest) -> None:
+        self.request = request
+        self.sandbox = request.sandbox
+        self.expired = False
+        self.rusage = None
+
+        self.pid, self.monitor = self.sandbox._start(
+            request.stdin_filename,
+            request.stdout_filename,
+            request.stderr_filename,
+            request.arguments,
+            request.checker,
+            request.stdin,
+            request.stdout,
+        )
+
+        fds: list[int] = []
+
+        try:
+            self.pidfd = os.pidfd_open(self.pid)
+            fds.append(self.pidfd)
+            self.inotify = inotify_init()
+            fds.append(self.inotify)
+            self.waiter = _ChildWaiter(self.pid)
+        except Exception as e:
+            self.abort()
+            for fd in fds:
+                os.close(fd)
+            raise ExecuteException("Failed to start sandbox.") from e
+
+        cgroup = self.sandbox.cgroup
+
+        # memory.events changes on oom kill, cgroup.events when it's emptied.
+        for filename in ("memory.events", "cgroup.events"):
+            try:
+                inotify_add_watch(
+                    self.inotify,
+                    os.path.join(cgroup.path, cgroup.name, filename),
+                    IN_MODIFY,
+                )
+            except OSError as e:
+                _log.debug(f"Failed to watch {filename}.", exc_info=e)
+
+        self.tracee = Tracee(
+            self.pid,
+            cgroup,
+            self.sandbox.systemcall_policy,
+            self.sandbox.seccomp,
+            wait_for_exec=self.sandbox.zygote is None,
+        )
+        self.started_at = time.monotonic()
+        self.supervisor_time = 0
+
+    def register(self, epoll: select.epoll):
+        for fd in (self.pidfd, self.inotify, self.waiter.fd):
+            epoll.register(fd, select.EPOLLIN)
+
+    def drain(self, fd: int):
+        if fd == self.inotify:
+            inotify_drain(fd)
+        elif fd == self.waiter.fd:
+            self.waiter.drain()
+
+    def check_deadline(self) -> float:
+        if self.expired:
+            return math.inf
+
+        time_left = get_time_left(
+            self.sandbox.cgroup,
+            self.sandbox.time_limit,
+            self.sandbox.wall_time_limit,
+            self.started_at,
+        )
+
+        if time_left > 0:
+            return math.ceil(time_left)
+
+        self.expired = True
+        kill_expired(self.sandbox.cgroup, self.pidfd)
+
+        return math.inf
+
+    def reap(self) -> bool:
+        started_at = time.thread_time_ns()
+
+        while not self.tracee.finished:
+            pid, status, self.rusage = os.wait4(self.pid, os.WNOHANG)
+            if pid == 0:
+                self.waiter.resume()
+                break
+
+            self.tracee.handle(status, self.expired)
+
+        self.supervisor_time += time.thread_time_ns() - started_at
+
+        return self.tracee.finished
+
+    def finish(self) -> tuple[ExecuteResult | None, int, int, dict[int, int]]:
+        result = self.tracee.get_result()
+
+        self.sandbox.telemetry = collect_telemetry(
+            self.sandbox.cgroup,
+            self.rusage,
+            int((time.monotonic() - self.started_at) * 1000000),
+            self.supervisor_time // 1000,
+            self.tracee.stops,
+        )
+
+        if self.monitor is not None:
+            self.monitor.__exit__(None, None, None)
+
+        return self.sandbox._finish(result, self.monitor, self.request.checker)
+
+    def abort(self):
+        with suppress(ProcessLookupError):
+            os.kill(self.pid, signal.SIGKILL)
+
+        with suppress(ChildProcessError):
+            while True:
+                _, status = os.waitpid(self.pid, 0)
+                if os.WIFEXITED(status) or os.WIFSIGNALED(status):
+                    break
+
+        if self.monitor is not None:
+            self.monitor.__exit__(None, None, None)
+
+    def close(self, epoll: select.epoll):
+        for fd in (self.pidfd, self.inotify):
+            with suppress(OSError):
+                epoll.unregister(fd)
+            os.close(fd)
+
+        with suppress(OSError):
+            epoll.unregister(self.waiter.fd)
+        self.waiter.close()
+
+
+class _ChildWaiter:
+    # Ptrace stops don't make a pidfd readable, and SIGCHLD can only be caught
+    # on the main thread. A thread waits for the child without reaping it, and
+    # writes to a pipe until the loop has handled the change.
+    def __init__(self, pid: int) -> None:
+        self.pid = pid
+        self.fd, self._write_fd = os.pipe()
+        os.set_blocking(self.fd, False)
+
+        self._resumed = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._wait, daemon=True)
+        self._thread.start()
+
+    def _wait(self):
+        while not self._closed:
+            try:
+                os.waitid(os.P_PID, self.pid, os.WEXITED | os.WSTOPPED | os.WNOWAIT)
+            except ChildProcessError:
+                return
+
+            os.write(self._write_fd, b"\x00")
+
+            self._resumed.wait()
+            self._resumed.clear()
+
+    def drain(self):
+        with suppress(BlockingIOError):
+            while os.read(self.fd, 4096):
+                pass
+
+    def resume(self):
+        self._resumed.set()
+
+    def close(self):
+        # Child is reaped, so the thread stops waiting.
+        self._closed = True
+        self._resumed.set()
+        self._thread.join()
+
+        os.close(self.fd)
+        os.close(self._write_fd)
@@ -0,0 +1,52 @@
+import resource
+from dataclasses import dataclass
+
+from judger.cgroup import Cgroup
+from judger.logger import _log
+
+
+@dataclass(kw_only=True, frozen=True)
+class Telemetry:
+    # Times are in microseconds.
+    user_time: int
+    system_time: int
+    wall_time: int
+    # Cpu time the judger spent supervising the program.
+    supervisor_time: int
+    voluntary_context_switches: int
+    involuntary_context_switches: int
+    minor_page_faults: int
+    major_page_faults: int
+    read_bytes: int
+    write_bytes: int
+    ptrace_stops: int
+
+
+def collect_telemetry(
+    cgroup: Cgroup,
+    rusage: resource.struct_rusage | None,
+    wall_time: int,
+    supervisor_time: int,
+    ptrace_stops: int,
+) -> Telemetry | None:
+    # Telemetry is only for diagnosis, it never fails the run.
+    try:
+        user_time, system_time = cgroup.get_cpu_times()
+        read_bytes, write_bytes = cgroup.get_io_bytes()
+    except Exception as e:
+        _log.warn("Failed to collect telemetry.", exc_info=e)
+        return None
+
+    return Telemetry(
+        user_time=user_time,
+        system_time=system_time,
+        wall_time=wall_time,
+        supervisor_time=supervisor_time,
+        voluntary_context_switches=rusage.ru_nvcsw if rusage is not None else 0,
+        involuntary_context_switches=rusage.ru_nivcsw if rusage is not None else 0,
+        minor_page_faults=rusage.ru_minflt if rusage is not None else 0,
+        major_page_faults=rusage.ru_majflt if rusage is not None else 0,
+        read_bytes=read_bytes,
+        write_bytes=write_bytes,
+        ptrace_stops=ptrace_stops,
+    )
@@ -0,0 +1,213 @@
+import os
+import signal
+from array import array
+
+from judger.cgroup import Cgroup
+from judger.execute.policy import SystemcallPolicy
+from judger.execute.result import ExecuteResult
+from judger.logger import _log
+from judger.ptrace import (
+    PtraceEvents,
+    PtraceException,
+    PtraceRequest,
+    SyscallInfoBuffer,
+    ptrace,
+    ptrace_cont,
+)
+
+# Wait statuses of system call stops, the most common ones by far.
+SYSCALL_STOP = (signal.SIGTRAP | 0x80) << 8 | 0x7F
+SECCOMP_STOP = (signal.SIGTRAP | PtraceEvents.PTRACE_EVENT_SECCOMP << 8) << 8 | 0x7F
+
+# op of ptrace_syscall_info
+SYSCALL_INFO_ENTRY = 1
+SYSCALL_INFO_SECCOMP = 3
+
+
+class Tracee:
+    def __init__(
+        self,
+        pid: int,
+        cgroup: Cgroup,
+        systemcall_policy: SystemcallPolicy,
+        seccomp: bool,
+        wait_for_exec: bool = False,
+    ) -> None:
+        self.pid = pid
+        self.cgroup = cgroup
+        self.systemcall_policy = systemcall_policy
+        # Limits are consumed during the run.
+        self.systemcall_limits = list(systemcall_policy.limits)
+        self.syscall_counts = array("Q", bytes(8 * len(self.systemcall_limits)))
+
+        self.finished = False
+        self.stops = 0
+        # System calls made before executing the program are not counted.
+        self._executed = not wait_for_exec
+        self.result: ExecuteResult | None = None
+        self._usage: tuple[int, int] | None = None
+
+        # Under seccomp only trapped system calls stop the child,
+        # so it's enough to continue instead of stopping at every system call.
+        self._resume_request = int(
+            PtraceRequest.PTRACE_CONT if seccomp else PtraceRequest.PTRACE_SYSCALL
+        )
+        self._syscall_info = SyscallInfoBuffer()
+
+    def handle(self, status: int, expired: bool):
+        if status == SYSCALL_STOP or status == SECCOMP_STOP:
+            self.stops += 1
+            self._handle_syscall_stop()
+            return
+
+        pid = self.pid
+        cgroup = self.cgroup
+        signal_to_deliver = 0
+
+        if os.WIFEXITED(status):
+            self.finished = True
+
+            if os.WEXITSTATUS(status) == 0:
+                self.result = ExecuteResult.GOOD
+                _log.info("Exit code is zero. All is good.")
+            else:
+                self.result = ExecuteResult.NON_ZERO_EXIT_CODE
+                _log.info("Exit code is non zero.")
+            return
+
+        if os.WIFSIGNALED(status):
+            self.finished = True
+
+            if self.result is not None:
+                return
+
+            self.result = _termsig_to_execute_result(status, cgroup, expired)
+            return
+
+        if os.WIFSTOPPED(status):
+            self.stops += 1
+
+            if status >> 8 == (signal.SIGTRAP | PtraceEvents.PTRACE_EVENT_EXEC << 8):
+                _log.debug("Handle ptrace event exec.")
+                self._executed = True
+
+            elif status >> 8 == (signal.SIGTRAP | PtraceEvents.PTRACE_EVENT_EXIT << 8):
+                _log.info("Handle ptrace event exit.")
+
+                self._usage = (
+                    cgroup.get_cpu_time() // 1000,
+                    cgroup.get_max_memory_usage(),
+                )
+
+                ptrace_cont(pid)
+                return
+
+            elif os.WSTOPSIG(status) == signal.SIGXFSZ:
+                _log.info("Output limit exceeded.")
+                self.result = ExecuteResult.OUTPUT_LIMIT_EXCEEDED
+
+            elif os.WSTOPSIG(status) == signal.SIGXCPU:
+                _log.info("Time limit exceeded.")
+                self.result = ExecuteResult.TIME_LIMIT_EXCEEDED
+
+            else:
+                # Signal delivery stop, pass the signal to the child.
+                signal_to_deliver = os.WSTOPSIG(status)
+
+        if self.result is not None:
+            # Result already determined. Kill child process.
+            os.kill(pid, signal.SIGKILL)
+            _log.debug(f"Result is set to {self.result} Kill process.")
+            return
+
+        self._resume(signal_to_deliver)
+
+    def _handle_syscall_stop(self):
+        # Runs for every trapped system call, ptrace is called directly and
+        # nothing is allocated.
+        if self._executed and self.result is None:
+            syscall_info = self._syscall_info
+            syscall_info.read(self.pid)
+            op = syscall_info.op.value
+
+            if op == SYSCALL_INFO_ENTRY or op == SYSCALL_INFO_SECCOMP:
+                self.result = _count_syscall(
+                    syscall_info.nr.value,
+                    self.systemcall_limits,
+                    self.syscall_counts,
+                )
+
+        if self.result is not None:
+            os.kill(self.pid, signal.SIGKILL)
+            _log.debug(f"Result is set to {self.result} Kill process.")
+            return
+
+        self._resume(0)
+
+    def _resume(self, signal_to_deliver: int):
+        if ptrace(self._resume_request, self.pid, None, signal_to_deliver) == -1:
+            raise PtraceException(PtraceRequest(self._resume_request))
+
+    def get_result(self) -> tuple[ExecuteResult | None, int, int, dict[int, int]]:
+        # Killed processes don't always stop at the exit event.
+        time, memory = (
+            self._usage
+            if self._usage is not None
+            else (
+                self.cgroup.get_cpu_time() // 1000,
+                self.cgroup.get_max_memory_usage(),
+            )
+        )
+
+        syscall_counts = {
+            number: self.syscall_counts[number]
+            for number in self.systemcall_policy.numbers
+        }
+
+        return self.result, time, memory, syscall_counts
+
+
+def _count_syscall(
+    syscall_number: int,
+    systemcall_limits: list[int | None],
+    syscall_counts: array,
+) -> ExecuteResult | None:
+    limit = (
+        systemcall_limits[syscall_number]
+        if 0 <= syscall_number < len(systemcall_limits)
+        else None
+    )
+
+    if limit is None:
+        _log.info(f"Unable to check if system call({syscall_number}) is allowed.")
+        return ExecuteResult.UNKNOWN_SYSCALL
+
+    if limit == 0:
+        _log.info(f"System call({syscall_number}) limit has been reached.")
+        return ExecuteResult.NOT_ALLOWED_SYSCALL
+
+    syscall_counts[syscall_number] += 1
+
+    if limit > 0:
+        systemcall_limits[syscall_number] = limit - 1
+
+    return None
+
+
+def _termsig_to_execute_result(
+    status: int,
+    cgroup: Cgroup,
+    expired: bool,
+) -> ExecuteResult:
+    sig = os.WTERMSIG(status)
+
+    if sig == signal.SIGKILL:
+        if cgroup.get_oom_kill() == 1:
+            _log.info("Memory limit exceeded.")
+            return ExecuteResult.MEMORY_LIMIT_EXCEEDED
+        if expired:
+            _log.info("Time limit exceeded.")
+            return ExecuteResult.TIME_LIMIT_EXCEEDED
+
+    _log.info(f"Signaled({sig}).")
+    return ExecuteResult.RUNTIME_ERROR
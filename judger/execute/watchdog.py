@@ -0,0 +1,107 @@
+import math
+import os
+import select
+import signal
+import threading
+import time
+from contextlib import AbstractContextManager, suppress
+from types import TracebackType
+
+from judger.cgroup import Cgroup
+from judger.logger import _log
+
+# Sleeping or blocked programs are killed after this many times the time limit.
+WALL_TIME_LIMIT_FACTOR = 3
+
+
+def get_default_wall_time_limit(time_limit: int) -> int:
+    return time_limit * WALL_TIME_LIMIT_FACTOR + 1000
+
+
+def get_cpu_rlimit(time_limit: int) -> tuple[int, int]:
+    # RLIMIT_CPU only has second granularity, it's a backstop in case
+    # the watchdog fails to kill the process in time.
+    seconds = math.ceil(time_limit / 1000) + 1
+    return seconds, seconds + 1
+
+
+class Watchdog(AbstractContextManager):
+    # Kills the cgroup as soon as either cpu time or wall clock budget is spent.
+    def __init__(
+        self,
+        pid: int,
+        cgroup: Cgroup,
+        time_limit: int,
+        wall_time_limit: int,
+    ) -> None:
+        self.pid = pid
+        self.cgroup = cgroup
+        self.time_limit = time_limit
+        self.wall_time_limit = wall_time_limit
+
+        self.expired = False
+
+        self._pidfd = os.pidfd_open(pid)
+        self._stop_read, self._stop_write = os.pipe()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> bool | None:
+        os.write(self._stop_write, b"\x00")
+        self._thread.join()
+
+        for fd in (self._pidfd, self._stop_read, self._stop_write):
+            os.close(fd)
+
+        return False
+
+    def _watch(self):
+        poller = select.poll()
+        poller.register(self._pidfd, select.POLLIN)
+        poller.register(self._stop_read, select.POLLIN)
+
+        started_at = time.monotonic()
+
+        while True:
+            time_left = get_time_left(
+                self.cgroup, self.time_limit, self.wall_time_limit, started_at
+            )
+
+            if time_left <= 0:
+                break
+
+            if poller.poll(math.ceil(time_left)):
+                return
+
+        self.expired = True
+        kill_expired(self.cgroup, self._pidfd)
+
+
+def get_time_left(
+    cgroup: Cgroup, time_limit: int, wall_time_limit: int, started_at: float
+) -> float:
+    # Cgroup is limited to a single cpu, so cpu time can't grow faster
+    # than the wall clock while sleeping.
+    cpu_time_left = time_limit - cgroup.get_cpu_time() / 1000
+    wall_time_left = wall_time_limit - (time.monotonic() - started_at) * 1000
+
+    return min(cpu_time_left, wall_time_left)
+
+
+def kill_expired(cgroup: Cgroup, pidfd: int):
+    _log.info("Time limit exceeded. Kill process.")
+
+    try:
+        cgroup.kill()
+    except Exception as e:
+        _log.warn("Failed to kill cgroup.", exc_info=e)
+        with suppress(ProcessLookupError):
+            signal.pidfd_send_signal(pidfd, signal.SIGKILL)
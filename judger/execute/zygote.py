@@ -0,0 +1,155 @@
+import json
+import os
+import shlex
+import socket
+import stat
+import threading
+from contextlib import AbstractContextManager
+from types import TracebackType
+
+from judger.cgroup import Cgroup
+from judger.execute.exceptions import ExecuteException
+from judger.execute.watchdog import get_cpu_rlimit
+from judger.logger import _log
+
+CONTROL_FILENO = 3
+
+
+class Zygote(AbstractContextManager):
+    def __init__(self, working_directory: str, zygote_command: str) -> None:
+        self.working_directory = working_directory
+        self.zygote_command = zygote_command
+        # Interactive runs spawn from several threads over the same socket.
+        self._lock = threading.Lock()
+
+        self._control, child_control = socket.socketpair(
+            socket.AF_UNIX, socket.SOCK_SEQPACKET
+        )
+
+        try:
+            self.pid = os.fork()
+        except Exception as e:
+            self._control.close()
+            child_control.close()
+            raise ExecuteException("Failed to start zygote.") from e
+
+        if self.pid == 0:
+            try:
+                _execute_zygote(working_directory, zygote_command, child_control)
+            finally:
+                os._exit(1)
+
+        child_control.close()
+        _log.info(f"Zygote({self.pid}) started.")
+
+    def spawn(
+        self,
+        stdin_filename: str,
+        stdout_filename: str,
+        stderr_filename: str,
+        time_limit: int,
+        output_limit: int,
+        seccomp_filter: bytes | None,
+        cgroup: Cgroup,
+        working_directory: str | None = None,
+        execute_command: str | None = None,
+        arguments: list[str] | None = None,
+        stdin: int | None = None,
+        stdout: int | None = None,
+    ) -> tuple[int, int]:
+        # Child is blocked until a byte is written into the returned pipe.
+        go_read, go_write = os.pipe()
+        fds = [
+            # Given pipes are used instead of the files.
+            os.open(stdin_filename, os.O_RDONLY) if stdin is None else os.dup(stdin),
+            _open(stdout_filename) if stdout is None else os.dup(stdout),
+            _open(stderr_filename),
+            go_read,
+        ]
+
+        request = {
+            "cpu_limit": get_cpu_rlimit(time_limit),
+            "output_limit": [output_limit, output_limit],
+            "seccomp_filter": seccomp_filter.hex()
+            if seccomp_filter is not None
+            else None,
+            "working_directory": working_directory
+            if working_directory is not None
+            else self.working_directory,
+            "execute_command": execute_command,
+            "arguments": arguments if arguments is not None else [],
+        }
+
+        try:
+            with self._lock:
+                socket.send_fds(
+                    self._control,
+                    [json.dumps(request).encode()],
+                    # Zygote moves the child into the cgroup through the directory.
+                    [*fds, cgroup.get_directory()],
+                )
+                response = self._control.recv(4096)
+        except OSError as e:
+            os.close(go_write)
+            raise ExecuteException("Failed to communicate with zygote.") from e
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+        if not response:
+            os.close(go_write)
+            raise ExecuteException("Zygote exited unexpectedly.")
+
+        response = json.loads(response)
+
+        if "error" in response:
+            os.close(go_write)
+            raise ExecuteException(response["error"])
+
+        return response["pid"], go_write
+
+    def __enter__(self):
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> bool | None:
+        # Zygote exits when the control socket is closed.
+        self._control.close()
+
+        try:
+            os.waitpid(self.pid, 0)
+            _log.info(f"Zygote({self.pid}) exited.")
+        except Exception as e:
+            _log.warn("Failed to wait zygote.", exc_info=e)
+
+        return False
+
+
+def _execute_zygote(
+    working_directory: str, zygote_command: str, control: socket.socket
+):
+    os.chdir(working_directory)
+
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    os.close(devnull)
+
+    os.dup2(control.fileno(), CONTROL_FILENO)
+    os.set_inheritable(CONTROL_FILENO, True)
+
+    command = shlex.split(zygote_command)
+    env: dict[str, str] = {}
+    os.execve(command[0], command, env)
+
+
+def _open(filename: str) -> int:
+    return os.open(
+        filename,
+        os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+        stat.S_IWUSR | stat.S_IRUSR,
+    )
@@ -1,9 +1,16 @@
 from dataclasses import dataclass
 
 
+# Testcases are stored compressed, and stdin of a program is a pipe the input
+# is decompressed into while the program reads it. Programs can't fstat, mmap
+# or seek stdin, so languages must read it as a stream.
 @dataclass(kw_only=True, frozen=True)
 class Language:
     display_name: str
     filename: str
     compile_command: str
     execute_command: str
+    zygote_command: str | None = None
+    # Built with `{source}` and `{output}` replaced, see judger.compile.
+    precompiled_header: str | None = None
+    precompile_command: str | None = None
@@ -5,4 +5,6 @@ CPP17 = Language(
     filename="main.cpp",
     compile_command="/usr/bin/g++ main.cpp -o main -O2 -lm -static -std=gnu++17",
     execute_command="./main",
+    precompiled_header="bits/stdc++.h",
+    precompile_command="/usr/bin/g++ -x c++-header {source} -o {output} -O2 -std=gnu++17",  # noqa: E501
 )
@@ -1,8 +1,10 @@
 from judger.language.base import Language
+from judger.language.zygote import PYTHON_ZYGOTE
 
 PYTHON3 = Language(
     display_name="Python 3",
     filename="main.py",
     compile_command="/usr/local/bin/python3 -W ignore -c \"import py_compile; py_compile.compile(r'main.py')\"",  # noqa: E501
     execute_command="/usr/local/bin/python3 -W ignore main.py",
+    zygote_command=f"/usr/local/bin/python3 -W ignore {PYTHON_ZYGOTE} main.py",
 )
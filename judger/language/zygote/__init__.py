@@ -0,0 +1,3 @@
+import os
+
+PYTHON_ZYGOTE = os.path.join(os.path.dirname(__file__), "python.py")
@@ -0,0 +1,222 @@
+# Zygote for Python 3 submissions.
+#
+# Started once per sandbox by the judger with the control socket on fd 3:
+#
+#   python3 -W ignore python.py main.py
+#
+# It compiles the submission and imports commonly used standard library
+# modules, then forks one child per request. A child waits until the
+# judger attached with ptrace, then runs the submission as `__main__`. Children
+# are moved into the requested cgroup before they're reported to the judger.
+#
+# This file runs with the interpreter used for submissions and an empty
+# environment, so it must only depend on the standard library.
+import atexit
+import ctypes
+import json
+import os
+import resource
+import signal
+import socket
+import sys
+import types
+
+CONTROL_FILENO = 3
+
+PRELOAD_MODULES = [
+    "array",
+    "bisect",
+    "collections",
+    "copy",
+    "dataclasses",
+    "decimal",
+    "fractions",
+    "functools",
+    "heapq",
+    "io",
+    "itertools",
+    "math",
+    "operator",
+    "random",
+    "re",
+    "statistics",
+    "string",
+    "typing",
+]
+
+PR_SET_SECCOMP = 22
+PR_SET_NO_NEW_PRIVS = 38
+SECCOMP_MODE_FILTER = 2
+
+
+class SockFprog(ctypes.Structure):
+    _fields_ = [("len", ctypes.c_ushort), ("filter", ctypes.c_void_p)]
+
+
+def main():
+    filename = sys.argv[1]
+    code = _load_code(filename)
+
+    for module in PRELOAD_MODULES:
+        __import__(module)
+
+    # Children are reaped by the kernel once the judger (tracer) waited them.
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+
+    control = socket.socket(fileno=CONTROL_FILENO)
+
+    while True:
+        try:
+            message, fds, _, _ = socket.recv_fds(control, 65536, 5)
+        except OSError:
+            break
+
+        if not message:
+            break
+
+        request = json.loads(message)
+
+        pid = os.fork()
+
+        if pid == 0:
+            control.close()
+            _run_child(filename, code, request, fds)
+
+        response = {"pid": pid}
+
+        try:
+            _join_cgroup(pid, fds[4])
+        except OSError as e:
+            os.kill(pid, signal.SIGKILL)
+            response = {"error": f"Failed to join cgroup. {e}"}
+
+        for fd in fds:
+            os.close(fd)
+
+        control.send(json.dumps(response).encode())
+
+
+def _join_cgroup(pid: int, cgroup: int):
+    fd = os.open("cgroup.procs", os.O_WRONLY, dir_fd=cgroup)
+    try:
+        os.write(fd, str(pid).encode())
+    finally:
+        os.close(fd)
+
+
+def _load_code(filename: str) -> types.CodeType | BaseException:
+    # Bytecode in __pycache__ could be replaced by a run of the submission, the
+    # sandbox can write to its working directory. Source is compiled instead.
+    try:
+        with open(filename, "rb") as f:
+            return compile(f.read(), filename, "exec")
+    except BaseException as e:
+        # Raised in every child, like running the file would do.
+        return e
+
+
+def _run_child(
+    filename: str,
+    code: types.CodeType | BaseException,
+    request: dict,
+    fds: list[int],
+):
+    try:
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+
+        stdin, stdout, stderr, go, cgroup = fds
+        os.close(cgroup)
+
+        for fd, target in ((stdin, 0), (stdout, 1), (stderr, 2)):
+            os.dup2(fd, target)
+            os.close(fd)
+
+        resource.setrlimit(resource.RLIMIT_CPU, tuple(request["cpu_limit"]))
+        resource.setrlimit(resource.RLIMIT_FSIZE, tuple(request["output_limit"]))
+
+        # Judger writes a byte after attaching, EOF means it gave up.
+        if os.read(go, 1) != b"\x01":
+            os._exit(1)
+        os.close(go)
+
+        if request["seccomp_filter"] is not None:
+            _install_seccomp_filter(bytes.fromhex(request["seccomp_filter"]))
+    except BaseException:
+        os._exit(1)
+
+    os._exit(_run_main(filename, code, request["arguments"]))
+
+
+def _install_seccomp_filter(instructions: bytes):
+    libc = ctypes.CDLL(None, use_errno=True)
+    libc.prctl.argtypes = [
+        ctypes.c_int,
+        ctypes.c_ulong,
+        ctypes.c_void_p,
+        ctypes.c_ulong,
+        ctypes.c_ulong,
+    ]
+
+    buffer = ctypes.create_string_buffer(instructions, len(instructions))
+    program = SockFprog(len(instructions) // 8, ctypes.addressof(buffer))
+
+    if libc.prctl(PR_SET_NO_NEW_PRIVS, 1, None, 0, 0) != 0:
+        os._exit(1)
+
+    if libc.prctl(PR_SET_SECCOMP, SECCOMP_MODE_FILTER, ctypes.byref(program), 0, 0):
+        os._exit(1)
+
+
+def _run_main(
+    filename: str, code: types.CodeType | BaseException, arguments: list[str]
+) -> int:
+    if "random" in sys.modules:
+        sys.modules["random"].seed()
+
+    module = types.ModuleType("__main__")
+    module.__file__ = filename
+    module.__builtins__ = __builtins__
+    sys.modules["__main__"] = module
+
+    sys.argv = [filename, *arguments]
+    sys.path[0] = os.getcwd()
+
+    exit_code = 0
+
+    try:
+        if isinstance(code, BaseException):
+            raise code
+        exec(code, module.__dict__)
+    except SystemExit as e:
+        exit_code = _handle_system_exit(e)
+    except BaseException:
+        sys.excepthook(*sys.exc_info())
+        exit_code = 1
+
+    if "threading" in sys.modules:
+        sys.modules["threading"]._shutdown()
+
+    atexit._run_exitfuncs()
+
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except BaseException:
+            exit_code = 120
+
+    return exit_code
+
+
+def _handle_system_exit(e: SystemExit) -> int:
+    if e.code is None:
+        return 0
+
+    if isinstance(e.code, int):
+        return e.code & 0xFF
+
+    print(e.code, file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    main()
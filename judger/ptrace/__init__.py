@@ -1,8 +1,12 @@
 from .constants import PtraceEvents, PtraceOptions, PtraceRequest
 from .exceptions import PtraceException
+from .ptrace import ptrace
 from .requests import (
+    SyscallInfoBuffer,
     ptrace_cont,
     ptrace_get_syscall_info,
+    ptrace_interrupt,
+    ptrace_seize,
     ptrace_set_options,
     ptrace_syscall,
     ptrace_trace_me,
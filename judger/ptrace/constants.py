@@ -67,3 +67,4 @@ class PtraceEvents(enum.IntEnum):
     PTRACE_EVENT_VFORK_DONE = 5
     PTRACE_EVENT_EXIT = 6
     PTRACE_EVENT_SECCOMP = 7
+    PTRACE_EVENT_STOP = 128
@@ -13,8 +13,8 @@ def ptrace_trace_me() -> int:
 
 
 @raise_on_ptrace_fail(PtraceRequest.PTRACE_SYSCALL)
-def ptrace_syscall(pid: int) -> int:
-    return ptrace(PtraceRequest.PTRACE_SYSCALL, pid, None, None)
+def ptrace_syscall(pid: int, data: int = 0) -> int:
+    return ptrace(PtraceRequest.PTRACE_SYSCALL, pid, None, data)
 
 
 @raise_on_ptrace_fail(PtraceRequest.PTRACE_SETOPTIONS)
@@ -22,6 +22,16 @@ def ptrace_set_options(pid: int, options: int) -> int:
     return ptrace(PtraceRequest.PTRACE_SETOPTIONS, pid, None, options)
 
 
+@raise_on_ptrace_fail(PtraceRequest.PTRACE_SEIZE)
+def ptrace_seize(pid: int, options: int) -> int:
+    return ptrace(PtraceRequest.PTRACE_SEIZE, pid, None, options)
+
+
+@raise_on_ptrace_fail(PtraceRequest.PTRACE_INTERRUPT)
+def ptrace_interrupt(pid: int) -> int:
+    return ptrace(PtraceRequest.PTRACE_INTERRUPT, pid, None, None)
+
+
 @raise_on_ptrace_fail(PtraceRequest.PTRACE_CONT)
 def ptrace_cont(pid: int, data: int = 0) -> int:
     return ptrace(PtraceRequest.PTRACE_CONT, pid, None, data)
@@ -40,3 +50,30 @@ def ptrace_get_syscall_info(pid: int) -> TPtraceSyscallInfo:
         raise PtraceException(PtraceRequest.PTRACE_GET_SYSCALL_INFO)
 
     return ptrace_syscall_info  # type: ignore
+
+
+class SyscallInfoBuffer:
+    # Syscall info of every stop is read into the same structure, so the
+    # tracer doesn't allocate one per system call. op and nr are read through
+    # views instead of nested structures, which are created on each access.
+    def __init__(self) -> None:
+        self.info = PtraceSyscallInfo()
+        self.op = ctypes.c_uint8.from_buffer(
+            self.info,
+            PtraceSyscallInfo.op.offset,  # type: ignore
+        )
+        # entry.nr and seccomp.nr share the offset of the union.
+        self.nr = ctypes.c_uint64.from_buffer(
+            self.info,
+            PtraceSyscallInfo._info.offset,  # type: ignore
+        )
+
+        self._size = ctypes.sizeof(self.info)
+        self._address = ctypes.addressof(self.info)
+
+    def read(self, pid: int):
+        if ptrace(_PTRACE_GET_SYSCALL_INFO, pid, self._size, self._address) == -1:
+            raise PtraceException(PtraceRequest.PTRACE_GET_SYSCALL_INFO)
+
+
+_PTRACE_GET_SYSCALL_INFO = int(PtraceRequest.PTRACE_GET_SYSCALL_INFO)
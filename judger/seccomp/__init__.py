@@ -0,0 +1,4 @@
+from .constants import SeccompReturn
+from .exceptions import SeccompException
+from .filter import build_filter
+from .seccomp import install_filter
@@ -0,0 +1,37 @@
+import enum
+
+AUDIT_ARCH_X86_64 = 0xC000003E
+
+PR_SET_SECCOMP = 22
+PR_SET_NO_NEW_PRIVS = 38
+
+SECCOMP_MODE_FILTER = 2
+
+
+class SeccompReturn(enum.IntEnum):
+    SECCOMP_RET_KILL_PROCESS = 0x80000000
+    SECCOMP_RET_KILL_THREAD = 0x00000000
+    SECCOMP_RET_TRAP = 0x00030000
+    SECCOMP_RET_ERRNO = 0x00050000
+    SECCOMP_RET_TRACE = 0x7FF00000
+    SECCOMP_RET_LOG = 0x7FFC0000
+    SECCOMP_RET_ALLOW = 0x7FFF0000
+
+
+class SeccompDataOffset(enum.IntEnum):
+    NR = 0
+    ARCH = 4
+
+
+class Bpf(enum.IntEnum):
+    BPF_LD = 0x00
+    BPF_JMP = 0x05
+    BPF_RET = 0x06
+
+    BPF_W = 0x00
+    BPF_ABS = 0x20
+
+    BPF_JEQ = 0x10
+    BPF_JGE = 0x30
+
+    BPF_K = 0x00
@@ -0,0 +1,2 @@
+class SeccompException(Exception):
+    pass
@@ -0,0 +1,63 @@
+import ctypes
+from typing import Iterable
+
+from judger.seccomp.constants import (
+    AUDIT_ARCH_X86_64,
+    Bpf,
+    SeccompDataOffset,
+    SeccompReturn,
+)
+from judger.seccomp.types import SockFilter
+
+
+def build_filter(allowed_syscalls: Iterable[int]) -> ctypes.Array[SockFilter]:
+    # Allowed system calls never stop the tracee. Every other system call,
+    # including unknown ones, is handed to the tracer by SECCOMP_RET_TRACE.
+    instructions = [
+        _statement(
+            Bpf.BPF_LD | Bpf.BPF_W | Bpf.BPF_ABS,
+            SeccompDataOffset.ARCH,
+        ),
+        _jump(Bpf.BPF_JMP | Bpf.BPF_JEQ | Bpf.BPF_K, AUDIT_ARCH_X86_64, 1, 0),
+        _statement(Bpf.BPF_RET | Bpf.BPF_K, SeccompReturn.SECCOMP_RET_KILL_PROCESS),
+        _statement(
+            Bpf.BPF_LD | Bpf.BPF_W | Bpf.BPF_ABS,
+            SeccompDataOffset.NR,
+        ),
+    ]
+
+    # Ranges are visited in ascending order, so `nr < start` means `nr` is
+    # between the previous range and this one.
+    for start, end in _to_ranges(allowed_syscalls):
+        instructions += [
+            _jump(Bpf.BPF_JMP | Bpf.BPF_JGE | Bpf.BPF_K, start, 1, 0),
+            _statement(Bpf.BPF_RET | Bpf.BPF_K, SeccompReturn.SECCOMP_RET_TRACE),
+            _jump(Bpf.BPF_JMP | Bpf.BPF_JGE | Bpf.BPF_K, end, 1, 0),
+            _statement(Bpf.BPF_RET | Bpf.BPF_K, SeccompReturn.SECCOMP_RET_ALLOW),
+        ]
+
+    instructions.append(
+        _statement(Bpf.BPF_RET | Bpf.BPF_K, SeccompReturn.SECCOMP_RET_TRACE)
+    )
+
+    return (SockFilter * len(instructions))(*instructions)
+
+
+def _to_ranges(numbers: Iterable[int]) -> list[tuple[int, int]]:
+    ranges: list[tuple[int, int]] = []
+
+    for number in sorted(set(numbers)):
+        if ranges and ranges[-1][1] == number:
+            ranges[-1] = (ranges[-1][0], number + 1)
+        else:
+            ranges.append((number, number + 1))
+
+    return ranges
+
+
+def _statement(code: int, k: int) -> SockFilter:
+    return SockFilter(code, 0, 0, k)
+
+
+def _jump(code: int, k: int, jt: int, jf: int) -> SockFilter:
+    return SockFilter(code, jt, jf, k)
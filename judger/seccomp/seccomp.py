@@ -0,0 +1,34 @@
+import ctypes
+
+from judger.seccomp.constants import (
+    PR_SET_NO_NEW_PRIVS,
+    PR_SET_SECCOMP,
+    SECCOMP_MODE_FILTER,
+)
+from judger.seccomp.exceptions import SeccompException
+from judger.seccomp.types import SockFilter, SockFprog
+
+_libc = ctypes.CDLL("/lib/x86_64-linux-gnu/libc.so.6", use_errno=True)
+prctl = _libc.prctl
+prctl.argtypes = [
+    ctypes.c_int,
+    ctypes.c_ulong,
+    ctypes.c_void_p,
+    ctypes.c_ulong,
+    ctypes.c_ulong,
+]
+prctl.restype = ctypes.c_int
+
+
+def install_filter(instructions: ctypes.Array[SockFilter]) -> None:
+    if prctl(PR_SET_NO_NEW_PRIVS, 1, None, 0, 0) == -1:
+        raise SeccompException(
+            f"Failed to set no_new_privs. errno {ctypes.get_errno()}."
+        )
+
+    program = SockFprog(len(instructions), instructions)
+
+    if prctl(PR_SET_SECCOMP, SECCOMP_MODE_FILTER, ctypes.addressof(program), 0, 0):
+        raise SeccompException(
+            f"Failed to install seccomp filter. errno {ctypes.get_errno()}."
+        )
@@ -0,0 +1,9 @@
+from .blob import BlobStore, read_preview
+from .compress import (
+    decompress_file,
+    is_compressed,
+    open_compressed_writer,
+    open_decompressed_pipe,
+    open_stored,
+    read_stored,
+)
@@ -0,0 +1,87 @@
+import hashlib
+import os
+import pathlib
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator
+
+import zstandard
+
+CHUNK_SIZE = 256 * 1024
+PREVIEW_SIZE = 4 * 1024
+
+# Outputs are stored while judging, so speed matters more than ratio.
+COMPRESS_LEVEL = 1
+
+
+def read_preview(filename: str | os.PathLike, size: int = PREVIEW_SIZE) -> str:
+    with open(filename, "rb") as f:
+        data = f.read(size)
+
+    # Last character could be cut in the middle.
+    return data.decode(errors="replace")
+
+
+# Program outputs keyed by the sha256 of their content, so identical outputs of
+# different runs are stored once. Blobs are written to a temporary file and
+# renamed, readers and other workers never see a partial blob.
+class BlobStore:
+    def __init__(self, path: pathlib.Path) -> None:
+        self.path = path
+
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def put(self, filename: str | os.PathLike) -> str:
+        digest = hashlib.sha256()
+
+        fd, temp_filename = tempfile.mkstemp(dir=self.path, prefix=".")
+
+        try:
+            with (
+                open(filename, "rb") as source,
+                os.fdopen(fd, "wb") as temp,
+                zstandard.ZstdCompressor(level=COMPRESS_LEVEL).stream_writer(
+                    temp
+                ) as compressed,
+            ):
+                while chunk := source.read(CHUNK_SIZE):
+                    digest.update(chunk)
+                    compressed.write(chunk)
+
+            key = digest.hexdigest()
+            blob = self._get_blob_path(key)
+
+            if blob.exists():
+                os.remove(temp_filename)
+            else:
+                blob.parent.mkdir(exist_ok=True)
+                os.replace(temp_filename, blob)
+        except BaseException:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+            raise
+
+        return key
+
+    def exists(self, key: str) -> bool:
+        return self._get_blob_path(key).exists()
+
+    @contextmanager
+    def open(self, key: str) -> Iterator[BinaryIO]:
+        with (
+            open(self._get_blob_path(key), "rb") as f,
+            zstandard.ZstdDecompressor().stream_reader(f) as reader,
+        ):
+            yield reader  # type: ignore
+
+    def iterate(self, key: str) -> Iterator[bytes]:
+        with self.open(key) as f:
+            while chunk := f.read(CHUNK_SIZE):
+                yield chunk
+
+    def _get_blob_path(self, key: str) -> pathlib.Path:
+        # Keys read from rows never point outside the store.
+        if len(key) != 64 or not all(c in "0123456789abcdef" for c in key):
+            raise ValueError(f"Invalid blob key {key}.")
+
+        return self.path / key[:2] / key[2:]
@@ -0,0 +1,97 @@
+import fcntl
+import os
+import threading
+from contextlib import contextmanager, suppress
+from typing import BinaryIO, Iterator
+
+import zstandard
+
+from judger.logger import _log
+
+CHUNK_SIZE = 256 * 1024
+PIPE_SIZE = 1024 * 1024
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Testcases are written once and read by every submission.
+TESTCASE_COMPRESS_LEVEL = 3
+
+
+# Files written before compression are read as they are, so stored files are
+# told apart by the magic number instead of the name.
+def is_compressed(filename: str | os.PathLike) -> bool:
+    with open(filename, "rb") as f:
+        return f.read(len(ZSTD_MAGIC)) == ZSTD_MAGIC
+
+
+@contextmanager
+def open_stored(filename: str | os.PathLike) -> Iterator[BinaryIO]:
+    with open(filename, "rb") as f:
+        if f.read(len(ZSTD_MAGIC)) != ZSTD_MAGIC:
+            f.seek(0)
+            yield f
+            return
+
+        f.seek(0)
+        with zstandard.ZstdDecompressor().stream_reader(f) as reader:
+            yield reader  # type: ignore
+
+
+def read_stored(filename: str | os.PathLike) -> bytes:
+    with open_stored(filename) as f:
+        return f.read()
+
+
+@contextmanager
+def open_compressed_writer(
+    filename: str | os.PathLike, level: int = TESTCASE_COMPRESS_LEVEL
+) -> Iterator[BinaryIO]:
+    with (
+        open(filename, "wb") as f,
+        zstandard.ZstdCompressor(level=level).stream_writer(f) as writer,
+    ):
+        yield writer  # type: ignore
+
+
+def decompress_file(filename: str | os.PathLike, target: str | os.PathLike):
+    with open_stored(filename) as source, open(target, "wb") as f:
+        while chunk := source.read(CHUNK_SIZE):
+            f.write(chunk)
+
+
+@contextmanager
+def open_decompressed_pipe(filename: str | os.PathLike) -> Iterator[int]:
+    # Read end of a pipe a thread writes the decompressed file into, to be used
+    # as stdin of a program. Given fd is owned by the caller.
+    read, write = os.pipe()
+
+    # Larger pipe lets the program read without waiting for the thread.
+    with suppress(OSError):
+        fcntl.fcntl(write, fcntl.F_SETPIPE_SZ, PIPE_SIZE)
+
+    thread = threading.Thread(target=_feed, args=(filename, write), daemon=True)
+    thread.start()
+
+    try:
+        yield os.dup(read)
+    finally:
+        # Thread blocked on a full pipe stops once no one can read the rest.
+        os.close(read)
+        thread.join()
+
+
+def _feed(filename: str | os.PathLike, fd: int):
+    try:
+        with open_stored(filename) as f:
+            while chunk := f.read(CHUNK_SIZE):
+                view = memoryview(chunk)
+
+                while view:
+                    view = view[os.write(fd, view) :]
+    except BrokenPipeError:
+        # Program exited without reading the whole input.
+        pass
+    except Exception as e:
+        _log.warn("Failed to decompress input.", exc_info=e)
+    finally:
+        os.close(fd)
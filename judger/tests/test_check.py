@@ -0,0 +1,202 @@
+import pathlib
+
+import numpy as np
+import pytest
+
+from judger.check import CheckMode, check
+from judger.check.check import _find_float_mismatch, _parse_floats
+from judger.execute.result import ExecuteResult
+
+
+def check_data(
+    tmp_path: pathlib.Path,
+    output_data: bytes,
+    answer_data: bytes,
+    mode: CheckMode,
+    absolute_tolerance: float = 1e-6,
+    relative_tolerance: float = 1e-6,
+) -> ExecuteResult:
+    output, answer = tmp_path / "output", tmp_path / "answer"
+    output.write_bytes(output_data)
+    answer.write_bytes(answer_data)
+
+    return check(str(output), str(answer), mode, absolute_tolerance, relative_tolerance)
+
+
+@pytest.mark.parametrize(
+    "output_data, answer_data, expected",
+    [
+        (b"1 2\n", b"1  2", ExecuteResult.ACCEPTED),
+        (b"1\n2\r\n", b"1 2\n", ExecuteResult.ACCEPTED),
+        (b"1.0\n", b"1\n", ExecuteResult.WRONG_ANSWER),
+        (b"01\n", b"1\n", ExecuteResult.WRONG_ANSWER),
+        (b"1 2\n", b"1 2 3\n", ExecuteResult.WRONG_ANSWER),
+        (b"1 2 3\n", b"1 2\n", ExecuteResult.WRONG_ANSWER),
+        (b"\n", b"1\n", ExecuteResult.WRONG_ANSWER),
+        (b" \n", b"", ExecuteResult.ACCEPTED),
+    ],
+)
+def test_check_token(
+    tmp_path: pathlib.Path,
+    output_data: bytes,
+    answer_data: bytes,
+    expected: ExecuteResult,
+):
+    assert check_data(tmp_path, output_data, answer_data, CheckMode.TOKEN) == expected
+
+
+# Tolerances and values are powers of two, so the boundaries are exact. Numbers
+# are compared with NumPy, and one by one when a line has other tokens.
+@pytest.mark.parametrize("suffix", [b"", b" x"])
+@pytest.mark.parametrize(
+    "output_data, answer_data, absolute_tolerance, relative_tolerance, expected",
+    [
+        (b"1.5", b"1", 0.5, 0, ExecuteResult.ACCEPTED),
+        (b"0.5", b"1", 0.5, 0, ExecuteResult.ACCEPTED),
+        (b"1.5000001", b"1", 0.5, 0, ExecuteResult.WRONG_ANSWER),
+        (b"5", b"4", 0, 0.25, ExecuteResult.ACCEPTED),
+        (b"3", b"4", 0, 0.25, ExecuteResult.ACCEPTED),
+        (b"5.0001", b"4", 0, 0.25, ExecuteResult.WRONG_ANSWER),
+        # Answer is the reference of the relative tolerance.
+        (b"4", b"5", 0, 0.25, ExecuteResult.ACCEPTED),
+        (b"4", b"3", 0, 0.25, ExecuteResult.WRONG_ANSWER),
+        # Both tolerances add up.
+        (b"5.5", b"4", 0.5, 0.25, ExecuteResult.ACCEPTED),
+        (b"5.5001", b"4", 0.5, 0.25, ExecuteResult.WRONG_ANSWER),
+        (b"1e-7", b"0", 1e-6, 1e-6, ExecuteResult.ACCEPTED),
+        (b"-0.0", b"0", 0, 0, ExecuteResult.ACCEPTED),
+    ],
+)
+def test_check_float_tolerance(
+    tmp_path: pathlib.Path,
+    output_data: bytes,
+    answer_data: bytes,
+    absolute_tolerance: float,
+    relative_tolerance: float,
+    expected: ExecuteResult,
+    suffix: bytes,
+):
+    assert (
+        check_data(
+            tmp_path,
+            output_data + suffix,
+            answer_data + suffix,
+            CheckMode.FLOAT,
+            absolute_tolerance,
+            relative_tolerance,
+        )
+        == expected
+    )
+
+
+@pytest.mark.parametrize("suffix", [b"", b" x"])
+@pytest.mark.parametrize(
+    "output_data, answer_data, expected",
+    [
+        (b"inf", b"inf", ExecuteResult.ACCEPTED),
+        (b"-inf", b"-inf", ExecuteResult.ACCEPTED),
+        (b"inf", b"-inf", ExecuteResult.WRONG_ANSWER),
+        (b"inf", b"1e308", ExecuteResult.WRONG_ANSWER),
+        (b"1e308", b"inf", ExecuteResult.WRONG_ANSWER),
+        (b"nan", b"nan", ExecuteResult.ACCEPTED),
+        (b"nan", b"-nan", ExecuteResult.ACCEPTED),
+        (b"nan", b"0", ExecuteResult.WRONG_ANSWER),
+        (b"0", b"nan", ExecuteResult.WRONG_ANSWER),
+        (b"nan", b"inf", ExecuteResult.WRONG_ANSWER),
+    ],
+)
+def test_check_float_inf_nan(
+    tmp_path: pathlib.Path,
+    output_data: bytes,
+    answer_data: bytes,
+    expected: ExecuteResult,
+    suffix: bytes,
+):
+    assert (
+        check_data(
+            tmp_path, output_data + suffix, answer_data + suffix, CheckMode.FLOAT
+        )
+        == expected
+    )
+
+
+@pytest.mark.parametrize(
+    "output_data, answer_data, expected",
+    [
+        (b"1 2 3\n", b"1.0 2.0 3.0\n", ExecuteResult.ACCEPTED),
+        (b"1 2\n", b"1 2 3\n", ExecuteResult.WRONG_ANSWER),
+        (b"1 2 3\n", b"1 2\n", ExecuteResult.WRONG_ANSWER),
+        (b"1 2 x\n", b"1 2\n", ExecuteResult.WRONG_ANSWER),
+        (b"", b"0\n", ExecuteResult.WRONG_ANSWER),
+        (b"x\n", b"x\n", ExecuteResult.ACCEPTED),
+        (b"x 1\n", b"y 1\n", ExecuteResult.WRONG_ANSWER),
+    ],
+)
+def test_check_float_token_count(
+    tmp_path: pathlib.Path,
+    output_data: bytes,
+    answer_data: bytes,
+    expected: ExecuteResult,
+):
+    assert check_data(tmp_path, output_data, answer_data, CheckMode.FLOAT) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        (b"Case #1: 2.5", ExecuteResult.ACCEPTED),
+        (b"Case #1: 2.5000001", ExecuteResult.ACCEPTED),
+        (b"Case #2: 2.5", ExecuteResult.WRONG_ANSWER),
+        (b"Case #1: 3", ExecuteResult.WRONG_ANSWER),
+    ],
+)
+def test_check_float_text_between_numbers(
+    tmp_path: pathlib.Path, text: bytes, expected: ExecuteResult
+):
+    numbers = b"0.5 1.5\n" * 1000
+    answer_numbers = b"0.5000001 1.5\n" * 1000
+
+    assert (
+        check_data(
+            tmp_path,
+            numbers + text + b"\n" + numbers,
+            answer_numbers + b"Case #1: 2.5\n" + answer_numbers,
+            CheckMode.FLOAT,
+        )
+        == expected
+    )
+
+
+def test_parse_floats_splits_text_lines():
+    # Numbers are parsed by NumPy in runs longer than MIN_PARSED_SIZE.
+    numbers = b"1 2\n" * 2000
+
+    items = _parse_floats(numbers + b"Case #1: 3\nx\n" + numbers + b"6 y")
+
+    assert [type(item) for item in items] == [np.ndarray, list, np.ndarray, list]
+    assert items[0].tolist() == [1.0, 2.0] * 2000
+    assert items[1] == [b"Case", b"#1:", b"3", b"x"]
+    assert items[2].tolist() == [1.0, 2.0] * 2000
+    assert items[3] == [b"6", b"y"]
+
+
+@pytest.mark.parametrize(
+    "output_items, answer_items, expected",
+    [
+        (np.array([1.0, 2.0, 3.0]), np.array([1.0, 2.0, 3.0]), None),
+        (np.array([1.0, 2.0, 3.0]), np.array([1.0, 2.5, 3.5]), 1),
+        (np.array([np.nan, 2.0]), np.array([np.nan, 3.0]), 1),
+        ([b"1", b"x", b"3"], [b"1.0", b"x", b"4"], 2),
+        ([b"1", b"x"], [b"1", b"y"], 1),
+    ],
+)
+def test_find_float_mismatch_index(output_items, answer_items, expected):
+    assert (
+        _find_float_mismatch(
+            output_items,
+            answer_items,
+            absolute_tolerance=1e-6,
+            relative_tolerance=1e-6,
+        )
+        == expected
+    )
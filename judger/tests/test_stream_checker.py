@@ -0,0 +1,124 @@
+import pathlib
+
+import pytest
+
+from judger.check import CheckMode, StreamChecker, check
+from judger.execute.result import ExecuteResult
+from judger.storage import open_compressed_writer
+
+
+def stream_check(
+    answer: pathlib.Path, mode: CheckMode, chunks: list[bytes]
+) -> ExecuteResult:
+    with StreamChecker(str(answer), mode) as checker:
+        for chunk in chunks:
+            if not checker.feed(chunk):
+                return ExecuteResult.WRONG_ANSWER
+
+        return (
+            ExecuteResult.ACCEPTED if checker.finish() else ExecuteResult.WRONG_ANSWER
+        )
+
+
+@pytest.mark.parametrize(
+    "output_data, answer_data, expected",
+    [
+        (b"nan\n", b"nan\n", ExecuteResult.ACCEPTED),
+        (b"nan 1.0\n", b"NaN 1.0\n", ExecuteResult.ACCEPTED),
+        (b"nan\n", b"1.0\n", ExecuteResult.WRONG_ANSWER),
+        (b"1.0\n", b"nan\n", ExecuteResult.WRONG_ANSWER),
+        (b"inf -inf\n", b"inf -inf\n", ExecuteResult.ACCEPTED),
+    ],
+)
+def test_stream_checker_float_nan(
+    tmp_path: pathlib.Path,
+    output_data: bytes,
+    answer_data: bytes,
+    expected: ExecuteResult,
+):
+    output, answer = tmp_path / "output", tmp_path / "answer"
+    output.write_bytes(output_data)
+    answer.write_bytes(answer_data)
+
+    assert check(str(output), str(answer), CheckMode.FLOAT) == expected
+    assert stream_check(answer, CheckMode.FLOAT, [output_data]) == expected
+
+
+# Outputs are fed split at every position, so chunks end inside a token, inside
+# "\r\n" and around trailing whitespace.
+@pytest.mark.parametrize(
+    "mode",
+    [CheckMode.EXACT, CheckMode.WHITESPACE, CheckMode.TOKEN, CheckMode.FLOAT],
+)
+@pytest.mark.parametrize(
+    "output_data, answer_data",
+    [
+        (b"12345 678\n", b"12345 678\n"),
+        (b"12345 678\n", b"12345 679\n"),
+        (b"12345 678", b"12345 678\n"),
+        (b"12345\r\n678\r\n", b"12345\n678\n"),
+        (b"12345\r\n678\r\n", b"12345 678"),
+        (b"1 2  \t\n\n3   \n", b"1 2\n3\n"),
+        (b"1 2\n3\n   ", b"1 2\n3"),
+        (b"1 2\n3 \n4", b"1 2\n3\n"),
+        (b"1.0000001 2\n", b"1 2.0\n"),
+        (b"1.1 2\n", b"1 2\n"),
+        (b"abc def\n", b"abc  def\n"),
+        (b"abc de f\n", b"abc def\n"),
+        (b"", b"\n"),
+        (b"\n", b""),
+    ],
+)
+@pytest.mark.parametrize("compressed", [False, True])
+def test_stream_checker_chunk_boundaries(
+    tmp_path: pathlib.Path,
+    mode: CheckMode,
+    output_data: bytes,
+    answer_data: bytes,
+    compressed: bool,
+):
+    output, answer = tmp_path / "output", tmp_path / "answer"
+    output.write_bytes(output_data)
+
+    if compressed:
+        with open_compressed_writer(answer) as f:
+            f.write(answer_data)
+    else:
+        answer.write_bytes(answer_data)
+
+    expected = check(str(output), str(answer), mode)
+
+    for first in range(len(output_data) + 1):
+        for second in range(first, len(output_data) + 1):
+            chunks = [
+                output_data[:first],
+                output_data[first:second],
+                output_data[second:],
+            ]
+
+            assert stream_check(answer, mode, chunks) == expected, chunks
+
+
+# A token spanning many chunks is joined once, not copied for every chunk.
+@pytest.mark.parametrize("mode", [CheckMode.WHITESPACE, CheckMode.TOKEN])
+@pytest.mark.parametrize(
+    "suffix, expected",
+    [(b"", ExecuteResult.ACCEPTED), (b"b", ExecuteResult.WRONG_ANSWER)],
+)
+def test_stream_checker_long_token(
+    tmp_path: pathlib.Path, mode: CheckMode, suffix: bytes, expected: ExecuteResult
+):
+    token = b"a" * (8 * 1024 * 1024)
+    output_data = token + suffix + b" 1\n"
+
+    output, answer = tmp_path / "output", tmp_path / "answer"
+    output.write_bytes(output_data)
+    answer.write_bytes(token + b" 1\n")
+
+    chunks = [
+        output_data[start : start + 64 * 1024]
+        for start in range(0, len(output_data), 64 * 1024)
+    ]
+
+    assert check(str(output), str(answer), mode) == expected
+    assert stream_check(answer, mode, chunks) == expected
@@ -0,0 +1,43 @@
+import ctypes
+import os
+
+IN_MODIFY = 0x00000002
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+_libc = ctypes.CDLL(None, use_errno=True)
+
+_libc.inotify_init1.argtypes = [ctypes.c_int]
+_libc.inotify_init1.restype = ctypes.c_int
+
+_libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+_libc.inotify_add_watch.restype = ctypes.c_int
+
+
+def inotify_init(flags: int = IN_NONBLOCK | IN_CLOEXEC) -> int:
+    fd = _libc.inotify_init1(flags)
+
+    if fd == -1:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+
+    return fd
+
+
+def inotify_add_watch(fd: int, path: str, mask: int) -> int:
+    wd = _libc.inotify_add_watch(fd, os.fsencode(path), mask)
+
+    if wd == -1:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno), path)
+
+    return wd
+
+
+def inotify_drain(fd: int):
+    # Events are only used as wake ups, so their contents are discarded.
+    try:
+        while os.read(fd, 4096):
+            pass
+    except BlockingIOError:
+        pass
@@ -0,0 +1,150 @@
+# Median compile latency of typical competitive programming sources,
+# with and without precompiled headers.
+#
+#   PYTHONPATH=. python3 scripts/benchmark/compile_latency.py
+import os
+import statistics
+import tempfile
+import time
+
+from judger.compile import CompileResult, build_precompiled_header, compile
+from judger.language import C11, CPP17
+from judger.language.base import Language
+
+SOURCES = {
+    CPP17: [
+        r"""
+#include <bits/stdc++.h>
+using namespace std;
+
+int main() {
+    ios::sync_with_stdio(false);
+    cin.tie(nullptr);
+    int n;
+    cin >> n;
+    vector<long long> a(n);
+    for (auto &x : a) cin >> x;
+    sort(a.begin(), a.end());
+    cout << accumulate(a.begin(), a.end(), 0LL) << '\n';
+}
+""",
+        r"""
+#include <bits/stdc++.h>
+using namespace std;
+
+int main() {
+    int n, m;
+    cin >> n >> m;
+    vector<vector<pair<int, int>>> graph(n + 1);
+    for (int i = 0; i < m; i++) {
+        int u, v, w;
+        cin >> u >> v >> w;
+        graph[u].push_back({v, w});
+    }
+    vector<long long> dist(n + 1, LLONG_MAX);
+    priority_queue<pair<long long, int>, vector<pair<long long, int>>, greater<>> pq;
+    dist[1] = 0;
+    pq.push({0, 1});
+    while (!pq.empty()) {
+        auto [d, u] = pq.top();
+        pq.pop();
+        if (d > dist[u]) continue;
+        for (auto [v, w] : graph[u])
+            if (dist[v] > d + w) pq.push({dist[v] = d + w, v});
+    }
+    for (int i = 1; i <= n; i++) cout << dist[i] << ' ';
+}
+""",
+        r"""
+#include <bits/stdc++.h>
+using namespace std;
+
+int main() {
+    string s;
+    cin >> s;
+    map<char, int> count;
+    set<string> seen;
+    for (char c : s) count[c]++;
+    for (size_t i = 0; i < s.size(); i++) seen.insert(s.substr(i));
+    cout << count.size() << ' ' << seen.size() << '\n';
+}
+""",
+    ],
+    C11: [
+        r"""
+#include <stdio.h>
+#include <stdlib.h>
+
+int compare(const void *a, const void *b) {
+    return *(const int *)a - *(const int *)b;
+}
+
+int main(void) {
+    int n;
+    scanf("%d", &n);
+    int *a = malloc(sizeof(int) * n);
+    for (int i = 0; i < n; i++) scanf("%d", &a[i]);
+    qsort(a, n, sizeof(int), compare);
+    printf("%d\n", a[n / 2]);
+    return 0;
+}
+""",
+    ],
+}
+
+REPEAT = 5
+
+
+def measure(
+    directory: str, language: Language, source: str, header_directory: str | None
+) -> float:
+    with open(os.path.join(directory, language.filename), "w") as f:
+        f.write(source)
+
+    start = time.perf_counter()
+    result = compile(
+        directory,
+        language.compile_command,
+        60,
+        os.path.join(directory, "stdout.out"),
+        os.path.join(directory, "stderr.err"),
+        header_directory,
+    )
+    elapsed = time.perf_counter() - start
+
+    assert result == CompileResult.COMPILE_SUCCESS, result
+    return elapsed
+
+
+def main():
+    with tempfile.TemporaryDirectory() as root:
+        for language, sources in SOURCES.items():
+            header_directory = (
+                build_precompiled_header(
+                    os.path.join(root, "headers"),
+                    language.precompiled_header,
+                    language.precompile_command,
+                    60,
+                )
+                if language.precompiled_header is not None
+                and language.precompile_command is not None
+                else None
+            )
+
+            with tempfile.TemporaryDirectory() as directory:
+                for mode, headers in (("plain", None), ("pch  ", header_directory)):
+                    if mode != "plain" and headers is None:
+                        continue
+
+                    latencies = [
+                        measure(directory, language, source, headers)
+                        for source in sources
+                        for _ in range(REPEAT)
+                    ]
+                    median = statistics.median(latencies) * 1000
+
+                    print(f"{language.display_name:6} {mode} {median:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
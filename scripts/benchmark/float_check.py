@@ -0,0 +1,69 @@
+# Time spent on checking an output of 1M numbers in float mode. Output and
+# answer are printed with different precision, so they are never identical
+# and every number is parsed and compared. Some outputs have text on a part
+# of their lines, those lines are compared token by token.
+#
+#   PYTHONPATH=. python3 scripts/benchmark/float_check.py
+import os
+import random
+import tempfile
+import time
+
+from judger.check import CheckMode, check
+
+COUNT = 1000 * 1000
+PER_LINE = 10
+
+
+def generate(values: list[float], precision: int, text_every: int) -> bytes:
+    lines: list[str] = []
+
+    for index in range(0, len(values), PER_LINE):
+        line = " ".join(
+            f"{value:.{precision}f}" for value in values[index : index + PER_LINE]
+        )
+
+        if text_every and index // PER_LINE % text_every == 0:
+            line = f"Case #{index // PER_LINE + 1}: {line}"
+
+        lines.append(line)
+
+    return ("\n".join(lines) + "\n").encode()
+
+
+def measure(output: str, answer: str) -> float:
+    elapsed = []
+
+    for _ in range(5):
+        start = time.perf_counter()
+        check(output, answer, CheckMode.FLOAT)
+        elapsed.append(time.perf_counter() - start)
+
+    return min(elapsed)
+
+
+def main():
+    values = [random.uniform(-1e6, 1e6) for _ in range(COUNT)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, "output")
+        answer = os.path.join(directory, "answer")
+
+        print(f"{'text lines':>10} {'check':>9} {'per number':>11}")
+
+        for text_every in (0, 100, 10, 1):
+            with open(output, "wb") as f:
+                f.write(generate(values, 6, text_every))
+            with open(answer, "wb") as f:
+                f.write(generate(values, 7, text_every))
+
+            elapsed = measure(output, answer)
+            share = f"1/{text_every}" if text_every else "none"
+            print(
+                f"{share:>10} {elapsed * 1000:7.1f}ms "
+                f"{elapsed / COUNT * 1e9:8.0f}ns"
+            )
+
+
+if __name__ == "__main__":
+    main()
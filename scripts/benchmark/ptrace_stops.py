@@ -0,0 +1,79 @@
+# Ptrace stops handled per second by the supervisor, on a program that does
+# nothing but system calls. Every system call stops twice without seccomp,
+# and once with seccomp when it is count limited.
+# Needs the same privileges as the judger (see docker/test).
+#
+#   PYTHONPATH=. python3 scripts/benchmark/ptrace_stops.py
+import os
+import subprocess
+import tempfile
+
+from judger.execute import ExecuteResult, Sandbox
+from judger.utils.system_call import parse_systemcall_x86_64_linux_gnu
+
+SOURCE = r"""
+#include <stdio.h>
+#include <stdlib.h>
+#include <unistd.h>
+
+int main(int argc, char **argv) {
+    long n = atol(argv[1]), sum = 0;
+    for (long i = 0; i < n; i++) sum += getppid();
+    printf("%d\n", sum > 0);
+    return 0;
+}
+"""
+
+COUNT = 200_000
+GETPPID = 110
+
+
+def run(directory: str, seccomp: bool) -> float:
+    limits = {
+        systemcall["number"]: -1 for systemcall in parse_systemcall_x86_64_linux_gnu()
+    }
+    # Limited system calls are trapped by the seccomp filter.
+    limits[GETPPID] = COUNT * 2
+
+    with Sandbox(
+        working_directory=directory,
+        execute_command=f"./main {COUNT}",
+        time_limit=60000,
+        memory_limit=256 * 1024 * 1024,
+        output_limit=1024 * 1024,
+        systemcall_count_limits=limits,
+        seccomp=seccomp,
+    ) as sandbox:
+        result, *_ = sandbox.run(
+            os.devnull,
+            os.path.join(directory, "stdout.out"),
+            os.path.join(directory, "stderr.err"),
+        )
+        telemetry = sandbox.telemetry
+
+    assert result == ExecuteResult.GOOD, result
+    assert telemetry is not None
+
+    return telemetry.ptrace_stops / telemetry.wall_time * 1e6
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "main.c"), "w") as f:
+            f.write(SOURCE)
+
+        subprocess.run(
+            ["gcc", "main.c", "-o", "main", "-O2", "-static"],
+            cwd=directory,
+            check=True,
+        )
+
+        for seccomp in (False, True):
+            stops = max(run(directory, seccomp) for _ in range(3))
+
+            mode = "seccomp" if seccomp else "ptrace "
+            print(f"{mode} {stops:10.0f} stops/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# Per system call supervisor overhead, with and without the seccomp filter.
+# Needs the same privileges as the judger (see docker/test).
+#
+#   PYTHONPATH=. python3 scripts/benchmark/syscall_overhead.py
+import os
+import subprocess
+import tempfile
+import time
+
+from judger.execute import ExecuteResult, execute
+from judger.utils.system_call import parse_systemcall_x86_64_linux_gnu
+
+SOURCE = r"""
+#include <stdio.h>
+#include <stdlib.h>
+#include <unistd.h>
+
+int main(int argc, char **argv) {
+    long n = atol(argv[1]), sum = 0;
+    for (long i = 0; i < n; i++) sum += getppid();
+    printf("%d\n", sum > 0);
+    return 0;
+}
+"""
+
+SMALL, LARGE = 1_000, 100_001
+
+
+def run(directory: str, count: int, seccomp: bool) -> float:
+    limits = {
+        systemcall["number"]: -1 for systemcall in parse_systemcall_x86_64_linux_gnu()
+    }
+
+    start = time.perf_counter()
+    result, *_ = execute(
+        working_directory=directory,
+        execute_command=f"./main {count}",
+        stdin_filename=os.devnull,
+        stdout_filename=os.path.join(directory, "stdout.out"),
+        stderr_filename=os.path.join(directory, "stderr.err"),
+        time_limit=10000,
+        memory_limit=256 * 1024 * 1024,
+        output_limit=1024 * 1024,
+        systemcall_count_limits=limits,
+        seccomp=seccomp,
+    )
+    elapsed = time.perf_counter() - start
+
+    assert result == ExecuteResult.GOOD, result
+    return elapsed
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "main.c"), "w") as f:
+            f.write(SOURCE)
+
+        subprocess.run(
+            ["gcc", "main.c", "-o", "main", "-O2", "-static"],
+            cwd=directory,
+            check=True,
+        )
+
+        for seccomp in (False, True):
+            small = min(run(directory, SMALL, seccomp) for _ in range(3))
+            large = min(run(directory, LARGE, seccomp) for _ in range(3))
+            per_syscall = (large - small) / (LARGE - SMALL) * 1e6
+
+            mode = "seccomp" if seccomp else "ptrace "
+            print(f"{mode} {per_syscall:8.3f} us/syscall ({large:.3f}s total)")
+
+
+if __name__ == "__main__":
+    main()
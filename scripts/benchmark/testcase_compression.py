@@ -0,0 +1,119 @@
+# Storage saved by compressing testcases with zstd, against the time spent on
+# reading them into a pipe as the worker does. Page cache of the files is
+# dropped before each read, so reads come from the disk as for cold testcases.
+#
+#   PYTHONPATH=. python3 scripts/benchmark/testcase_compression.py
+import os
+import random
+import tempfile
+import threading
+import time
+from typing import Callable
+
+from judger.storage import open_compressed_writer, open_decompressed_pipe
+
+SIZE = 8 * 1024 * 1024
+READ_SIZE = 64 * 1024
+
+
+def generate(kind: str) -> bytes:
+    lines: list[str] = []
+    size = 0
+
+    while size < SIZE:
+        if kind == "random":
+            line = " ".join(str(random.randint(0, 10**9)) for _ in range(10))
+        elif kind == "small":
+            line = " ".join(str(random.randint(0, 100)) for _ in range(10))
+        elif kind == "float":
+            line = " ".join(f"{random.uniform(-1e6, 1e6):.6f}" for _ in range(10))
+        else:
+            line = "." * 999 + "#"
+
+        lines.append(line)
+        size += len(line) + 1
+
+    return ("\n".join(lines) + "\n").encode()
+
+
+def drop_cache(filename: str):
+    with open(filename, "rb") as f:
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def drain(fd: int):
+    # Reads the pipe as a program would.
+    while os.read(fd, READ_SIZE):
+        pass
+
+    os.close(fd)
+
+
+def read_plain(filename: str):
+    read, write = os.pipe()
+    thread = threading.Thread(target=drain, args=(read,))
+    thread.start()
+
+    with open(filename, "rb") as f:
+        while chunk := f.read(READ_SIZE):
+            os.write(write, chunk)
+
+    os.close(write)
+    thread.join()
+
+
+def read_compressed(filename: str):
+    with open_decompressed_pipe(filename) as stdin:
+        drain(stdin)
+
+
+def measure(filename: str, read: Callable[[str], None]) -> tuple[float, float]:
+    wall, cpu = [], []
+
+    for _ in range(5):
+        drop_cache(filename)
+
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        read(filename)
+        wall.append(time.perf_counter() - start_wall)
+        cpu.append(time.process_time() - start_cpu)
+
+    return min(wall), min(cpu)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        plain = os.path.join(directory, "plain")
+        compressed = os.path.join(directory, "compressed")
+
+        print(
+            f"{'kind':8} {'ratio':>6} {'write':>9} "
+            f"{'plain read':>15} {'zstd read':>15} {'cpu/MB':>8}"
+        )
+
+        for kind in ("random", "small", "float", "text"):
+            data = generate(kind)
+
+            with open(plain, "wb") as f:
+                f.write(data)
+
+            start = time.perf_counter()
+            with open_compressed_writer(compressed) as f:
+                f.write(data)
+            write = time.perf_counter() - start
+
+            ratio = len(data) / os.path.getsize(compressed)
+            plain_wall, _ = measure(plain, read_plain)
+            compressed_wall, compressed_cpu = measure(compressed, read_compressed)
+
+            megabytes = len(data) / 1024 / 1024
+            print(
+                f"{kind:8} {ratio:5.1f}x {write * 1000:7.1f}ms "
+                f"{megabytes / plain_wall:10.0f} MB/s "
+                f"{megabytes / compressed_wall:10.0f} MB/s "
+                f"{compressed_cpu / megabytes * 1000:6.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -107,7 +107,15 @@ def _run_enum_operations(
     #     )
     # else:
     #     nv: Never = op  # noqa: F841
-    ...
+
+    # Only new values are added, values are never removed or renamed.
+    if isinstance(op, SyncEnumValuesOp):
+        for value in op.new_values:
+            if value not in op.old_values:
+                ops.execute(
+                    f'ALTER TYPE "{op.schema}"."{op.name}" '
+                    f"ADD VALUE IF NOT EXISTS '{value}'"
+                )
 
 
 def _nothing(rev, context):
@@ -6,32 +6,51 @@ from alembic_utils.pg_function import PGFunction
 from alembic_utils.pg_trigger import PGTrigger
 from psycopg import AsyncConnection, Notify, OperationalError
 
+# Counters of the submission are updated from the changed row only, so saving
+# a result costs the same however many testcases the submission has. A result
+# going back to pending is a rejudge, the verdict is decided again by results
+# written after it.
 notify_on_testcase_result_update_function = PGFunction.from_sql(
     """CREATE OR REPLACE FUNCTION public.notify_on_testcase_result_update_function() RETURNS TRIGGER AS $$
     DECLARE
         payload json;
-        testcase_count INTEGER;
-        completed_testcase_count INTEGER;
+        completed_delta INTEGER;
+        total_count INTEGER;
+        completed_count INTEGER;
+        submission_result executeresult;
     BEGIN
-        SELECT count(*)
-        INTO testcase_count
-        FROM submission_testcase_result
-        WHERE submission_id = NEW.submission_id;
-
-        SELECT count(*)
-        INTO completed_testcase_count
-        FROM submission_testcase_result
-        WHERE submission_id = NEW.submission_id
-        AND result IS NOT NULL;
+        completed_delta := (NEW.result IS NOT NULL)::INTEGER
+            - (OLD.result IS NOT NULL)::INTEGER;
+
+        UPDATE submission
+        SET completed_testcase_count = submission.completed_testcase_count + completed_delta,
+            result = CASE
+                WHEN NEW.result IS NULL THEN NULL
+                WHEN submission.result IS NOT NULL THEN submission.result
+                WHEN NEW.result NOT IN ('GOOD', 'ACCEPTED', 'SKIPPED') THEN NEW.result
+                WHEN submission.completed_testcase_count + completed_delta
+                    = submission.testcase_count THEN NEW.result
+            END,
+            time = CASE
+                WHEN NEW.result IS NOT NULL THEN GREATEST(submission.time, NEW.time)
+            END,
+            memory = CASE
+                WHEN NEW.result IS NOT NULL THEN GREATEST(submission.memory, NEW.memory)
+            END
+        WHERE submission.id = NEW.submission_id
+        RETURNING submission.testcase_count, submission.completed_testcase_count, submission.result
+        INTO total_count, completed_count, submission_result;
 
         payload := json_build_object(
             'submission_id', NEW.submission_id,
             'testcase_id', NEW.testcase_id,
             'result', NEW.result,
-            'testcase_count', testcase_count,
-            'completed_testcase_count', completed_testcase_count,
+            'testcase_count', total_count,
+            'completed_testcase_count', completed_count,
+            'submission_result', submission_result,
             'time', NEW.time,
-            'memory', NEW.memory
+            'memory', NEW.memory,
+            'telemetry', NEW.telemetry
         );
 
         PERFORM pg_notify('testcase_result_events', payload::text);
@@ -41,11 +60,16 @@ notify_on_testcase_result_update_function = PGFunction.from_sql(
     $$ LANGUAGE plpgsql;"""  # noqa: E501
 )
 
+# Output and other columns written later do not fire the trigger. It runs at
+# commit, so parallel batches of a submission hold the lock of the submission
+# row only while they commit, not while their results are written.
 notify_on_testcase_result_update_trigger = PGTrigger.from_sql(
-    """CREATE TRIGGER notify_on_testcase_result_update_trigger
-        AFTER UPDATE
+    """CREATE CONSTRAINT TRIGGER notify_on_testcase_result_update_trigger
+        AFTER UPDATE OF result
         ON submission_testcase_result
+        DEFERRABLE INITIALLY DEFERRED
         FOR EACH ROW
+        WHEN (OLD.result IS DISTINCT FROM NEW.result)
         EXECUTE PROCEDURE notify_on_testcase_result_update_function();"""
 )
 
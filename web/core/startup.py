@@ -1,8 +1,11 @@
 from alembic_utils.replaceable_entity import register_entities
 from fastapi import FastAPI
-from sqlalchemy import select, update
+from sqlalchemy import case, func, select, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from judger.execute.result import ExecuteResult
 from judger.language import languages as judger_languages
 from web.core.database import async_session
 from web.core.migration import migration
@@ -18,6 +21,7 @@ from web.logger import (
 )
 from web.models.base import BaseModel
 from web.models.language import Language
+from web.models.submission import Submission, SubmissionTestcaseResult
 
 
 async def startup_migration(app: FastAPI):
@@ -36,9 +40,69 @@ async def startup_migration(app: FastAPI):
         )
 
         await session.run_sync(wrapped_migration)
+        await _backfill_submission_counters(session)
         await session.commit()
 
 
+# Submissions created before the counters were added have zero testcase_count,
+# they are counted once from their testcase results the way the trigger would.
+async def _backfill_submission_counters(session: AsyncSession):
+    counts = (
+        select(
+            SubmissionTestcaseResult.submission_id,
+            func.count().label("testcase_count"),
+            func.count(SubmissionTestcaseResult.result).label(
+                "completed_testcase_count"
+            ),
+            array_agg(
+                aggregate_order_by(
+                    SubmissionTestcaseResult.result, SubmissionTestcaseResult.id
+                )
+            )
+            .filter(
+                SubmissionTestcaseResult.result.not_in(
+                    [ExecuteResult.GOOD, ExecuteResult.ACCEPTED, ExecuteResult.SKIPPED]
+                )
+            )[1]
+            .label("failed_result"),
+            array_agg(
+                aggregate_order_by(
+                    SubmissionTestcaseResult.result, SubmissionTestcaseResult.id.desc()
+                )
+            )[1].label("last_result"),
+            func.max(SubmissionTestcaseResult.time).label("time"),
+            func.max(SubmissionTestcaseResult.memory).label("memory"),
+        )
+        .group_by(SubmissionTestcaseResult.submission_id)
+        .subquery()
+    )
+
+    stmt = (
+        update(Submission)
+        .where(Submission.id == counts.c.submission_id)
+        .where(Submission.testcase_count == 0)
+        .values(
+            {
+                Submission.testcase_count: counts.c.testcase_count,
+                Submission.completed_testcase_count: counts.c.completed_testcase_count,
+                Submission.result: case(
+                    (counts.c.failed_result.is_not(None), counts.c.failed_result),
+                    (
+                        counts.c.completed_testcase_count == counts.c.testcase_count,
+                        counts.c.last_result,
+                    ),
+                ),
+                Submission.time: counts.c.time,
+                Submission.memory: counts.c.memory,
+            }
+        )
+    )
+
+    updated = await session.execute(stmt)
+
+    _log.info(f"Backfill counters of {updated.rowcount} submissions.")
+
+
 async def startup_language_migration(app: FastAPI):
     with DisableSqlalchemyLogger():
         async with async_session() as session:
@@ -59,6 +123,9 @@ async def startup_language_migration(app: FastAPI):
                 language.filename = judger_language.filename
                 language.compile_command = judger_language.compile_command
                 language.execute_command = judger_language.execute_command
+                language.zygote_command = judger_language.zygote_command
+                language.precompiled_header = judger_language.precompiled_header
+                language.precompile_command = judger_language.precompile_command
 
                 if is_new:
                     session.add(language)
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from sqlalchemy import ForeignKey, sql
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -18,6 +18,9 @@ class Language(BaseModel):
     filename: Mapped[str]
     compile_command: Mapped[str]
     execute_command: Mapped[str]
+    zygote_command: Mapped[Optional[str]] = mapped_column(default=None)
+    precompiled_header: Mapped[Optional[str]] = mapped_column(default=None)
+    precompile_command: Mapped[Optional[str]] = mapped_column(default=None)
     is_enabled: Mapped[bool] = mapped_column(server_default=sql.true())
 
     submissions: Mapped[list["Submission"]] = relationship(back_populates="language")
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from sqlalchemy import ForeignKey, sql, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from web.models.base import BaseModel
 
 if TYPE_CHECKING:
+    from web.models.language import Language
     from web.models.submission import Submission, SubmissionTestcaseResult
     from web.models.user import User
 
@@ -21,6 +22,24 @@ class Problem(BaseModel):
 
     is_public: Mapped[bool] = mapped_column(server_default=sql.false())
 
+    # Skip remaining testcases of the same subtask after the first failure.
+    stop_on_failure: Mapped[bool] = mapped_column(server_default=sql.false())
+
+    # Value of judger.check.CheckMode
+    checker: Mapped[str] = mapped_column(server_default="token")
+    absolute_tolerance: Mapped[float] = mapped_column(server_default=text("0.000001"))
+    relative_tolerance: Mapped[float] = mapped_column(server_default=text("0.000001"))
+
+    # Checker program for the special checker mode, run with input, answer and
+    # output filenames as arguments. Exit code 0 means accepted.
+    special_judge_code: Mapped[Optional[str]] = mapped_column(
+        default=None, deferred=True
+    )
+    special_judge_language: Mapped[Optional["Language"]] = relationship()
+    special_judge_language_id: Mapped[int | None] = mapped_column(
+        ForeignKey("language.id", ondelete="SET NULL"), default=None
+    )
+
     description: Mapped[str] = mapped_column(deferred_group="problem_descriptions")
     input_description: Mapped[str] = mapped_column(
         deferred_group="problem_descriptions"
@@ -54,6 +73,12 @@ class Testcase(BaseModel):
     output_preview: Mapped[str] = mapped_column(server_default="")
     input_size: Mapped[int] = mapped_column(server_default="0")
     output_size: Mapped[int] = mapped_column(server_default="0")
+    # sha256 of the stored content, after lines are stripped.
+    input_hash: Mapped[Optional[str]] = mapped_column(default=None)
+    output_hash: Mapped[Optional[str]] = mapped_column(default=None)
+
+    # Testcases without subtask are grouped together.
+    subtask: Mapped[Optional[int]] = mapped_column(default=None)
 
     problem_id: Mapped[int] = mapped_column(
         ForeignKey("problem.id", ondelete="CASCADE")
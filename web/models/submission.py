@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING, Optional
 
 from sqlalchemy import ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from judger.compile.result import CompileResult
@@ -10,7 +11,7 @@ from web.models.base import BaseModel
 if TYPE_CHECKING:
     from web.models.language import Language
     from web.models.problem import Problem, Testcase
-    from web.models.systemcall import SystemcallCount
+    from web.models.systemcall import SystemcallCount, SystemcallGroup
     from web.models.user import User
 
 
@@ -21,8 +22,19 @@ class Submission(BaseModel):
     code: Mapped[str]
 
     compile_result: Mapped[Optional[CompileResult]] = mapped_column(default=None)
+    # Previews of the outputs, full outputs are in the blob store.
     compile_stdout: Mapped[Optional[str]] = mapped_column(default=None)
     compile_stderr: Mapped[Optional[str]] = mapped_column(default=None)
+    compile_stdout_key: Mapped[Optional[str]] = mapped_column(default=None)
+    compile_stderr_key: Mapped[Optional[str]] = mapped_column(default=None)
+
+    # Kept by the trigger on submission_testcase_result as results are saved.
+    # Result is the first failed one, or the last one when every testcase passed.
+    testcase_count: Mapped[int] = mapped_column(server_default="0")
+    completed_testcase_count: Mapped[int] = mapped_column(server_default="0")
+    result: Mapped[Optional[ExecuteResult]] = mapped_column(default=None)
+    time: Mapped[Optional[int]] = mapped_column(default=None)
+    memory: Mapped[Optional[int]] = mapped_column(default=None)
 
     creator: Mapped[Optional["User"]] = relationship(
         back_populates="submissions", passive_deletes=True
@@ -53,9 +65,14 @@ class SubmissionTestcaseResult(BaseModel):
     memory: Mapped[Optional[int]] = mapped_column(default=None)
 
     result: Mapped[Optional[ExecuteResult]] = mapped_column(default=None)
+    # Resource usage of the run, see judger.execute.Telemetry.
+    telemetry: Mapped[Optional[dict[str, int]]] = mapped_column(JSONB, default=None)
 
+    # Previews of the outputs, full outputs are in the blob store.
     stdout: Mapped[Optional[str]] = mapped_column(default=None)
     stderr: Mapped[Optional[str]] = mapped_column(default=None)
+    stdout_key: Mapped[Optional[str]] = mapped_column(default=None)
+    stderr_key: Mapped[Optional[str]] = mapped_column(default=None)
 
     submission: Mapped[Submission] = relationship(back_populates="submission_results")
     submission_id: Mapped[int] = mapped_column(
@@ -69,6 +86,14 @@ class SubmissionTestcaseResult(BaseModel):
         ForeignKey("testcase.id", ondelete="SET NULL")
     )
 
+    # Packed by pack_systemcall_counts, numbered by the systemcall group. With
+    # seccomp, system calls without a count limit are not counted.
+    systemcall_count_data: Mapped[Optional[bytes]] = mapped_column(default=None)
+    systemcall_group: Mapped[Optional["SystemcallGroup"]] = relationship()
+    systemcall_group_id: Mapped[int | None] = mapped_column(
+        ForeignKey("systemcall_group.id", ondelete="SET NULL"), default=None
+    )
+
     systemcall_counts: Mapped[list["SystemcallCount"]] = relationship(
         back_populates="submission_result"
     )
@@ -1,3 +1,4 @@
+import struct
 from typing import TYPE_CHECKING
 
 from sqlalchemy import ForeignKey, Index, sql
@@ -26,6 +27,25 @@ class Systemcall(BaseModel):
     )
 
 
+# Nonzero counts of a run are stored in a single column as (number, count)
+# pairs, numbered by the systemcall group of the result.
+_SYSTEMCALL_COUNT = struct.Struct("<HQ")
+
+
+def pack_systemcall_counts(systemcall_counts: dict[int, int]) -> bytes:
+    return b"".join(
+        _SYSTEMCALL_COUNT.pack(number, count)
+        for number, count in sorted(systemcall_counts.items())
+        if count > 0
+    )
+
+
+def unpack_systemcall_counts(data: bytes) -> dict[int, int]:
+    return dict(_SYSTEMCALL_COUNT.iter_unpack(data))
+
+
+# Replaced by SubmissionTestcaseResult.systemcall_count_data, kept for the
+# counts of older results.
 class SystemcallCount(BaseModel):
     __tablename__ = "systemcall_count"
 
@@ -1,7 +1,7 @@
 from tempfile import SpooledTemporaryFile
 from typing import Literal, Optional, cast
 
-from fastapi import APIRouter, Query, UploadFile, status
+from fastapi import APIRouter, Form, Query, UploadFile, status
 
 from web.core.dependencies import SessionUserDependency
 from web.schemas.problem import (
@@ -14,6 +14,7 @@ from web.schemas.problem import (
     UpdateProblemResponseSchema,
 )
 from web.schemas.testcase import (
+    CreateTestcaseArchiveResponseSchema,
     CreateTestcaseResponseSchema,
     GetTestcaseResponseSchema,
     GetTestcasesRequestSchema,
@@ -101,6 +102,7 @@ async def create_problem_testcase_api(
     output_file: UploadFile,
     service: TestcaseService,
     user: SessionUserDependency,
+    subtask: Optional[int] = Form(default=None),
 ):
     testcase = await service.create_testcase(
         id,
@@ -109,11 +111,34 @@ async def create_problem_testcase_api(
         cast(SpooledTemporaryFile[bytes], input_file.file),
         cast(SpooledTemporaryFile[bytes], output_file.file),
         user,
+        subtask,
     )
 
     return testcase
 
 
+@api_router.post(
+    "/{id}/testcases/archive",
+    response_model=CreateTestcaseArchiveResponseSchema,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_problem_testcases_from_archive_api(
+    id: int,
+    archive_file: UploadFile,
+    service: TestcaseService,
+    user: SessionUserDependency,
+    subtask: Optional[int] = Form(default=None),
+):
+    results = await service.create_testcases_from_archive(
+        id,
+        cast(SpooledTemporaryFile[bytes], archive_file.file),
+        user,
+        subtask,
+    )
+
+    return results
+
+
 @api_router.get(
     "/{problem_id}/testcases", response_model=list[GetTestcasesResponseSchema]
 )
@@ -2,6 +2,7 @@ import asyncio
 import json
 
 from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from psycopg import Notify
 from sse_starlette import EventSourceResponse, ServerSentEvent
 
@@ -14,7 +15,11 @@ from web.schemas.submission import (
     CreateSubmissionRequestSchema,
     CreateSubmissionResponseSchema,
     CreateSubmissionSchema,
+    GetSubmissionResponseSchema,
+    GetSubmissionResultResponseSchema,
+    Output,
 )
+from web.services.file import FileService
 from web.services.submission import SubmissionService
 
 api_router = APIRouter(prefix="/submissions")
@@ -42,6 +47,44 @@ async def create_submission_api(
     return submission
 
 
+@api_router.get("/{id}/results", response_model=list[GetSubmissionResultResponseSchema])
+async def get_submission_results_api(id: int, submission_service: SubmissionService):
+    submission_results = await submission_service.get_submission_results(id)
+
+    return [
+        {**submission_result.__dict__, "systemcall_counts": systemcall_counts}
+        for submission_result, systemcall_counts in submission_results
+    ]
+
+
+# Full outputs are streamed from the blob store, results only have previews.
+@api_router.get("/{id}/results/{result_id}/{output}")
+async def get_submission_result_output_api(
+    id: int,
+    result_id: int,
+    output: Output,
+    submission_service: SubmissionService,
+    file_service: FileService,
+):
+    key = await submission_service.get_submission_result_output_key(
+        id, result_id, output
+    )
+
+    return StreamingResponse(file_service.read_blob(key), media_type="text/plain")
+
+
+@api_router.get("/{id}/compile/{output}")
+async def get_compile_output_api(
+    id: int,
+    output: Output,
+    submission_service: SubmissionService,
+    file_service: FileService,
+):
+    key = await submission_service.get_compile_output_key(id, output)
+
+    return StreamingResponse(file_service.read_blob(key), media_type="text/plain")
+
+
 @api_router.get("/events")
 async def submissions_events_api(request: Request, id: int = Query()):
     pg_notify_listener: PostgresAsyncNotifyListener = (
@@ -69,3 +112,10 @@ async def submissions_events_api(request: Request, id: int = Query()):
             handler.need_remove = True
 
     return EventSourceResponse(sse_generator())
+
+
+@api_router.get("/{id}", response_model=GetSubmissionResponseSchema)
+async def get_submission_api(id: int, submission_service: SubmissionService):
+    submission = await submission_service.get_submission(id)
+
+    return submission
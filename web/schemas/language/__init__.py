@@ -9,6 +9,9 @@ class Language(BaseSchema):
     filename: str
     compile_command: str
     execute_command: str
+    zygote_command: Optional[str]
+    precompiled_header: Optional[str]
+    precompile_command: Optional[str]
     is_enabled: bool
 
 
@@ -1,10 +1,11 @@
 from datetime import datetime
 from typing import Optional
 
+from judger.check import CheckMode
 from web.models.problem import Problem
 from web.schemas.base import BaseSchema, Creator, SerializeToModelSchema
 from web.schemas.pagination import PaginationSchema
-from web.schemas.problem.types import Description, MemoryLimit, TimeLimit
+from web.schemas.problem.types import Description, MemoryLimit, TimeLimit, Tolerance
 from web.schemas.sort import SortSchema
 
 
@@ -14,6 +15,11 @@ class BaseProblemWithoutCreator(BaseSchema):
     memory_limit: MemoryLimit
     created_at: datetime
     is_public: bool
+    stop_on_failure: bool
+    checker: CheckMode
+    absolute_tolerance: float
+    relative_tolerance: float
+    special_judge_language_id: Optional[int]
 
 
 class BaseProblem(BaseProblemWithoutCreator):
@@ -35,6 +41,12 @@ class CreateProblemRequestSchema(SerializeToModelSchema[Problem]):
     input_description: Description
     output_description: Description
     limit_description: Description
+    stop_on_failure: bool = False
+    checker: CheckMode = CheckMode.TOKEN
+    absolute_tolerance: Tolerance
+    relative_tolerance: Tolerance
+    special_judge_language_id: Optional[int] = None
+    special_judge_code: Optional[str] = None
 
     def serialize(self) -> Problem:
         problem = Problem()
@@ -46,6 +58,12 @@ class CreateProblemRequestSchema(SerializeToModelSchema[Problem]):
         problem.input_description = self.input_description
         problem.output_description = self.output_description
         problem.limit_description = self.limit_description
+        problem.stop_on_failure = self.stop_on_failure
+        problem.checker = self.checker.value
+        problem.absolute_tolerance = self.absolute_tolerance
+        problem.relative_tolerance = self.relative_tolerance
+        problem.special_judge_language_id = self.special_judge_language_id
+        problem.special_judge_code = self.special_judge_code
 
         return problem
 
@@ -77,6 +95,12 @@ class UpdateProblemRequestSchema(SerializeToModelSchema[Problem]):
     output_description: Optional[Description] = None
     limit_description: Optional[Description] = None
     is_public: Optional[bool] = None
+    stop_on_failure: Optional[bool] = None
+    checker: Optional[CheckMode] = None
+    absolute_tolerance: Optional[Tolerance] = None
+    relative_tolerance: Optional[Tolerance] = None
+    special_judge_language_id: Optional[int] = None
+    special_judge_code: Optional[str] = None
 
     def serialize(self) -> Problem:
         problem = Problem()
@@ -105,6 +129,24 @@ class UpdateProblemRequestSchema(SerializeToModelSchema[Problem]):
         if self.is_public is not None:
             problem.is_public = self.is_public
 
+        if self.stop_on_failure is not None:
+            problem.stop_on_failure = self.stop_on_failure
+
+        if self.checker is not None:
+            problem.checker = self.checker.value
+
+        if self.absolute_tolerance is not None:
+            problem.absolute_tolerance = self.absolute_tolerance
+
+        if self.relative_tolerance is not None:
+            problem.relative_tolerance = self.relative_tolerance
+
+        if self.special_judge_language_id is not None:
+            problem.special_judge_language_id = self.special_judge_language_id
+
+        if self.special_judge_code is not None:
+            problem.special_judge_code = self.special_judge_code
+
         return problem
 
 
@@ -2,8 +2,13 @@ from typing import Annotated
 
 from pydantic import AfterValidator, Field
 
-from web.schemas.problem.validator import validate_memroy_limit, validate_time_limit
+from web.schemas.problem.validator import (
+    validate_memroy_limit,
+    validate_time_limit,
+    validate_tolerance,
+)
 
 TimeLimit = Annotated[int, Field(default=1000), AfterValidator(validate_time_limit)]
 MemoryLimit = Annotated[int, Field(default=256), AfterValidator(validate_memroy_limit)]
+Tolerance = Annotated[float, Field(default=1e-6), AfterValidator(validate_tolerance)]
 Description = str
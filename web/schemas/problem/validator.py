@@ -18,3 +18,12 @@ def validate_memroy_limit(memory_limit: int) -> int:
         )
 
     return memory_limit
+
+
+def validate_tolerance(tolerance: float) -> float:
+    if not 0 <= tolerance <= 1:
+        raise PydanticCustomError(
+            "tolerance_range", "오차 범위는 0 이상 1 이하의 실수만 가능합니다."
+        )
+
+    return tolerance
@@ -4,6 +4,8 @@ from typing import Optional
 from fastapi import Query
 from pydantic import field_validator
 
+from judger.compile.result import CompileResult
+from judger.execute.result import ExecuteResult
 from web.models.submission import Submission
 from web.schemas.base import (
     BaseSchema,
@@ -14,7 +16,7 @@ from web.schemas.base import (
     SerializeToModelSchema,
 )
 from web.schemas.pagination import PaginationSchema
-from web.schemas.submission.types import Code
+from web.schemas.submission.types import Code, Output
 
 
 class BaseSubmission(BaseSchema):
@@ -49,7 +51,15 @@ class CreateLanguageSubmissionResponseSchema(BaseSubmission):
     created_at: datetime
 
 
-class GetLanguageSubmissionResponseSchema(BaseSubmission):
+class SubmissionVerdict(BaseSchema):
+    testcase_count: int
+    completed_testcase_count: int
+    result: Optional[ExecuteResult]
+    time: Optional[int]
+    memory: Optional[int]
+
+
+class GetLanguageSubmissionResponseSchema(BaseSubmission, SubmissionVerdict):
     id: int
     created_at: datetime
 
@@ -81,3 +91,26 @@ class CreateSubmissionRequestSchema(BaseSubmission):
 class CreateSubmissionResponseSchema(CreateSubmissionRequestSchema):
     id: int
     created_at: datetime
+
+
+class GetSubmissionResponseSchema(BaseSubmission, SubmissionVerdict):
+    id: int
+    created_at: datetime
+
+    compile_result: Optional[CompileResult]
+
+    problem: Optional[Problem]
+    language: Language
+    creator: Optional[Creator]
+
+
+class GetSubmissionResultResponseSchema(BaseSchema):
+    id: int
+    testcase_id: Optional[int]
+    result: Optional[ExecuteResult]
+    time: Optional[int]
+    memory: Optional[int]
+    telemetry: Optional[dict[str, int]]
+    systemcall_counts: dict[str, int]
+    stdout: Optional[str]
+    stderr: Optional[str]
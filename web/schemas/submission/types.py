@@ -1,7 +1,9 @@
-from typing import Annotated
+from typing import Annotated, Literal
 
 from pydantic import AfterValidator, Field
 
 from web.schemas.submission.validator import validate_code
 
 Code = Annotated[str, Field(), AfterValidator(validate_code)]
+
+Output = Literal["stdout", "stderr"]
@@ -1,6 +1,6 @@
-from typing import Literal
+from typing import Literal, Optional
 
-from web.schemas.base import BaseSchema
+from web.schemas.base import BaseSchema, RootSchema
 from web.schemas.pagination import PaginationSchema
 from web.schemas.sort import SortSchema
 
@@ -14,6 +14,17 @@ class CreateTestcaseResponseSchema(BaseSchema):
     output_preview: str
     input_size: int
     output_size: int
+    subtask: Optional[int]
+
+
+class CreateTestcaseArchiveFileResultSchema(BaseSchema):
+    filename: str
+    testcase_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class CreateTestcaseArchiveResponseSchema(RootSchema):
+    root: list[CreateTestcaseArchiveFileResultSchema]
 
 
 class GetTestcaseResponseSchema(BaseSchema):
@@ -25,6 +36,7 @@ class GetTestcaseResponseSchema(BaseSchema):
     output_preview: str
     input_size: int
     output_size: int
+    subtask: Optional[int]
 
 
 class GetTestcasesRequestSchema(PaginationSchema, SortSchema):
@@ -39,3 +51,4 @@ class GetTestcasesResponseSchema(BaseSchema):
     original_output_filename: str
     input_size: int
     output_size: int
+    subtask: Optional[int]
@@ -1,20 +1,38 @@
 import os
 import pathlib
+import uuid
+from contextlib import suppress
 from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Iterator, cast
 
+from judger.storage import BlobStore, read_stored
 from web.core.decorators import as_annotated_dependency
 from web.core.settings import settings
 from web.logger import _log
+from web.services.file.archive import (
+    ArchiveError,
+    ArchiveTestcase,
+    InvalidArchive,
+    ingest_testcase_archive,
+)
 from web.services.file.exceptions import (
+    BlobNotFoundException,
+    InvalidTestcaseArchiveException,
     RootDirectoryNotFoundException,
     TestcaseFileNotFoundException,
     TestcaseFileTooLargeException,
 )
+from web.services.file.ingest import (
+    IngestedTestcase,
+    TestcaseTooLarge,
+    ingest_testcase,
+)
 
 
 @as_annotated_dependency
 class FileService:
     TEST_CASE_FILE_SIZE_LIMIT = 8 * 1024 * 1024
+    ARCHIVE_INGEST_WORKERS = min(8, os.cpu_count() or 1)
 
     def __init__(self) -> None:
         self.root_path = pathlib.Path(settings.judge_file_path)
@@ -32,40 +50,84 @@ class FileService:
         testcase_path = self.root_path / f"{problem_id}" / "testcases"
         testcase_path.mkdir(parents=True, exist_ok=True)
 
-        input_size = self._format_and_write_testcase(
-            input_file, testcase_path / f"{testcase_id}.in"
-        )
-        output_size = self._format_and_write_testcase(
+        input = self._ingest_testcase(input_file, testcase_path / f"{testcase_id}.in")
+
+        # Output is not read once the testcase is rejected for its input.
+        if input is None:
+            raise TestcaseFileTooLargeException(True, False)
+
+        output = self._ingest_testcase(
             output_file, testcase_path / f"{testcase_id}.out"
         )
 
-        is_input_large = input_size > self.TEST_CASE_FILE_SIZE_LIMIT
-        is_output_large = output_size > self.TEST_CASE_FILE_SIZE_LIMIT
-
-        if is_input_large or is_output_large:
+        if output is None:
             self.delete_testcase_file(problem_id, testcase_id)
-            raise TestcaseFileTooLargeException(is_input_large, is_output_large)
+            raise TestcaseFileTooLargeException(False, True)
 
-        return input_size, output_size
+        return input, output
 
-    def _format_and_write_testcase(
+    def _ingest_testcase(
         self, temp_file: SpooledTemporaryFile[bytes], file: pathlib.Path
-    ) -> int:
-        with open(file, "wb") as f:
-            temp_file.seek(0)
-            content = temp_file.readlines()
-            size = 0
+    ) -> IngestedTestcase | None:
+        try:
+            return ingest_testcase(
+                cast(BinaryIO, temp_file), file, self.TEST_CASE_FILE_SIZE_LIMIT
+            )
+        except TestcaseTooLarge:
+            return None
+
+    def ingest_testcase_archive(
+        self, problem_id: int, archive_file: SpooledTemporaryFile[bytes]
+    ) -> tuple[list[ArchiveTestcase], list[ArchiveError]]:
+        if not self.root_path.exists():
+            raise RootDirectoryNotFoundException()
 
-            for line in content:
-                strip = line.strip()
+        testcase_path = self.root_path / f"{problem_id}" / "testcases"
+        testcase_path.mkdir(parents=True, exist_ok=True)
 
-                if len(strip) != 0:
-                    f.write(strip)
-                    f.write(b"\n")
+        # Files are renamed once their testcases are inserted.
+        prefix = f".archive-{uuid.uuid4().hex}-"
 
-                    size += len(strip) + 1
+        try:
+            return ingest_testcase_archive(
+                cast(BinaryIO, archive_file),
+                testcase_path,
+                prefix,
+                self.TEST_CASE_FILE_SIZE_LIMIT,
+                self.ARCHIVE_INGEST_WORKERS,
+            )
+        except BaseException as e:
+            for file in testcase_path.glob(f"{prefix}*"):
+                file.unlink(missing_ok=True)
+
+            if isinstance(e, InvalidArchive):
+                raise InvalidTestcaseArchiveException() from e
+
+            raise e
+
+    def store_archive_testcases(
+        self, problem_id: int, testcases: list[tuple[int, ArchiveTestcase]]
+    ):
+        testcase_path = self.root_path / f"{problem_id}" / "testcases"
+        renamed: list[tuple[pathlib.Path, pathlib.Path]] = []
 
-        return size
+        try:
+            for testcase_id, testcase in testcases:
+                for file, suffix in ((testcase.input, "in"), (testcase.output, "out")):
+                    target = testcase_path / f"{testcase_id}.{suffix}"
+                    os.replace(file.file, target)
+                    renamed.append((file.file, target))
+        except BaseException:
+            # Renamed files are moved back, so they are discarded with the rest.
+            for file, target in reversed(renamed):
+                with suppress(OSError):
+                    os.replace(target, file)
+            raise
+
+    def discard_archive_testcases(self, testcases: list[ArchiveTestcase]):
+        for testcase in testcases:
+            testcase.input.file.unlink(missing_ok=True)
+            testcase.output.file.unlink(missing_ok=True)
 
     def read_testcase_file(self, problem_id: int, testcase_id: int):
         testcase_input_file = (
@@ -78,11 +140,8 @@ class FileService:
         if not (testcase_input_file.exists() or testcase_output_file.exists()):
             raise TestcaseFileNotFoundException()
 
-        with open(testcase_input_file) as f:
-            input = f.read()
-
-        with open(testcase_output_file) as f:
-            output = f.read()
+        input = read_stored(testcase_input_file).decode()
+        output = read_stored(testcase_output_file).decode()
 
         return (input, output)
 
@@ -102,3 +161,14 @@ class FileService:
                 os.remove(output_file)
         except Exception as e:
             _log.warn("Delete testcase failed.", exc_info=e)
+
+    def read_blob(self, key: str) -> Iterator[bytes]:
+        if not self.root_path.exists():
+            raise RootDirectoryNotFoundException()
+
+        blob_store = BlobStore(self.root_path / "blobs")
+
+        if not blob_store.exists(key):
+            raise BlobNotFoundException()
+
+        return blob_store.iterate(key)
@@ -0,0 +1,190 @@
+import dataclasses
+import pathlib
+import tarfile
+import threading
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Iterator
+
+from web.services.file.ingest import (
+    READ_SIZE,
+    IngestedTestcase,
+    TestcaseTooLarge,
+    ingest_testcase,
+)
+
+SUFFIXES = (".in", ".out")
+
+UNKNOWN_FILE_MESSAGE = "입력(.in) 또는 출력(.out) 파일이 아닙니다."
+DUPLICATED_FILE_MESSAGE = "같은 이름의 파일이 이미 존재합니다."
+TOO_LARGE_FILE_MESSAGE = "파일의 크기가 너무 큽니다."
+UNPAIRED_FILE_MESSAGE = "짝이 되는 입력 또는 출력 파일이 없습니다."
+TOO_LARGE_PAIR_MESSAGE = "짝이 되는 파일의 크기가 너무 큽니다."
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class ArchiveFile:
+    filename: str
+    file: pathlib.Path
+    testcase: IngestedTestcase
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class ArchiveTestcase:
+    input: ArchiveFile
+    output: ArchiveFile
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class ArchiveError:
+    filename: str
+    message: str
+
+
+class InvalidArchive(Exception):
+    ...
+
+
+# Members are read one by one in the order of the archive, so compressed tar
+# streams work too. Each member is copied out and ingested on the pool while
+# the next one is read, at most twice the workers are waiting at once.
+# Members are limited by their size before lines are stripped.
+# Files are written with the prefix, the caller removes them on failures.
+def ingest_testcase_archive(
+    archive: BinaryIO,
+    directory: pathlib.Path,
+    prefix: str,
+    size_limit: int,
+    max_workers: int,
+) -> tuple[list[ArchiveTestcase], list[ArchiveError]]:
+    pairs: dict[str, dict[str, str]] = {}
+    # Members larger than the limit before stripping are not ingested.
+    files: dict[str, tuple[pathlib.Path, Future[IngestedTestcase]] | None] = {}
+    errors: list[ArchiveError] = []
+    slots = threading.BoundedSemaphore(max_workers * 2)
+
+    def ingest(source: SpooledTemporaryFile[bytes], file: pathlib.Path):
+        try:
+            with source:
+                return ingest_testcase(source, file, size_limit)  # type: ignore
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for filename, member in _iterate_archive(archive):
+                path = pathlib.PurePosixPath(filename)
+
+                if path.suffix not in SUFFIXES:
+                    errors.append(
+                        ArchiveError(filename=filename, message=UNKNOWN_FILE_MESSAGE)
+                    )
+                    continue
+
+                pair = pairs.setdefault(path.stem, {})
+
+                if path.suffix in pair:
+                    errors.append(
+                        ArchiveError(filename=filename, message=DUPLICATED_FILE_MESSAGE)
+                    )
+                    continue
+
+                pair[path.suffix] = filename
+
+                if (source := _copy_member(member, size_limit)) is None:
+                    files[filename] = None
+                    continue
+
+                file = directory / f"{prefix}{len(files)}{path.suffix}"
+
+                slots.acquire()
+                files[filename] = (file, executor.submit(ingest, source, file))
+        except (tarfile.TarError, zipfile.BadZipFile, EOFError) as e:
+            raise InvalidArchive() from e
+
+    testcases: list[ArchiveTestcase] = []
+
+    for _, pair in sorted(pairs.items(), key=lambda item: _sort_key(item[0])):
+        ingested: list[ArchiveFile] = []
+
+        for suffix in SUFFIXES:
+            if (filename := pair.get(suffix)) is None:
+                continue
+
+            try:
+                if (ingesting := files[filename]) is None:
+                    raise TestcaseTooLarge()
+
+                file, future = ingesting
+                ingested.append(
+                    ArchiveFile(filename=filename, file=file, testcase=future.result())
+                )
+            except TestcaseTooLarge:
+                errors.append(
+                    ArchiveError(filename=filename, message=TOO_LARGE_FILE_MESSAGE)
+                )
+
+        if len(ingested) == 2:
+            testcases.append(ArchiveTestcase(input=ingested[0], output=ingested[1]))
+            continue
+
+        # File is not used without its pair.
+        for archive_file in ingested:
+            archive_file.file.unlink()
+            errors.append(
+                ArchiveError(
+                    filename=archive_file.filename,
+                    message=UNPAIRED_FILE_MESSAGE
+                    if len(pair) == 1
+                    else TOO_LARGE_PAIR_MESSAGE,
+                )
+            )
+
+    return testcases, errors
+
+
+def _copy_member(
+    member: BinaryIO, size_limit: int
+) -> SpooledTemporaryFile[bytes] | None:
+    # Members could decompress to far more than the archive, so copying stops
+    # right after the limit.
+    source = SpooledTemporaryFile(max_size=size_limit)
+    size = 0
+
+    while chunk := member.read(min(READ_SIZE, size_limit + 1 - size)):
+        source.write(chunk)
+        size += len(chunk)
+
+        if size > size_limit:
+            source.close()
+            return None
+
+    return source
+
+
+def _iterate_archive(archive: BinaryIO) -> Iterator[tuple[str, BinaryIO]]:
+    archive.seek(0)
+
+    if zipfile.is_zipfile(archive):
+        with zipfile.ZipFile(archive) as zip:
+            for info in zip.infolist():
+                if not info.is_dir():
+                    with zip.open(info) as member:
+                        yield info.filename, member  # type: ignore
+        return
+
+    archive.seek(0)
+
+    # Stream mode reads compressed tar archives without seeking.
+    with tarfile.open(fileobj=archive, mode="r|*") as tar:
+        for info in tar:
+            member = tar.extractfile(info) if info.isfile() else None
+
+            if member is not None:
+                yield info.name, member  # type: ignore
+
+
+def _sort_key(stem: str) -> tuple[int, int, str]:
+    # Numbered testcases are ordered by their numbers, 2 comes before 10.
+    return (0, int(stem), "") if stem.isdecimal() else (1, 0, stem)
@@ -1,4 +1,8 @@
-from web.services.exceptions import FileTooLargeException, InternalServerException
+from web.services.exceptions import (
+    FileTooLargeException,
+    InternalServerException,
+    ServiceException,
+)
 
 
 class RootDirectoryNotFoundException(InternalServerException):
@@ -9,6 +13,10 @@ class TestcaseFileNotFoundException(InternalServerException):
     message = {"_details": "테스트 케이스 파일이 존재하지 않습니다."}
 
 
+class BlobNotFoundException(InternalServerException):
+    messages = {"_details": "출력 파일이 존재하지 않습니다."}
+
+
 class TestcaseFileTooLargeException(FileTooLargeException):
     def __init__(self, input: bool, output: bool) -> None:
         messages = {}
@@ -19,3 +27,7 @@ class TestcaseFileTooLargeException(FileTooLargeException):
             messages.update({"output_file": "출력 파일의 크기가 너무 큽니다."})
 
         super().__init__(messages)
+
+
+class InvalidTestcaseArchiveException(ServiceException):
+    messages = {"archive_file": "zip 또는 tar 파일이 아닙니다."}
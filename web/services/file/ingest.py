@@ -0,0 +1,125 @@
+import dataclasses
+import hashlib
+import os
+import pathlib
+from typing import BinaryIO
+
+from judger.storage import open_compressed_writer
+
+READ_SIZE = 64 * 1024
+
+# Same as bytes.strip().
+WHITESPACES = b" \t\n\r\x0b\x0c"
+
+PREVIEW_LINES = 10
+PREVIEW_LINE_LENGTH = 50
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class IngestedTestcase:
+    size: int
+    preview: str
+    hash: str
+
+
+class TestcaseTooLarge(Exception):
+    ...
+
+
+# Reads an uploaded testcase once in chunks. Lines are stripped and empty lines
+# removed while writing, and size, preview and hash are of the written content.
+def ingest_testcase(
+    source: BinaryIO, file: pathlib.Path, size_limit: int
+) -> IngestedTestcase:
+    source.seek(0)
+
+    try:
+        with open_compressed_writer(file) as f:
+            writer = _TestcaseWriter(f, size_limit)
+
+            while chunk := source.read(READ_SIZE):
+                writer.feed(chunk)
+
+            writer.end_line()
+    except BaseException:
+        os.remove(file)
+        raise
+
+    return IngestedTestcase(
+        size=writer.size,
+        preview=b"\n".join(writer.preview).decode(errors="replace"),
+        hash=writer.digest.hexdigest(),
+    )
+
+
+class _TestcaseWriter:
+    # Chunks are split into lines without joining them with the rest of the
+    # line, so a long line costs the same as many short ones. Whitespace at the
+    # end of the line is held back until something else follows in the line.
+    def __init__(self, f: BinaryIO, size_limit: int) -> None:
+        self.size_limit = size_limit
+        self.size = 0
+        self.digest = hashlib.sha256()
+        self.preview: list[bytes] = []
+
+        self._file = f
+        self._in_line = False
+        self._pending = b""
+        self._line_preview = b""
+
+    def feed(self, chunk: bytes):
+        *lines, rest = chunk.split(b"\n")
+
+        for line in lines:
+            self._feed_line(line)
+            self.end_line()
+
+        self._feed_line(rest)
+
+    def end_line(self):
+        if not self._in_line:
+            return
+
+        self._write(b"\n")
+
+        if len(self.preview) < PREVIEW_LINES:
+            line = self._line_preview
+            if len(line) > PREVIEW_LINE_LENGTH:
+                line = line[:PREVIEW_LINE_LENGTH] + b"..."
+            self.preview.append(line)
+
+        self._in_line = False
+        self._pending = b""
+        self._line_preview = b""
+
+    def _feed_line(self, data: bytes):
+        if not self._in_line:
+            data = data.lstrip(WHITESPACES)
+
+            if len(data) == 0:
+                return
+
+            self._in_line = True
+
+        content = data.rstrip(WHITESPACES)
+
+        if len(content) == 0:
+            self._pending += data
+        else:
+            self._write(self._pending)
+            self._write(content)
+            self._pending = data[len(content) :]
+
+        # Whitespace held back counts until it is dropped, so a line of spaces
+        # is stopped at the limit too. Line being written ends with a newline.
+        if self.size + len(self._pending) + 1 > self.size_limit:
+            raise TestcaseTooLarge()
+
+    def _write(self, data: bytes):
+        self._file.write(data)
+        self.digest.update(data)
+        self.size += len(data)
+
+        if len(self.preview) < PREVIEW_LINES and data != b"\n":
+            if len(self._line_preview) <= PREVIEW_LINE_LENGTH:
+                self._line_preview += data[: PREVIEW_LINE_LENGTH + 1]
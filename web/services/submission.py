@@ -6,7 +6,12 @@ from sqlalchemy.orm import selectinload
 from web.core.database import AsyncSessionDependency
 from web.core.decorators import as_annotated_dependency
 from web.models.submission import Submission, SubmissionTestcaseResult
-from web.schemas.submission import CreateSubmissionSchema, GetSubmissionsSchema
+from web.models.systemcall import SystemcallGroup, unpack_systemcall_counts
+from web.schemas.submission import (
+    CreateSubmissionSchema,
+    GetSubmissionsSchema,
+    Output,
+)
 from web.services.exceptions import NotFoundException
 from web.services.task import TaskService
 
@@ -43,6 +48,7 @@ class SubmissionService:
             ]
         else:
             submission.submission_results = [SubmissionTestcaseResult()]
+        submission.testcase_count = len(submission.submission_results)
         await self.session.commit()
 
         await self.task_service.request_compile_and_run_submission_task(submission)
@@ -50,7 +56,15 @@ class SubmissionService:
         return submission
 
     async def get_submission(self, submission_id: int):
-        stmt = select(Submission).where(Submission.id == submission_id)
+        stmt = (
+            select(Submission)
+            .where(Submission.id == submission_id)
+            .options(
+                selectinload(Submission.creator),
+                selectinload(Submission.language),
+                selectinload(Submission.problem),
+            )
+        )
 
         submission = await self.session.scalar(stmt)
 
@@ -85,3 +99,99 @@ class SubmissionService:
         submissions = (await self.session.scalars(stmt)).all()
 
         return submissions
+
+    async def get_submission_results(
+        self, submission_id: int
+    ) -> list[tuple[SubmissionTestcaseResult, dict[str, int]]]:
+        await self.get_submission(submission_id)
+
+        stmt = (
+            select(SubmissionTestcaseResult)
+            .where(SubmissionTestcaseResult.submission_id == submission_id)
+            .order_by(SubmissionTestcaseResult.id)
+            .options(
+                selectinload(SubmissionTestcaseResult.systemcall_group).selectinload(
+                    SystemcallGroup.systemcalls
+                )
+            )
+        )
+
+        submission_results = (await self.session.scalars(stmt)).all()
+
+        # Results of a submission share a few systemcall groups.
+        names: dict[int, dict[int, str]] = {}
+
+        for submission_result in submission_results:
+            systemcall_group = submission_result.systemcall_group
+
+            if systemcall_group is not None and systemcall_group.id not in names:
+                names[systemcall_group.id] = {
+                    systemcall.number: systemcall.name
+                    for systemcall in systemcall_group.systemcalls
+                }
+
+        return [
+            (
+                submission_result,
+                _get_systemcall_counts(
+                    submission_result,
+                    names.get(submission_result.systemcall_group_id or -1, {}),
+                ),
+            )
+            for submission_result in submission_results
+        ]
+
+    async def get_compile_output_key(self, submission_id: int, output: Output) -> str:
+        submission = await self.get_submission(submission_id)
+
+        key = (
+            submission.compile_stdout_key
+            if output == "stdout"
+            else submission.compile_stderr_key
+        )
+
+        # Not compiled yet.
+        if key is None:
+            raise NotFoundException()
+
+        return key
+
+    async def get_submission_result_output_key(
+        self, submission_id: int, submission_result_id: int, output: Output
+    ) -> str:
+        stmt = (
+            select(SubmissionTestcaseResult)
+            .where(SubmissionTestcaseResult.id == submission_result_id)
+            .where(SubmissionTestcaseResult.submission_id == submission_id)
+        )
+
+        submission_result = await self.session.scalar(stmt)
+
+        if submission_result is None:
+            raise NotFoundException()
+
+        key = (
+            submission_result.stdout_key
+            if output == "stdout"
+            else submission_result.stderr_key
+        )
+
+        # Not executed yet.
+        if key is None:
+            raise NotFoundException()
+
+        return key
+
+
+def _get_systemcall_counts(
+    submission_result: SubmissionTestcaseResult, names: dict[int, str]
+) -> dict[str, int]:
+    if submission_result.systemcall_count_data is None:
+        return {}
+
+    return {
+        names.get(number, str(number)): count
+        for number, count in unpack_systemcall_counts(
+            submission_result.systemcall_count_data
+        ).items()
+    }
@@ -2,32 +2,73 @@ from celery import chain, group
 
 from web.core.decorators import as_annotated_dependency
 from web.logger import _log
+from web.models.problem import Testcase
 from web.models.submission import Submission
 from worker.tasks import (
     compile_submission_task,
-    execute_testcase_task,
+    execute_testcases_task,
     parse_systemcalls_task,
 )
 
 
 @as_annotated_dependency
 class TaskService:
+    TESTCASE_BATCH_SIZE = 20
+
     def request_parse_systemcall_task(self):
         parse_systemcalls_task.delay()  # type: ignore
 
     async def request_compile_and_run_submission_task(self, submission: Submission):
         if submission.problem is None:
             _log.info("Problem is not found. Run submission with empty input.")
-            testcase_ids = [-1]
+            testcase_id_batches = [[-1]]
         else:
-            testcase_ids = [testcase.id for testcase in submission.problem.testcases]
+            testcases = submission.problem.testcases
+
+            if submission.problem.stop_on_failure:
+                testcase_id_batches = self._batch_by_subtask(testcases)
+            else:
+                testcase_ids = [testcase.id for testcase in testcases]
+                testcase_id_batches = [
+                    testcase_ids[i : i + self.TESTCASE_BATCH_SIZE]
+                    for i in range(0, len(testcase_ids), self.TESTCASE_BATCH_SIZE)
+                ]
 
         chain(
             compile_submission_task.si(submission.id),  # type: ignore
             group(
                 [
-                    execute_testcase_task.si(submission.id, testcase_id)  # type: ignore
-                    for testcase_id in testcase_ids
+                    execute_testcases_task.si(submission.id, batch)  # type: ignore
+                    for batch in testcase_id_batches
                 ]
             ),  # type: ignore
         ).delay()  # type: ignore
+
+    def _batch_by_subtask(self, testcases: list[Testcase]) -> list[list[int]]:
+        # A subtask is never split between batches, so its testcases run in
+        # order on one worker and the rest is skipped right after a failure.
+        # Small subtasks share a batch, a large one gets a batch of its own.
+        subtasks: dict[int | None, list[int]] = {}
+
+        for testcase in sorted(
+            testcases,
+            key=lambda testcase: (
+                testcase.subtask is None,
+                testcase.subtask or 0,
+                testcase.id,
+            ),
+        ):
+            subtasks.setdefault(testcase.subtask, []).append(testcase.id)
+
+        batches: list[list[int]] = []
+
+        for testcase_ids in subtasks.values():
+            if (
+                len(batches) == 0
+                or len(batches[-1]) + len(testcase_ids) > self.TESTCASE_BATCH_SIZE
+            ):
+                batches.append([])
+
+            batches[-1].extend(testcase_ids)
+
+        return batches
@@ -1,14 +1,18 @@
+import asyncio
 from tempfile import SpooledTemporaryFile
 from typing import Sequence
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 
 from web.core.database import AsyncSessionDependency
 from web.core.decorators import as_annotated_dependency
 from web.core.settings import settings
 from web.models.problem import Testcase
 from web.models.user import SessionUser
-from web.schemas.testcase import GetTestcasesRequestSchema
+from web.schemas.testcase import (
+    CreateTestcaseArchiveFileResultSchema,
+    GetTestcasesRequestSchema,
+)
 from web.services.exceptions import (
     InternalServerException,
     LoginRequiredException,
@@ -41,6 +45,7 @@ class TestcaseService:
         input_file: SpooledTemporaryFile[bytes],
         output_file: SpooledTemporaryFile[bytes],
         session_user: SessionUser | None,
+        subtask: int | None = None,
     ):
         if session_user is None:
             raise LoginRequiredException()
@@ -61,6 +66,7 @@ class TestcaseService:
         testcase.original_output_filename = (
             output_filename if output_filename is not None else ""
         )
+        testcase.subtask = subtask
 
         self.session.add(testcase)
         await self.session.flush()
@@ -68,11 +74,14 @@ class TestcaseService:
         testcase_id = testcase.id
 
         try:
-            input_size, output_size = self.judge_file_service.write_testcase_file(
-                id, testcase_id, input_file, output_file
+            # Files are read and compressed off the event loop.
+            input, output = await asyncio.to_thread(
+                self.judge_file_service.write_testcase_file,
+                id,
+                testcase_id,
+                input_file,
+                output_file,
             )
-            testcase.input_size = input_size
-            testcase.output_size = output_size
         except ServiceException as e:
             await self.session.rollback()
 
@@ -84,8 +93,12 @@ class TestcaseService:
                 {"_details": "테스트 케이스 작성 중 오류가 발생했습니다."}
             ) from e
 
-        testcase.input_preview = self._generate_testcase_preview(input_file).decode()
-        testcase.output_preview = self._generate_testcase_preview(output_file).decode()
+        testcase.input_size = input.size
+        testcase.output_size = output.size
+        testcase.input_preview = input.preview
+        testcase.output_preview = output.preview
+        testcase.input_hash = input.hash
+        testcase.output_hash = output.hash
         await self.session.merge(testcase)
 
         await self.session.commit()
@@ -93,23 +106,88 @@ class TestcaseService:
 
         return testcase
 
-    def _generate_testcase_preview(self, file: SpooledTemporaryFile[bytes]):
-        file.seek(0)
-        content = file.readlines()
-        preview: list[bytes] = []
+    async def create_testcases_from_archive(
+        self,
+        id: int,
+        archive_file: SpooledTemporaryFile[bytes],
+        session_user: SessionUser | None,
+        subtask: int | None = None,
+    ) -> list[CreateTestcaseArchiveFileResultSchema]:
+        if session_user is None:
+            raise LoginRequiredException()
+
+        problem = await self.problem_service.get_problem_by_id(id)
+
+        if problem is None:
+            raise NotFoundException()
+
+        if problem.creator_id != session_user.user_id:
+            raise PermissionException()
+
+        # Files are ingested in parallel off the event loop.
+        testcases, errors = await asyncio.to_thread(
+            self.judge_file_service.ingest_testcase_archive, id, archive_file
+        )
+
+        results = [
+            CreateTestcaseArchiveFileResultSchema(
+                filename=error.filename, error=error.message
+            )
+            for error in errors
+        ]
+
+        if len(testcases) == 0:
+            return sorted(results, key=lambda result: result.filename)
 
-        for line in content:
-            strip = line.strip()
+        # All testcases are inserted by a single statement.
+        stmt = insert(Testcase).returning(Testcase.id, sort_by_parameter_order=True)
+
+        try:
+            testcase_ids = (
+                await self.session.scalars(
+                    stmt,
+                    [
+                        {
+                            "problem_id": id,
+                            "subtask": subtask,
+                            "original_input_filename": testcase.input.filename,
+                            "original_output_filename": testcase.output.filename,
+                            "input_preview": testcase.input.testcase.preview,
+                            "output_preview": testcase.output.testcase.preview,
+                            "input_size": testcase.input.testcase.size,
+                            "output_size": testcase.output.testcase.size,
+                            "input_hash": testcase.input.testcase.hash,
+                            "output_hash": testcase.output.testcase.hash,
+                        }
+                        for testcase in testcases
+                    ],
+                )
+            ).all()
+
+            self.judge_file_service.store_archive_testcases(
+                id, list(zip(testcase_ids, testcases, strict=True))
+            )
+        except Exception as e:
+            await self.session.rollback()
+            self.judge_file_service.discard_archive_testcases(testcases)
+
+            raise InternalServerException(
+                {"_details": "테스트 케이스 작성 중 오류가 발생했습니다."}
+            ) from e
+
+        await self.session.commit()
 
-            if len(strip) != 0:
-                if len(strip) > 50:
-                    strip = strip[:50] + b"..."
-                preview.append(strip)
+        for testcase_id, testcase in zip(testcase_ids, testcases, strict=True):
+            for file in (testcase.input, testcase.output):
+                results.append(
+                    CreateTestcaseArchiveFileResultSchema(
+                        filename=file.filename, testcase_id=testcase_id
+                    )
+                )
 
-            if len(preview) == 10:
-                break
+        results.sort(key=lambda result: result.filename)
 
-        return b"\n".join(preview)
+        return results
 
     async def get_testcase(self, testcase_id: int, problem_id: int):
         stmt = (
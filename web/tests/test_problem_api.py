@@ -35,6 +35,90 @@ async def test_create_problem_api_success(client, login):
     for k, v in simple_problem.items():
         assert response.json().get(k) == v
 
+    assert response.json().get("stop_on_failure") is False
+    assert response.json().get("checker") == "token"
+
+
+async def test_update_problem_api_stop_on_failure(client, login):
+    await login(0)
+
+    response = await client.post("/api/problems", json=simple_problem)
+
+    id = response.json().get("id")
+
+    response = await client.patch(f"/api/problems/{id}", json={"stop_on_failure": True})
+
+    assert response.status_code == 200
+    assert response.json().get("stop_on_failure") is True
+
+
+async def test_update_problem_api_checker(client, login):
+    await login(0)
+
+    response = await client.post("/api/problems", json=simple_problem)
+
+    id = response.json().get("id")
+
+    response = await client.patch(f"/api/problems/{id}", json={"checker": "exact"})
+
+    assert response.status_code == 200
+    assert response.json().get("checker") == "exact"
+
+    response = await client.patch(f"/api/problems/{id}", json={"checker": "unknown"})
+
+    assert response.status_code == 422
+
+
+async def test_update_problem_api_tolerance(client, login):
+    await login(0)
+
+    response = await client.post("/api/problems", json=simple_problem)
+
+    id = response.json().get("id")
+
+    assert response.json().get("absolute_tolerance") == 1e-6
+    assert response.json().get("relative_tolerance") == 1e-6
+
+    response = await client.patch(
+        f"/api/problems/{id}",
+        json={"checker": "float", "absolute_tolerance": 1e-4},
+    )
+
+    assert response.status_code == 200
+    assert response.json().get("checker") == "float"
+    assert response.json().get("absolute_tolerance") == 1e-4
+    assert response.json().get("relative_tolerance") == 1e-6
+
+    response = await client.patch(f"/api/problems/{id}", json={"relative_tolerance": 2})
+
+    assert response.status_code == 422
+
+
+async def test_update_problem_api_special_judge(client, login):
+    await login(0)
+
+    response = await client.post("/api/problems", json=simple_problem)
+
+    id = response.json().get("id")
+
+    assert response.json().get("special_judge_language_id") is None
+
+    response = await client.patch(
+        f"/api/problems/{id}",
+        json={"checker": "special", "special_judge_code": "int main() {}"},
+    )
+
+    assert response.status_code == 200
+    assert response.json().get("checker") == "special"
+    assert response.json().get("special_judge_code") is None
+
+    response = await client.patch(
+        f"/api/problems/{id}", json={"checker": "interactive"}
+    )
+
+    assert response.status_code == 200
+    assert response.json().get("checker") == "interactive"
+
 
 async def test_update_problem_api_not_found(client, login):
     await login(0)
@@ -0,0 +1,138 @@
+import pytest
+from sqlalchemy import insert, select, text, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from judger.execute.result import ExecuteResult
+from web.core.startup import _backfill_submission_counters
+from web.models.language import Language
+from web.models.submission import Submission, SubmissionTestcaseResult
+
+pytestmark = [
+    pytest.mark.anyio,
+]
+
+
+async def test_submission_verdict_after_rejudge(
+    client, savepoint_connection: AsyncConnection
+):
+    # Counters are updated at commit, which never comes in tests.
+    await savepoint_connection.execute(
+        text("SET CONSTRAINTS notify_on_testcase_result_update_trigger IMMEDIATE")
+    )
+
+    language_id = await savepoint_connection.scalar(select(Language.id).limit(1))
+    submission_id = await savepoint_connection.scalar(
+        insert(Submission)
+        .values(code="code", language_id=language_id, testcase_count=2)
+        .returning(Submission.id)
+    )
+    result_ids = (
+        await savepoint_connection.scalars(
+            insert(SubmissionTestcaseResult)
+            .values([{"submission_id": submission_id}] * 2)
+            .returning(SubmissionTestcaseResult.id)
+        )
+    ).all()
+
+    async def write_results(*results: tuple[ExecuteResult | None, int | None]):
+        for result_id, (result, time) in zip(result_ids, results):
+            await savepoint_connection.execute(
+                update(SubmissionTestcaseResult)
+                .where(SubmissionTestcaseResult.id == result_id)
+                .values(result=result, time=time, memory=time)
+            )
+
+    # Sessions of requests keep loaded submissions, so the row is read here.
+    async def get_verdict():
+        return (
+            await savepoint_connection.execute(
+                select(
+                    Submission.completed_testcase_count,
+                    Submission.result,
+                    Submission.time,
+                    Submission.memory,
+                ).where(Submission.id == submission_id)
+            )
+        ).one()
+
+    await write_results((ExecuteResult.ACCEPTED, 10), (ExecuteResult.WRONG_ANSWER, 20))
+
+    assert await get_verdict() == (2, ExecuteResult.WRONG_ANSWER, 20, 20)
+
+    # Rejudge
+    await write_results((None, None), (None, None))
+
+    assert await get_verdict() == (0, None, None, None)
+
+    await write_results((ExecuteResult.ACCEPTED, 5), (ExecuteResult.ACCEPTED, 7))
+
+    assert await get_verdict() == (2, ExecuteResult.ACCEPTED, 7, 7)
+
+    response = await client.get(f"/api/submissions/{submission_id}")
+
+    assert response.status_code == 200
+    assert response.json().get("result") == "accepted"
+
+
+async def test_backfill_submission_counters(
+    client, savepoint_connection: AsyncConnection
+):
+    language_id = await savepoint_connection.scalar(select(Language.id).limit(1))
+
+    # Submissions created before the counters have zero testcase_count.
+    async def create_submission(*results: tuple[ExecuteResult | None, int | None]):
+        submission_id = await savepoint_connection.scalar(
+            insert(Submission)
+            .values(code="code", language_id=language_id)
+            .returning(Submission.id)
+        )
+        await savepoint_connection.execute(
+            insert(SubmissionTestcaseResult).values(
+                [
+                    {
+                        "submission_id": submission_id,
+                        "result": result,
+                        "time": time,
+                        "memory": time,
+                    }
+                    for result, time in results
+                ]
+            )
+        )
+
+        return submission_id
+
+    failed_id = await create_submission(
+        (ExecuteResult.ACCEPTED, 10),
+        (ExecuteResult.TIME_LIMIT_EXCEEDED, 30),
+        (ExecuteResult.WRONG_ANSWER, 20),
+    )
+    accepted_id = await create_submission(
+        (ExecuteResult.ACCEPTED, 10), (ExecuteResult.ACCEPTED, 5)
+    )
+    pending_id = await create_submission((ExecuteResult.ACCEPTED, 10), (None, None))
+
+    async with AsyncSession(
+        bind=savepoint_connection, join_transaction_mode="create_savepoint"
+    ) as session:
+        await _backfill_submission_counters(session)
+
+    verdicts = (
+        await savepoint_connection.execute(
+            select(
+                Submission.id,
+                Submission.testcase_count,
+                Submission.completed_testcase_count,
+                Submission.result,
+                Submission.time,
+            ).where(Submission.id.in_([failed_id, accepted_id, pending_id]))
+        )
+    ).all()
+
+    assert sorted(verdicts) == sorted(
+        [
+            (failed_id, 3, 3, ExecuteResult.TIME_LIMIT_EXCEEDED, 30),
+            (accepted_id, 2, 2, ExecuteResult.ACCEPTED, 10),
+            (pending_id, 2, 1, None, 10),
+        ]
+    )
@@ -1,3 +1,6 @@
+import io
+import zipfile
+
 import pytest
 
 from web.services.file import FileService
@@ -40,8 +43,11 @@ async def test_create_testcase_api_too_large_testcase_file(
 
     assert response.status_code == 413
 
+    # Output is not read when the input is too large.
     assert (response.json().get("input_file") is None) != input_too_large
-    assert (response.json().get("output_file") is None) != output_too_large
+    assert (response.json().get("output_file") is None) != (
+        output_too_large and not input_too_large
+    )
 
 
 @pytest.mark.parametrize("create_problems", [{"creators": [0]}], indirect=True)
@@ -58,6 +64,25 @@ async def test_create_testcase_api_good(
     )
 
     assert response.status_code == 201
+    assert response.json().get("subtask") is None
+
+
+@pytest.mark.parametrize("create_problems", [{"creators": [0]}], indirect=True)
+async def test_create_testcase_api_with_subtask(
+    client, login, create_problems: list[FixtureProblem]
+):
+    await login(0)
+
+    good_testcase = b"a" * 1024
+
+    response = await client.post(
+        f"/api/problems/{create_problems[0]['id']}/testcases",
+        files={"input_file": good_testcase, "output_file": good_testcase},
+        data={"subtask": "2"},
+    )
+
+    assert response.status_code == 201
+    assert response.json().get("subtask") == 2
 
 
 @pytest.mark.parametrize("create_problems", [{"creators": [0]}], indirect=True)
@@ -123,3 +148,70 @@ async def test_craete_testcase_api_generate_preview_correct(
     assert (
         response.json().get("input_preview") == "1 2 3\n123213\n3\n4\n5\n6\n7\n8\n9\n10"
     )
+
+
+@pytest.mark.parametrize("create_problems", [{"creators": [0]}], indirect=True)
+async def test_create_testcase_api_size_of_stripped_lines(
+    client, login, create_problems: list[FixtureProblem]
+):
+    await login(0)
+
+    # Larger than a chunk read at once, lines cross the chunk boundaries.
+    original_testcase = b"  1 2 3  \r\n\n" * 30000
+
+    response = await client.post(
+        f"/api/problems/{create_problems[0]['id']}/testcases",
+        files={"input_file": original_testcase, "output_file": original_testcase},
+    )
+
+    assert response.status_code == 201
+    assert response.json().get("input_size") == len(b"1 2 3\n") * 30000
+
+
+@pytest.mark.parametrize("create_problems", [{"creators": [0]}], indirect=True)
+async def test_create_testcases_from_archive_api(
+    client, login, create_problems: list[FixtureProblem]
+):
+    await login(0)
+
+    archive = io.BytesIO()
+
+    with zipfile.ZipFile(archive, "w") as f:
+        for i in (1, 2, 10):
+            f.writestr(f"{i}.in", f"{i}\n")
+            f.writestr(f"{i}.out", f"{i * 2}\n")
+        f.writestr("3.in", "3\n")
+
+    response = await client.post(
+        f"/api/problems/{create_problems[0]['id']}/testcases/archive",
+        files={"archive_file": archive.getvalue()},
+    )
+
+    assert response.status_code == 201
+
+    results = {result["filename"]: result for result in response.json()}
+
+    # Testcases are numbered in the order of their names.
+    assert results["1.in"]["testcase_id"] == results["1.out"]["testcase_id"]
+    assert results["1.in"]["testcase_id"] < results["2.in"]["testcase_id"]
+    assert results["2.in"]["testcase_id"] < results["10.in"]["testcase_id"]
+    assert results["3.in"]["testcase_id"] is None
+    assert results["3.in"]["error"] is not None
+
+    response = await client.get(f"/api/problems/{create_problems[0]['id']}/testcases")
+
+    assert len(response.json()) == 3
+
+
+@pytest.mark.parametrize("create_problems", [{"creators": [0]}], indirect=True)
+async def test_create_testcases_from_archive_api_invalid_archive(
+    client, login, create_problems: list[FixtureProblem]
+):
+    await login(0)
+
+    response = await client.post(
+        f"/api/problems/{create_problems[0]['id']}/testcases/archive",
+        files={"archive_file": b"a" * 1024},
+    )
+
+    assert response.status_code == 422
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import pathlib
+import shutil
+import tempfile
+from contextlib import suppress
+
+from worker.logger import _log
+
+METADATA_FILENAME = "metadata.json"
+ARTIFACTS_DIRECTORY = "artifacts"
+
+
+# Compiled artifacts keyed by language, compile command and code. Artifacts are
+# copied instead of hardlinked since submissions run in the same directory and
+# could overwrite a shared inode.
+class CompileCache:
+    def __init__(self, path: pathlib.Path, max_size: int) -> None:
+        self.path = path
+        self.max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def get_key(language: str, compile_command: str, code: str) -> str:
+        digest = hashlib.sha256()
+
+        for part in (language, compile_command, code):
+            encoded = part.encode()
+            digest.update(len(encoded).to_bytes(8, "little"))
+            digest.update(encoded)
+
+        return digest.hexdigest()
+
+    def restore(self, key: str, target: pathlib.Path) -> tuple[str, str] | None:
+        entry = self.path / key
+
+        try:
+            with open(entry / METADATA_FILENAME) as f:
+                metadata = json.load(f)
+
+            artifacts = entry / ARTIFACTS_DIRECTORY
+            for filename in metadata["files"]:
+                (target / filename).parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(artifacts / filename, target / filename)
+
+            # Modification time orders entries for eviction.
+            os.utime(entry)
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            self._log_stats(key, False)
+            return None
+
+        self.hits += 1
+        self._log_stats(key, True)
+
+        return metadata["stdout"], metadata["stderr"]
+
+    def store(
+        self,
+        key: str,
+        source: pathlib.Path,
+        files: list[str],
+        stdout: str,
+        stderr: str,
+    ):
+        if self.max_size <= 0 or (self.path / key).exists():
+            return
+
+        # Entries become visible at once, other workers share the directory.
+        temporary = pathlib.Path(tempfile.mkdtemp(dir=self.path, prefix=".tmp-"))
+
+        try:
+            for filename in files:
+                (temporary / ARTIFACTS_DIRECTORY / filename).parent.mkdir(
+                    parents=True, exist_ok=True
+                )
+                shutil.copy2(
+                    source / filename, temporary / ARTIFACTS_DIRECTORY / filename
+                )
+
+            with open(temporary / METADATA_FILENAME, "w") as f:
+                json.dump({"files": files, "stdout": stdout, "stderr": stderr}, f)
+
+            os.rename(temporary, self.path / key)
+        except OSError as e:
+            _log.warn("Failed to store compile cache.", exc_info=e)
+            shutil.rmtree(temporary, ignore_errors=True)
+            return
+
+        self._evict()
+
+    def _evict(self):
+        entries: list[tuple[float, int, pathlib.Path]] = []
+
+        for entry in self.path.iterdir():
+            if entry.name.startswith("."):
+                continue
+
+            with suppress(OSError):
+                entries.append((entry.stat().st_mtime, _get_size(entry), entry))
+
+        total_size = sum(size for _, size, _ in entries)
+
+        # Least recently used entries are removed first.
+        for _, size, entry in sorted(entries, key=lambda entry: entry[0]):
+            if total_size <= self.max_size:
+                break
+
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= size
+
+    def _log_stats(self, key: str, hit: bool):
+        _log.info(
+            f"Compile cache {"hit" if hit else "miss"} ({key[:12]}). "
+            f"hits={self.hits} misses={self.misses}"
+        )
+
+
+def snapshot(directory: pathlib.Path) -> dict[str, tuple[int, int, int]]:
+    files: dict[str, tuple[int, int, int]] = {}
+
+    for root, _, filenames in os.walk(directory):
+        for filename in filenames:
+            path = pathlib.Path(root) / filename
+            stat = path.stat()
+            files[str(path.relative_to(directory))] = (
+                stat.st_ino,
+                stat.st_size,
+                stat.st_mtime_ns,
+            )
+
+    return files
+
+
+def _get_size(path: pathlib.Path) -> int:
+    size = 0
+
+    for root, _, filenames in os.walk(path):
+        for filename in filenames:
+            with suppress(OSError):
+                size += os.stat(os.path.join(root, filename)).st_size
+
+    return size
@@ -0,0 +1,100 @@
+import time
+from contextlib import AbstractContextManager
+from types import TracebackType
+from typing import Any
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from web.models.submission import SubmissionTestcaseResult
+from worker.logger import _log
+
+# Buffered stdout and stderr are flushed before they take too much memory.
+MAX_BUFFERED_SIZE = 16 * 1024 * 1024
+
+
+# Results of a batch are buffered and written by primary key in a single
+# executemany, which psycopg sends in pipeline mode. Batches of a submission
+# only touch their own rows, and counters of the submission are updated when
+# they commit, so they wait for each other only while committing.
+class ResultWriter(AbstractContextManager):
+    def __init__(
+        self,
+        session: Session,
+        submission_id: int,
+        testcase_ids: list[int],
+        flush_interval: float,
+    ) -> None:
+        self.session = session
+        self.flush_interval = flush_interval
+
+        # Result without a testcase (-1) is the one of a problemless submission.
+        ids_stmt = (
+            select(SubmissionTestcaseResult.id, SubmissionTestcaseResult.testcase_id)
+            .where(SubmissionTestcaseResult.submission_id == submission_id)
+            .where(
+                or_(
+                    SubmissionTestcaseResult.testcase_id.in_(testcase_ids),
+                    SubmissionTestcaseResult.testcase_id.is_(None),
+                )
+            )
+        )
+        self._ids = {
+            testcase_id if testcase_id is not None else -1: id
+            for id, testcase_id in session.execute(ids_stmt).tuples()
+        }
+
+        self._buffer: list[dict[str, Any]] = []
+        self._buffered_size = 0
+        self._buffered_at = 0.0
+
+    def write(self, testcase_id: int, **values: Any):
+        if (id := self._ids.get(testcase_id)) is None:
+            _log.warn(f"Result of testcase {testcase_id} is not found.")
+            return
+
+        if not self._buffer:
+            self._buffered_at = time.monotonic()
+
+        self._buffer.append({"id": id, **values})
+        self._buffered_size += sum(
+            len(value) for value in values.values() if isinstance(value, str | bytes)
+        )
+
+        # Results are still sent to users while the batch runs.
+        if (
+            self._buffered_size >= MAX_BUFFERED_SIZE
+            or time.monotonic() - self._buffered_at >= self.flush_interval
+        ):
+            self.flush()
+
+    # Checked on write alone, results would wait for the next run to end, up to
+    # its whole time limit. Results that would be older than the interval once
+    # a run of the given seconds ends are written before it starts.
+    def flush_before_run(self, seconds: float):
+        if (
+            self._buffer
+            and time.monotonic() + seconds - self._buffered_at >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+
+        self.session.execute(update(SubmissionTestcaseResult), self._buffer)
+        self.session.commit()
+
+        self._buffer = []
+        self._buffered_size = 0
+
+    def __exit__(
+        self,
+        __exc_type: type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> bool | None:
+        # Finished results are written even when the batch failed.
+        self.flush()
+
+        return False
@@ -13,6 +13,17 @@ class Settings(BaseSettings):
     redis_uri: RedisDsn
     rabbitmq_uri: AmqpDsn
     judge_file_path: str
+    compile_cache_size: int = 1024 * 1024 * 1024
+    # Check output while the program runs, and kill it at the first mismatch.
+    online_check: bool = True
+    # Allowed system calls are filtered by seccomp instead of stopping the
+    # program under ptrace. Only system calls with a count limit are counted
+    # then, results have no counts for the others.
+    seccomp: bool = True
+    # Seconds finished results are buffered before written together.
+    result_flush_interval: float = 1.0
+    # Seconds compiled system call limits are reused before read again.
+    systemcall_policy_cache_ttl: float = 60.0
 
     env: str = "production"
 
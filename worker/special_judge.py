@@ -0,0 +1,171 @@
+import fcntl
+import os
+import pathlib
+import shutil
+import tempfile
+from contextlib import AbstractContextManager
+from types import TracebackType
+
+from judger.compile import CompileResult, compile
+from judger.execute import (
+    ExecuteResult,
+    Sandbox,
+    SystemcallPolicy,
+    execute_interactive,
+)
+from web.models.language import Language
+from worker.compile_cache import CompileCache
+from worker.logger import _log
+from worker.settings import settings
+
+COMPILE_TIMEOUT = 10
+
+TIME_LIMIT = 5000
+MEMORY_LIMIT = 512 * 1024 * 1024
+OUTPUT_LIMIT = 1024 * 1024
+
+# Failed builds are not retried for every batch.
+_failed_directories: set[pathlib.Path] = set()
+
+
+# Checker or interactor of a problem, the same sandbox and zygote are reused for every
+# testcase of a batch.
+class SpecialJudge(AbstractContextManager):
+    def __init__(
+        self,
+        directory: pathlib.Path,
+        language: Language,
+        systemcall_policy: SystemcallPolicy,
+    ) -> None:
+        self.sandbox = Sandbox(
+            working_directory=str(directory),
+            execute_command=language.execute_command,
+            time_limit=TIME_LIMIT,
+            memory_limit=MEMORY_LIMIT,
+            output_limit=OUTPUT_LIMIT,
+            systemcall_count_limits=systemcall_policy,
+            zygote_command=language.zygote_command,
+            seccomp=settings.seccomp,
+        )
+
+    def check(
+        self,
+        input_file: str,
+        answer_file: str,
+        output_file: str,
+        stdout_file: str,
+        stderr_file: str,
+    ) -> ExecuteResult:
+        result, _, _, _ = self.sandbox.run(
+            stdin_filename=os.devnull,
+            stdout_filename=stdout_file,
+            stderr_filename=stderr_file,
+            arguments=[input_file, answer_file, output_file],
+        )
+
+        return _get_verdict(result)
+
+    def interact(
+        self,
+        sandbox: Sandbox,
+        input_file: str,
+        answer_file: str,
+        stderr_file: str,
+        interactor_stderr_file: str,
+    ) -> tuple[ExecuteResult | None, int, int, dict[int, int]]:
+        (
+            (result, time, memory, systemcall_counts),
+            (interactor_result, _, _, _),
+        ) = execute_interactive(
+            sandbox,
+            self.sandbox,
+            stderr_file,
+            interactor_stderr_file,
+            [input_file, answer_file],
+        )
+
+        verdict = _get_verdict(interactor_result)
+
+        # Program fails on the closed pipe after the interactor rejected it.
+        if verdict != ExecuteResult.WRONG_ANSWER and result != ExecuteResult.GOOD:
+            verdict = result
+
+        return verdict, time, memory, systemcall_counts
+
+    def __exit__(
+        self,
+        __exc_type: type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> bool | None:
+        return self.sandbox.__exit__(__exc_type, __exc_value, __traceback)
+
+
+def _get_verdict(result: ExecuteResult | None) -> ExecuteResult:
+    if result == ExecuteResult.GOOD:
+        return ExecuteResult.ACCEPTED
+
+    if result == ExecuteResult.NON_ZERO_EXIT_CODE:
+        return ExecuteResult.WRONG_ANSWER
+
+    _log.warn(f"Special judge failed with {result}.")
+    return ExecuteResult.ERROR
+
+
+def prepare_special_judge(
+    root: pathlib.Path, language: Language, code: str
+) -> pathlib.Path | None:
+    # Compiling changes the working directory.
+    root = root.resolve()
+
+    # Keyed by the code, so a new checker of the problem is built again. Built
+    # checkers are shared by the worker processes.
+    directory = root / CompileCache.get_key(
+        language.display_name, language.compile_command, code
+    )
+
+    if directory.is_dir():
+        return directory
+
+    if directory in _failed_directories:
+        return None
+
+    try:
+        root.mkdir(parents=True, exist_ok=True)
+
+        with open(f"{directory}.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+
+            if not directory.is_dir():
+                _build(root, directory, language, code)
+    except Exception as e:
+        _log.warn(f"Failed to build special judge {directory.name}.", exc_info=e)
+        _failed_directories.add(directory)
+        return None
+
+    return directory
+
+
+def _build(root: pathlib.Path, directory: pathlib.Path, language: Language, code: str):
+    _log.info(f"Build special judge {directory.name}.")
+
+    temporary = pathlib.Path(tempfile.mkdtemp(dir=root, prefix=".tmp-"))
+
+    try:
+        with open(temporary / language.filename, "w") as f:
+            f.write(code)
+
+        result = compile(
+            str(temporary),
+            language.compile_command,
+            COMPILE_TIMEOUT,
+            str(temporary / "stdout.out"),
+            str(temporary / "stderr.err"),
+        )
+
+        if result != CompileResult.COMPILE_SUCCESS:
+            raise ValueError((temporary / "stderr.err").read_text())
+
+        os.rename(temporary, directory)
+    finally:
+        shutil.rmtree(temporary, ignore_errors=True)
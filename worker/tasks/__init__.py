@@ -1,12 +1,22 @@
+from celery.signals import worker_process_init
+
+from judger.execute import prepare_cgroup_pool, prepare_spawner
 from web import models
 from worker import celery_app
 from worker.backends import redis_backend_with_database
 from worker.settings import settings
 from worker.tasks.compile import compile_submission
-from worker.tasks.execute import execute_testcase
+from worker.tasks.execute import execute_testcases
 from worker.tasks.parse_systemcall import parse_systemcalls
 
 
+@worker_process_init.connect
+def prepare_sandbox(**_):
+    # Each worker process runs one sandbox at a time, its cgroup is reused.
+    prepare_cgroup_pool(size=1)
+    prepare_spawner()
+
+
 @celery_app.task(
     max_retries=0,
     backend=redis_backend_with_database(
@@ -23,5 +33,5 @@ def compile_submission_task(submission_id: int):
 
 
 @celery_app.task(max_retries=0)
-def execute_testcase_task(submission_id: int, language_id: int):
-    execute_testcase(submission_id, language_id)
+def execute_testcases_task(submission_id: int, testcase_ids: list[int]):
+    execute_testcases(submission_id, testcase_ids)
@@ -3,10 +3,13 @@ import pathlib
 from celery.exceptions import Reject
 from sqlalchemy import update
 
-from judger.compile import compile
+from judger.compile import build_precompiled_header, compile
 from judger.compile.result import CompileResult
 from judger.execute.result import ExecuteResult
+from judger.storage import BlobStore, read_preview
+from web.models.language import Language
 from web.models.submission import Submission, SubmissionTestcaseResult
+from worker.compile_cache import CompileCache, snapshot
 from worker.database import DatabaseSession
 from worker.logger import _log
 from worker.settings import settings
@@ -34,23 +37,55 @@ def compile_submission(submission_id: int):
         with open(submission_file, "w+") as f:
             f.write(submission.code)
 
-        result = compile(
-            str(submission_path.resolve()),
+        compile_cache = _get_compile_cache(root)
+        key = CompileCache.get_key(
+            submission.language.display_name,
             submission.language.compile_command,
-            10,
-            str(stdout_file.resolve()),
-            str(stderr_file.resolve()),
+            submission.code,
         )
 
+        if (cached := compile_cache.restore(key, submission_path)) is not None:
+            result = CompileResult.COMPILE_SUCCESS
+
+            for file, content in zip((stdout_file, stderr_file), cached):
+                with open(file, "w") as f:
+                    f.write(content)
+        else:
+            before = snapshot(submission_path)
+
+            result = compile(
+                str(submission_path.resolve()),
+                submission.language.compile_command,
+                10,
+                str(stdout_file.resolve()),
+                str(stderr_file.resolve()),
+                _get_precompiled_header_directory(root, submission.language),
+            )
+
+            if result == CompileResult.COMPILE_SUCCESS:
+                compile_cache.store(
+                    key,
+                    submission_path,
+                    [
+                        filename
+                        for filename, stat in snapshot(submission_path).items()
+                        if before.get(filename) != stat
+                        and filename not in (stdout_file.name, stderr_file.name)
+                    ],
+                    stdout_file.read_text(),
+                    stderr_file.read_text(),
+                )
+
         _log.info(f"Compile result : {result}")
 
         submission.compile_result = result
 
-        with open(stdout_file) as stdout:
-            submission.compile_stdout = stdout.read()
+        blob_store = BlobStore(root / "blobs")
 
-        with open(stderr_file) as stderr:
-            submission.compile_stderr = stderr.read()
+        submission.compile_stdout = read_preview(stdout_file)
+        submission.compile_stderr = read_preview(stderr_file)
+        submission.compile_stdout_key = blob_store.put(stdout_file)
+        submission.compile_stderr_key = blob_store.put(stderr_file)
 
         if result == CompileResult.COMPILE_FAILURE:
             stmt = (
@@ -65,3 +100,32 @@ def compile_submission(submission_id: int):
 
         if result == CompileResult.COMPILE_FAILURE:
             raise Reject("Compile error.")
+
+
+_compile_cache: CompileCache | None = None
+
+
+def _get_compile_cache(root: pathlib.Path) -> CompileCache:
+    global _compile_cache
+
+    if _compile_cache is None:
+        _compile_cache = CompileCache(
+            root / "compile_cache", settings.compile_cache_size
+        )
+
+    return _compile_cache
+
+
+def _get_precompiled_header_directory(
+    root: pathlib.Path, language: Language
+) -> str | None:
+    if language.precompiled_header is None or language.precompile_command is None:
+        return None
+
+    # Built by the first compile of the language, then shared by the workers.
+    return build_precompiled_header(
+        str(root / "precompiled_headers"),
+        language.precompiled_header,
+        language.precompile_command,
+        60,
+    )
@@ -1,25 +1,43 @@
+import dataclasses
 import os
 import pathlib
+import time
+from contextlib import AbstractContextManager, nullcontext
 
 from celery.exceptions import Reject
-from sqlalchemy import insert, select
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from judger.execute import execute
-from web.models.problem import Testcase
-from web.models.submission import Submission, SubmissionTestcaseResult
-from web.models.systemcall import Systemcall, SystemcallCount, SystemcallGroup
+from judger.check import CheckMode, StreamChecker, check
+from judger.execute import ExecuteResult, Sandbox, SystemcallPolicy, Telemetry
+from judger.execute.policy import UNLIMITED
+from judger.storage import (
+    BlobStore,
+    decompress_file,
+    is_compressed,
+    open_decompressed_pipe,
+    read_preview,
+)
+from web.models.language import Language
+from web.models.problem import Problem, Testcase
+from web.models.submission import Submission
+from web.models.systemcall import SystemcallGroup, pack_systemcall_counts
 from worker.database import DatabaseSession
+from worker.logger import _log
+from worker.result_writer import ResultWriter
 from worker.settings import settings
+from worker.special_judge import SpecialJudge, prepare_special_judge
 
 
-def execute_testcase(submission_id: int, testcase_id: int):
+def execute_testcases(submission_id: int, testcase_ids: list[int]):
     with DatabaseSession() as session:
         submission = _get_submission_or_reject(session=session, id=submission_id)
-        if testcase_id != -1:
-            testcase = _get_testcase_or_reject(session=session, id=testcase_id)
-        else:
-            testcase = None
+        testcases = {
+            testcase_id: _get_testcase_or_reject(session=session, id=testcase_id)
+            if testcase_id != -1
+            else None
+            for testcase_id in testcase_ids
+        }
         systemcall_group = _get_systemcall_group_or_reject(session=session)
 
         root = pathlib.Path(settings.judge_file_path)
@@ -29,91 +47,316 @@ def execute_testcase(submission_id: int, testcase_id: int):
 
         submission_path = root / "submissions" / f"{submission_id}"
 
-        if submission is None:
-            raise Reject("Submission not found.")
-
-        # stdin, stdout, stderr files
-        if testcase_id == -1:
-            testcase_file = os.devnull
-        elif testcase is not None:
-            testcase_file = str(
-                (
-                    root / f"{testcase.problem_id}" / "testcases" / f"{testcase.id}.in"
-                ).resolve()
-            )
-        else:
-            raise Reject("Testcase not found.")
-        stdout_file = submission_path / f"{testcase_id}.out"
-        stderr_file = submission_path / f"{testcase_id}.err"
-
-        # systemcall allowed
-        # systemcall_count_limits = {
-        #     systemcall_count_limit.systemcall.number: systemcall_count_limit.count
-        #     for systemcall_count_limit in submission.language.systemcall_count_limits
-        # }
-        systemcall_count_limits = {
-            systemcall.number: -1 for systemcall in systemcall_group.systemcalls
-        }
-
-        result, time, memory, systemcall_counts = execute(
-            working_directory=str(submission_path.resolve()),
-            execute_command=submission.language.execute_command,
-            stdin_filename=testcase_file,
-            stdout_filename=str(stdout_file.resolve()),
-            stderr_filename=str(stderr_file.resolve()),
-            time_limit=submission.problem.time_limit
-            if submission.problem is not None
-            else 1000,
-            memory_limit=submission.problem.memory_limit * 1024 * 1024
-            if submission.problem is not None
-            else 256 * 1024 * 1024,
-            output_limit=16 * 1024 * 1024,
-            systemcall_count_limits=systemcall_count_limits,
+        systemcall_policy = _get_systemcall_policy(
+            submission.language, systemcall_group
         )
 
-        testcase_results_stmt = (
-            select(SubmissionTestcaseResult)
-            .where(SubmissionTestcaseResult.submission_id == submission_id)
-            .with_for_update()
+        stop_on_failure = (
+            submission.problem is not None and submission.problem.stop_on_failure
         )
+        failed_subtasks: set[int | None] = set()
+
+        blob_store = BlobStore(root / "blobs")
+
+        with (
+            Sandbox(
+                working_directory=str(submission_path.resolve()),
+                execute_command=submission.language.execute_command,
+                time_limit=submission.problem.time_limit
+                if submission.problem is not None
+                else 1000,
+                memory_limit=submission.problem.memory_limit * 1024 * 1024
+                if submission.problem is not None
+                else 256 * 1024 * 1024,
+                output_limit=16 * 1024 * 1024,
+                systemcall_count_limits=systemcall_policy,
+                zygote_command=submission.language.zygote_command,
+                seccomp=settings.seccomp,
+            ) as sandbox,
+            _open_special_judge(
+                root, submission.problem, systemcall_group
+            ) as special_judge,
+            ResultWriter(
+                session,
+                submission_id,
+                testcase_ids,
+                settings.result_flush_interval,
+            ) as writer,
+        ):
+            for testcase_id, testcase in testcases.items():
+                subtask = testcase.subtask if testcase is not None else None
+
+                # A subtask is never split between batches, so its failures
+                # are all in this batch.
+                if stop_on_failure and subtask in failed_subtasks:
+                    _save_skipped_result(writer, testcase_id)
+                    continue
+
+                writer.flush_before_run(sandbox.wall_time_limit / 1000)
+
+                # stdin, stdout, stderr files
+                if testcase is not None:
+                    testcase_file = str(
+                        (
+                            root
+                            / f"{testcase.problem_id}"
+                            / "testcases"
+                            / f"{testcase.id}.in"
+                        ).resolve()
+                    )
+                else:
+                    testcase_file = os.devnull
+                stdout_file = submission_path / f"{testcase_id}.out"
+                stderr_file = submission_path / f"{testcase_id}.err"
+
+                if testcase is not None and _is_interactive(testcase.problem):
+                    result, time, memory, systemcall_counts = _interact(
+                        sandbox,
+                        special_judge,
+                        _get_plain_file(
+                            testcase_file, submission_path / f"{testcase_id}.input"
+                        ),
+                        _get_plain_file(
+                            _get_answer_file(root, testcase),
+                            submission_path / f"{testcase_id}.answer",
+                        ),
+                        stdout_file,
+                        stderr_file,
+                        submission_path / f"{testcase_id}.check.err",
+                    )
+                    stream_checker = None
+                else:
+                    with (
+                        _open_stream_checker(root, testcase) as stream_checker,
+                        _open_stdin(testcase_file) as stdin,
+                    ):
+                        result, time, memory, systemcall_counts = sandbox.run(
+                            stdin_filename=testcase_file,
+                            stdout_filename=str(stdout_file.resolve()),
+                            stderr_filename=str(stderr_file.resolve()),
+                            checker=stream_checker,
+                            stdin=stdin,
+                        )
+
+                # Streamed output is already checked by the sandbox.
+                if (
+                    result == ExecuteResult.GOOD
+                    and testcase is not None
+                    and stream_checker is None
+                ):
+                    answer_file = _get_answer_file(root, testcase)
+                    checker = CheckMode(testcase.problem.checker)
+
+                    if checker != CheckMode.SPECIAL:
+                        result = check(
+                            str(stdout_file),
+                            str(answer_file),
+                            checker,
+                            testcase.problem.absolute_tolerance,
+                            testcase.problem.relative_tolerance,
+                        )
+                    elif special_judge is not None:
+                        result = special_judge.check(
+                            _get_plain_file(
+                                testcase_file, submission_path / f"{testcase_id}.input"
+                            ),
+                            _get_plain_file(
+                                answer_file, submission_path / f"{testcase_id}.answer"
+                            ),
+                            str(stdout_file.resolve()),
+                            str(
+                                (submission_path / f"{testcase_id}.check.out").resolve()
+                            ),
+                            str(
+                                (submission_path / f"{testcase_id}.check.err").resolve()
+                            ),
+                        )
+                    else:
+                        result = ExecuteResult.ERROR
+
+                _save_testcase_result(
+                    writer,
+                    blob_store,
+                    testcase_id,
+                    systemcall_group,
+                    result,
+                    time,
+                    memory,
+                    systemcall_counts,
+                    sandbox.telemetry,
+                    stdout_file,
+                    stderr_file,
+                )
+
+                if result not in (ExecuteResult.GOOD, ExecuteResult.ACCEPTED):
+                    failed_subtasks.add(subtask)
+
+
+# Compiled once per language and systemcall group. Limits edited in the
+# database apply once the cached policy expires.
+_systemcall_policies: dict[tuple[int, int], tuple[SystemcallPolicy, float]] = {}
+
+
+def _get_systemcall_policy(
+    language: Language, systemcall_group: SystemcallGroup
+) -> SystemcallPolicy:
+    key = (language.id, systemcall_group.id)
+
+    if (cached := _systemcall_policies.get(key)) is not None:
+        systemcall_policy, cached_at = cached
+
+        if time.monotonic() - cached_at < settings.systemcall_policy_cache_ttl:
+            return systemcall_policy
+
+    # System calls without a limit of the language are allowed.
+    systemcall_count_limits = {
+        systemcall.number: UNLIMITED for systemcall in systemcall_group.systemcalls
+    }
+
+    for systemcall_count_limit in language.systemcall_count_limits:
+        systemcall = systemcall_count_limit.systemcall
+
+        if systemcall.systemcall_group_id == systemcall_group.id:
+            systemcall_count_limits[systemcall.number] = systemcall_count_limit.count
+
+    systemcall_policy = SystemcallPolicy(systemcall_count_limits)
+    _systemcall_policies[key] = (systemcall_policy, time.monotonic())
+
+    return systemcall_policy
+
+
+def _is_interactive(problem: Problem) -> bool:
+    return CheckMode(problem.checker) == CheckMode.INTERACTIVE
+
+
+def _interact(
+    sandbox: Sandbox,
+    special_judge: SpecialJudge | None,
+    testcase_file: str,
+    answer_file: str,
+    stdout_file: pathlib.Path,
+    stderr_file: pathlib.Path,
+    interactor_stderr_file: pathlib.Path,
+) -> tuple[ExecuteResult | None, int, int, dict[int, int]]:
+    # Output of the program goes to the interactor.
+    stdout_file.write_bytes(b"")
+
+    if special_judge is None:
+        stderr_file.write_bytes(b"")
+        return ExecuteResult.ERROR, 0, 0, {}
+
+    return special_judge.interact(
+        sandbox,
+        testcase_file,
+        answer_file,
+        str(stderr_file.resolve()),
+        str(interactor_stderr_file.resolve()),
+    )
+
+
+def _get_answer_file(root: pathlib.Path, testcase: Testcase) -> pathlib.Path:
+    return root / f"{testcase.problem_id}" / "testcases" / f"{testcase.id}.out"
+
+
+def _get_plain_file(file: str | pathlib.Path, target: pathlib.Path) -> str:
+    # Special judges read testcase files by their paths.
+    if not is_compressed(file):
+        return str(pathlib.Path(file).resolve())
+
+    decompress_file(file, target)
+
+    return str(target.resolve())
+
+
+def _open_stdin(testcase_file: str) -> AbstractContextManager[int | None]:
+    # Compressed testcases are decompressed into a pipe while the program reads.
+    if not is_compressed(testcase_file):
+        return nullcontext()
+
+    return open_decompressed_pipe(testcase_file)
+
 
-        testcase_results = session.scalars(testcase_results_stmt)
-
-        for testcase_result in testcase_results:
-            if (
-                testcase_result.testcase_id is not None
-                and testcase_result.testcase_id != testcase_id
-            ):
-                continue
-
-            if testcase_result.testcase_id is None and testcase_id != -1:
-                continue
-
-            testcase_result.result = result
-            testcase_result.time = time
-            testcase_result.memory = memory
-
-            with open(stdout_file) as f:
-                testcase_result.stdout = f.read()
-
-            with open(stderr_file) as f:
-                testcase_result.stderr = f.read()
-
-            insert_systemcallcounts_stmt = insert(SystemcallCount).values(
-                [
-                    {
-                        SystemcallCount.submission_result_id: testcase_result.id,
-                        SystemcallCount.systemcall_id: select(Systemcall.id)
-                        .where(Systemcall.systemcall_group_id == systemcall_group.id)
-                        .where(Systemcall.number == number),
-                        SystemcallCount.count: count,
-                    }
-                    for number, count in systemcall_counts.items()
-                ]
-            )
-            session.execute(insert_systemcallcounts_stmt)
-
-            session.commit()
+def _open_stream_checker(
+    root: pathlib.Path, testcase: Testcase | None
+) -> AbstractContextManager[StreamChecker | None]:
+    if testcase is None or not settings.online_check:
+        return nullcontext()
+
+    checker = CheckMode(testcase.problem.checker)
+
+    # Special judges need the whole output.
+    if checker in (CheckMode.SPECIAL, CheckMode.INTERACTIVE):
+        return nullcontext()
+
+    return StreamChecker(
+        str(_get_answer_file(root, testcase)),
+        checker,
+        testcase.problem.absolute_tolerance,
+        testcase.problem.relative_tolerance,
+    )
+
+
+def _open_special_judge(
+    root: pathlib.Path,
+    problem: Problem | None,
+    systemcall_group: SystemcallGroup,
+) -> AbstractContextManager[SpecialJudge | None]:
+    if problem is None or CheckMode(problem.checker) not in (
+        CheckMode.SPECIAL,
+        CheckMode.INTERACTIVE,
+    ):
+        return nullcontext()
+
+    if problem.special_judge_language is None or problem.special_judge_code is None:
+        _log.warn(f"Special judge of problem {problem.id} is not uploaded.")
+        return nullcontext()
+
+    directory = prepare_special_judge(
+        root / "special_judges",
+        problem.special_judge_language,
+        problem.special_judge_code,
+    )
+
+    if directory is None:
+        return nullcontext()
+
+    return SpecialJudge(
+        directory,
+        problem.special_judge_language,
+        _get_systemcall_policy(problem.special_judge_language, systemcall_group),
+    )
+
+
+def _save_skipped_result(writer: ResultWriter, testcase_id: int):
+    writer.write(testcase_id, result=ExecuteResult.SKIPPED)
+
+
+def _save_testcase_result(
+    writer: ResultWriter,
+    blob_store: BlobStore,
+    testcase_id: int,
+    systemcall_group: SystemcallGroup,
+    result: ExecuteResult | None,
+    time: int,
+    memory: int,
+    systemcall_counts: dict[int, int],
+    telemetry: Telemetry | None,
+    stdout_file: pathlib.Path,
+    stderr_file: pathlib.Path,
+):
+    writer.write(
+        testcase_id,
+        result=result,
+        time=time,
+        memory=memory,
+        telemetry=dataclasses.asdict(telemetry) if telemetry is not None else None,
+        systemcall_group_id=systemcall_group.id,
+        systemcall_count_data=pack_systemcall_counts(systemcall_counts),
+        stdout=read_preview(stdout_file),
+        stderr=read_preview(stderr_file),
+        stdout_key=blob_store.put(stdout_file),
+        stderr_key=blob_store.put(stderr_file),
+    )
 
 
 def _get_submission_or_reject(session: Session, id: int) -> Submission: